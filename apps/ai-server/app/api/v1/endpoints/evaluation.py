@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Body, Depends, Header
+import time
+
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
 from langchain_core.chat_history import BaseChatMessageHistory
 
 from app.models.evaluation import (
+    AnswerEvaluationBatchRequest,
+    AnswerEvaluationBatchResponse,
     AnswerEvaluationRequest,
     AnswerEvaluationResult,
     SessionEvaluationResult,
@@ -18,14 +22,40 @@ router = APIRouter()
     tags=["Evaluation"],
     summary="Evaluate User Answer",
 )
-def evaluate_answer(
+async def evaluate_answer(
+    response: Response,
     x_session_id: str = Header(...),
     req: AnswerEvaluationRequest = Body(...),
+    use_cache: bool = Query(False, description="LLM 응답 캐시 사용 여부"),
     memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
 ) -> AnswerEvaluationResult:
     service = EvaluationService(memory=memory, session_id=x_session_id)
 
-    return service.evaluate_answer(req)
+    result = await service.aevaluate_answer(req, use_cache=use_cache)
+    response.headers["X-LLM-Cache"] = service.cache_status
+    response.headers["X-Request-Coalesced"] = str(service.coalesced).lower()
+    return result
+
+
+@router.post(
+    "/answer-evaluating/batch",
+    response_model=AnswerEvaluationBatchResponse,
+    tags=["Evaluation"],
+    summary="Evaluate Multiple User Answers Concurrently",
+)
+async def evaluate_answers(
+    x_session_id: str = Header(...),
+    req: AnswerEvaluationBatchRequest = Body(...),
+    use_cache: bool = Query(False, description="LLM 응답 캐시 사용 여부"),
+    memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
+) -> AnswerEvaluationBatchResponse:
+    service = EvaluationService(memory=memory, session_id=x_session_id)
+
+    start = time.perf_counter()
+    results = await service.aevaluate_answers(req, use_cache=use_cache)
+    return AnswerEvaluationBatchResponse(
+        results=results, elapsedMs=round((time.perf_counter() - start) * 1000)
+    )
 
 
 @router.post(
@@ -34,10 +64,14 @@ def evaluate_answer(
     tags=["Evaluation"],
     summary="Evaluate Entire Session",
 )
-def evaluate_session(
+async def evaluate_session(
+    response: Response,
     x_session_id: str = Header(...),
+    use_cache: bool = Query(False, description="LLM 응답 캐시 사용 여부"),
     memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
 ) -> SessionEvaluationResult:
     service = EvaluationService(memory=memory, session_id=x_session_id)
 
-    return service.evaluate_session()
+    result = await service.aevaluate_session(use_cache=use_cache)
+    response.headers["X-LLM-Cache"] = service.cache_status
+    return result
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Body, Depends, Header
+import logging
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from langchain_core.chat_history import BaseChatMessageHistory
 
 from app.models.followup import FollowupRequest, FollowupResponse
 from app.services.followup_generator import FollowupGeneratorService
 from app.services.memory_logger import MemoryManager
+from app.utils.sse import SSE_HEADERS, format_sse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -14,11 +21,48 @@ router = APIRouter()
     tags=["Question"],
     summary="Generate Follow-up Question",
 )
-def generate_followup(
+async def generate_followup(
+    response: Response,
     x_session_id: str = Header(...),
     req: FollowupRequest = Body(...),
+    use_cache: bool = Query(False, description="LLM 응답 캐시 사용 여부"),
     memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
 ) -> FollowupResponse:
     service = FollowupGeneratorService(memory=memory, session_id=x_session_id)
 
-    return service.generate_followups(req)
+    result = await service.agenerate_followups(req, use_cache=use_cache)
+    response.headers["X-LLM-Cache"] = service.cache_status
+    response.headers["X-Request-Coalesced"] = str(service.coalesced).lower()
+    response.headers["X-Speculative-Hit"] = str(service.speculative_hit).lower()
+    return result
+
+
+@router.post(
+    "/followup-generating/stream",
+    tags=["Question"],
+    summary="Generate Follow-up Question (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_followup(
+    x_session_id: str = Header(...),
+    req: FollowupRequest = Body(...),
+    memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
+) -> StreamingResponse:
+    """
+    생성 중인 질문 본문은 `event: partial`, 완성된 꼬리질문은 `event: followup`,
+    마지막에 `event: done` (또는 실패 시 `event: error`)을 전송합니다.
+    """
+    service = FollowupGeneratorService(memory=memory, session_id=x_session_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event, data in service.astream_followups(req):
+                yield format_sse(event, data)
+            yield format_sse("done", {})
+        except Exception as e:
+            logger.error(f"[{x_session_id}] followup stream failed: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
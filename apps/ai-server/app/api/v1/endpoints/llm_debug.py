@@ -0,0 +1,28 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.services.speculation import speculative_followups
+from app.utils.json_repair import json_repair_stats
+from app.utils.llm_cache import llm_cache
+from app.utils.llm_hedging import hedging_policy
+from app.utils.llm_scheduler import llm_scheduler
+from app.utils.llm_utils import chain_registry
+from app.utils.singleflight import singleflight
+from app.utils.tracing import tracer
+
+router = APIRouter()
+
+
+@router.get("/stats", tags=["LLM"], summary="Get LLM Layer Stats")
+def get_llm_stats() -> Dict[str, Any]:
+    return {
+        "registry": chain_registry.stats(),
+        "cache": llm_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "speculative_followups": speculative_followups.stats(),
+        "scheduler": llm_scheduler.stats(),
+        "hedging": hedging_policy.stats(),
+        "json_repair": json_repair_stats.stats(),
+        "tracing": tracer.stats(),
+    }
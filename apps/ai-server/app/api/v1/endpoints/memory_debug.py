@@ -1,17 +1,73 @@
-from typing import Any, Dict, List
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
 
 from fastapi import (
     APIRouter,
     Depends,
     Header,
+    HTTPException,
+    Query,
 )
+from fastapi.responses import StreamingResponse
 from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage
 
 from app.models.memory import MemoryDump, Message
-from app.services.memory_logger import MemoryManager
+from app.services.memory_logger import MemoryManager, page_messages
+from app.utils import fast_json
+from app.utils.event_codec import to_legacy_json
 
 router = APIRouter()
 
+DUMP_BATCH_SIZE = 200  # 백엔드에서 한 번에 읽는 메시지 수
+
+Page = Tuple[List[Message], Optional[str]]
+
+
+def _to_message(m: BaseMessage) -> Optional[Message]:
+    # HumanMessage / AIMessage / SystemMessage 타입명으로 role 매핑
+    t = type(m).__name__.lower()
+    if "human" in t:
+        role = "human"
+    elif "ai" in t:
+        role = "ai"
+    elif "system" in t:
+        role = "system"
+    else:
+        return None
+    return Message(role=role, content=str(to_legacy_json(m.content)))
+
+
+def _read_pages(
+    memory: BaseChatMessageHistory,
+    cursor: Optional[str],
+    limit: Optional[int],
+    roles: Optional[List[str]],
+    event_types: Optional[List[str]],
+) -> Iterator[Page]:
+    """cursor부터 limit개(없으면 끝까지)를 DUMP_BATCH_SIZE씩 읽어 변환"""
+    remaining = limit
+    while True:
+        batch = min(DUMP_BATCH_SIZE, remaining) if remaining else DUMP_BATCH_SIZE
+        messages, cursor = page_messages(memory, cursor, batch, roles, event_types)
+        converted = [m for m in map(_to_message, messages) if m is not None]
+        yield converted, cursor
+        if cursor is None:
+            return
+        if remaining is not None:
+            remaining -= batch
+            if remaining <= 0:
+                return
+
+
+def _ndjson(pages: Iterator[Page]) -> Iterator[str]:
+    """메시지마다 한 줄, 마지막 줄은 {"next_cursor": ...}"""
+    cursor = None
+    for messages, cursor in pages:
+        for message in messages:
+            yield fast_json.dumps(message.model_dump()) + "\n"
+    yield fast_json.dumps({"next_cursor": cursor}) + "\n"
+
 
 @router.get(
     "/dump",
@@ -22,30 +78,50 @@ router = APIRouter()
 def get_memory_dump(
     memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
     x_session_id: str = Header(...),
-) -> MemoryDump:
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=10000, description="읽을 메시지 수 (없으면 세션 끝까지)"
+    ),
+    role: Optional[List[Literal["human", "ai", "system"]]] = Query(None),
+    event_type: Optional[List[str]] = Query(
+        None, description="예: QUESTION_ASKED, ANSWER_EVALUATED, FACE_ANALYSIS"
+    ),
+    include_history: bool = Query(True, description="false면 history_str 생략"),
+    format: Literal["json", "ndjson"] = Query(
+        "json", description="ndjson: 읽는 대로 한 줄씩 스트리밍"
+    ),
+):
+    """
+    세션 메시지 덤프 (오래된 순).
+    role/event_type 필터는 읽은 범위 안에서 적용하므로 한 페이지가 limit보다 적을 수
+    있습니다. next_cursor가 null일 때까지 cursor로 이어서 요청하세요.
+    """
+    pages = _read_pages(memory, cursor, limit, role, event_type)
+    try:
+        first = next(pages)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+    pages = chain([first], pages)
+
+    if format == "ndjson":
+        return StreamingResponse(_ndjson(pages), media_type="application/x-ndjson")
+
     messages_out: List[Message] = []
-    history_parts: List[str] = []
-
-    for m in memory.messages:
-        # HumanMessage / AIMessage / SystemMessage 타입명으로 role 매핑
-        t = type(m).__name__.lower()
-        if "human" in t:
-            role = "human"
-        elif "ai" in t:
-            role = "ai"
-        elif "system" in t:
-            role = "system"
-        else:
-            continue
-
-        content = str(m.content)
-        messages_out.append(Message(role=role, content=content))
-        history_parts.append(f"{role.capitalize()}: {content}")
-
-    history_str = "\n".join(history_parts)
+    next_cursor = None
+    for messages, next_cursor in pages:
+        messages_out.extend(messages)
+
+    history_str = None
+    if include_history:
+        history_str = "\n".join(
+            f"{m.role.capitalize()}: {m.content}" for m in messages_out
+        )
 
     return MemoryDump(
-        session_id=x_session_id, history_str=history_str, messages=messages_out
+        session_id=x_session_id,
+        history_str=history_str,
+        messages=messages_out,
+        next_cursor=next_cursor,
     )
 
 
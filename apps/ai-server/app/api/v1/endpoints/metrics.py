@@ -0,0 +1,100 @@
+from typing import Dict, Tuple
+
+from anyio import to_thread
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.services.memory_logger import MemoryManager
+from app.services.speculation import speculative_followups
+from app.utils.llm_scheduler import LLMPriority, llm_scheduler
+from app.utils.metrics import CallbackGauge, metrics_registry
+from app.utils.redis_pool import redis_pool_stats
+from app.utils.singleflight import singleflight
+from app.utils.thread_pool import default_executor_stats
+
+router = APIRouter()
+
+
+def _collect_threadpools() -> Dict[Tuple[str, ...], float]:
+    values: Dict[Tuple[str, ...], float] = {}
+
+    # asyncio.to_thread가 사용하는 루프 기본 실행기 (lifespan에서 계측 실행기로 교체)
+    executor = default_executor_stats()
+    if executor:
+        values[("asyncio", "busy")] = executor["busy"]
+        values[("asyncio", "max")] = executor["max"]
+
+    # 동기(def) 엔드포인트와 의존성이 실행되는 anyio 워커 스레드
+    limiter = to_thread.current_default_thread_limiter().statistics()
+    values[("anyio", "busy")] = limiter.borrowed_tokens
+    values[("anyio", "max")] = limiter.total_tokens
+    return values
+
+
+def _collect_queues() -> Dict[Tuple[str, ...], float]:
+    values: Dict[Tuple[str, ...], float] = {}
+
+    executor = default_executor_stats()
+    if executor:
+        values[("asyncio_threadpool",)] = executor["queued"]
+    limiter = to_thread.current_default_thread_limiter().statistics()
+    values[("anyio_threadpool",)] = limiter.tasks_waiting
+
+    priorities = llm_scheduler.stats()["priorities"]
+    for priority in LLMPriority:
+        values[(f"llm_scheduler_{priority.name.lower()}",)] = priorities[priority.name][
+            "queue_depth"
+        ]
+    values[("singleflight_inflight",)] = singleflight.stats()["inflight"]
+    values[("speculative_followups",)] = speculative_followups.stats()["pending"]
+    return values
+
+
+def _collect_redis_pool() -> Dict[Tuple[str, ...], float]:
+    return {(state,): value for state, value in redis_pool_stats().items()}
+
+
+def _collect_memory_store() -> Dict[Tuple[str, ...], float]:
+    return {(key,): value for key, value in MemoryManager._memory_store.stats().items()}
+
+
+metrics_registry.register(
+    CallbackGauge(
+        "aiew_threadpool_threads",
+        "Worker threads by pool and state",
+        ("pool", "state"),
+        _collect_threadpools,
+    )
+)
+metrics_registry.register(
+    CallbackGauge(
+        "aiew_queue_depth",
+        "Items waiting in thread pools, LLM scheduler and in-flight LLM work",
+        ("queue",),
+        _collect_queues,
+    )
+)
+metrics_registry.register(
+    CallbackGauge(
+        "aiew_redis_pool_connections",
+        "Shared Redis pool connections by state",
+        ("state",),
+        _collect_redis_pool,
+    )
+)
+metrics_registry.register(
+    CallbackGauge(
+        "aiew_memory_store_usage",
+        "In-process session memory store usage and limits (no Redis)",
+        ("resource",),
+        _collect_memory_store,
+    )
+)
+
+
+@router.get("/metrics", tags=["Metrics"], summary="Prometheus Metrics")
+async def get_metrics() -> Response:
+    # anyio 스레드 limiter는 이벤트 루프에서만 조회 가능
+    return Response(
+        content=generate_latest(metrics_registry), media_type=CONTENT_TYPE_LATEST
+    )
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, File, UploadFile
 
 from app.models.pdf import PDFUploadResponse
@@ -22,8 +24,9 @@ async def parse_pdf(
     if not file.filename:
         file.filename = ""
 
-    results = service.process_and_persist(
-        file_bytes=file_bytes, file_name=file.filename
+    # OCR은 CPU 바운드 작업이므로 이벤트 루프를 막지 않도록 스레드로 위임
+    results = await asyncio.to_thread(
+        service.process_and_persist, file_bytes, file.filename
     )
 
     return PDFUploadResponse(filename=file.filename, extracted_text=results)
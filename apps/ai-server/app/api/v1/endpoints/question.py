@@ -1,11 +1,17 @@
-from typing import List
+import logging
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Body, Depends, Header
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from langchain_core.chat_history import BaseChatMessageHistory
 
 from app.models.question import QuestionRequest, QuestionResponse
 from app.services.memory_logger import MemoryManager
 from app.services.question_generator import QuestionGeneratorService
+from app.utils.llm_utils import is_deterministic
+from app.utils.sse import SSE_HEADERS, format_sse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -16,11 +22,58 @@ router = APIRouter()
     tags=["Question"],
     summary="Generate Interview Questions",
 )
-def generate_question(
+async def generate_question(
+    response: Response,
     x_session_id: str = Header(...),
     req: QuestionRequest = Body(...),
+    use_cache: Optional[bool] = Query(
+        None,
+        description="LLM 응답 캐시 사용 여부"
+        " (미지정 시 seed가 있고 모델 temperature가 0일 때만 사용)",
+    ),
     memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
 ) -> List[QuestionResponse]:
     service = QuestionGeneratorService(memory=memory, session_id=x_session_id)
 
-    return service.generate_questions(req.user_info, req.constraints)
+    # seed만으로는 샘플링이 고정되지 않음 → temperature 0 모델일 때만 기본 캐시 대상
+    if use_cache is None:
+        use_cache = req.constraints.seed is not None and is_deterministic()
+
+    result = await service.agenerate_questions(
+        req.user_info, req.constraints, use_cache=use_cache
+    )
+    response.headers["X-LLM-Cache"] = service.cache_status
+    return result
+
+
+@router.post(
+    "/question-generating/stream",
+    tags=["Question"],
+    summary="Generate Interview Questions (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_question(
+    x_session_id: str = Header(...),
+    req: QuestionRequest = Body(...),
+    memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
+) -> StreamingResponse:
+    """
+    질문이 완성되는 즉시 `event: question` 으로 하나씩 전송하고,
+    마지막에 `event: done` (또는 실패 시 `event: error`)을 전송합니다.
+    """
+    service = QuestionGeneratorService(memory=memory, session_id=x_session_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        count = 0
+        try:
+            async for q in service.astream_questions(req.user_info, req.constraints):
+                count += 1
+                yield format_sse("question", q.model_dump(mode="json"))
+            yield format_sse("done", {"count": count})
+        except Exception as e:
+            logger.error(f"[{x_session_id}] question stream failed: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
@@ -1,4 +1,6 @@
 import logging
+import time
+from typing import Any, Dict, List, Tuple
 
 from fastapi import (
     APIRouter,
@@ -7,14 +9,20 @@ from fastapi import (
     HTTPException,
 )
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_redis import RedisChatMessageHistory
 
+from app.models.event_types import EventType
 from app.models.memory import (
     AnswerReceivedRequest,
     QuestionAskedRequest,
     RestoreRequest,
 )
-from app.services.memory_logger import MemoryLogger, MemoryManager
+from app.services.memory_logger import (
+    InMemorySessionHistory,
+    MemoryLogger,
+    MemoryManager,
+    RedisSessionHistory,
+    SQLiteSessionHistory,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,27 +41,15 @@ def refresh_ttl(
     memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
     x_session_id: str = Header(...),
 ):
-    if not isinstance(memory, RedisChatMessageHistory):
-        # in-memory fallback 지원
+    if isinstance(memory, RedisSessionHistory):
+        # 세션 인덱스 Set 기반 → 키스페이스 SCAN 없이 세션 크기에 비례
+        refreshed = memory.refresh_ttl(memory.ttl or MemoryManager._ttl)
+    elif isinstance(memory, (InMemorySessionHistory, SQLiteSessionHistory)):
+        # in-memory / SQLite: 세션 만료 시각 연장
+        refreshed = memory.refresh_ttl(MemoryManager._ttl)
+    else:
         return {"ok": True, "refreshed": 0}
 
-    ttl: int = memory.ttl or MemoryManager._ttl
-    pattern = f"{memory.key_prefix}{memory.session_id}:*"
-    refreshed = 0
-    cursor: int = 0
-    while True:
-        cursor, keys = memory.redis_client.scan(  # type: ignore[misc]
-            cursor=cursor, match=pattern, count=100
-        )
-        if keys:
-            pipe = memory.redis_client.pipeline()
-            for key in keys:
-                pipe.expire(key, ttl)
-            pipe.execute()
-            refreshed += len(keys)
-        if cursor == 0:
-            break
-
     logger.info(f"[{x_session_id}] TTL refreshed for {refreshed} keys")
     return {"ok": True, "refreshed": refreshed}
 
@@ -103,12 +99,11 @@ def restore_memory(
             f"[{x_session_id}] Restoring memory with {len(payload.steps)} steps"
         )
 
-        # 1. 기존 메모리 초기화
-        memory.clear()
-
+        start = time.perf_counter()
         memory_logger = MemoryLogger(memory=memory, session_id=x_session_id)
 
-        # 2. 각 스텝 순회하며 로깅
+        # 1. 스텝별 이벤트 직렬화 (QUESTION_ASKED → ANSWER_RECEIVED → ANSWER_EVALUATED)
+        events: List[Tuple[str, Dict[str, Any]]] = []
         for step in payload.steps:
             # QUESTION_ASKED 로깅 (메인/꼬리 통합, parentQuestionId로 구분)
             question_data = {
@@ -122,26 +117,48 @@ def restore_memory(
             }
             if step.parentQuestionId:
                 question_data["parentQuestionId"] = step.parentQuestionId
-            memory_logger.log_question_asked(question_data)
+            events.append((EventType.QUESTION_ASKED, question_data))
 
             # 답변이 있으면 ANSWER_RECEIVED 로깅
             if step.answer is not None:
-                memory_logger.log_answer_received(
-                    {
-                        "aiQuestionId": step.aiQuestionId,
-                        "answer": step.answer,
-                        "answerDurationSec": step.answerDurationSec or 0,
-                    }
+                events.append(
+                    (
+                        EventType.ANSWER_RECEIVED,
+                        {
+                            "aiQuestionId": step.aiQuestionId,
+                            "answer": step.answer,
+                            "answerDurationSec": step.answerDurationSec or 0,
+                        },
+                    )
                 )
 
             # 평가가 있으면 ANSWER_EVALUATED 로깅
             if step.evaluation is not None:
-                memory_logger.log_answer_evaluated(step.evaluation.model_dump())
+                events.append(
+                    (EventType.ANSWER_EVALUATED, step.evaluation.model_dump())
+                )
+        build_ms = round((time.perf_counter() - start) * 1000)
 
-            logger.info(f"[{x_session_id}] Step {step.aiQuestionId} restored")
+        # 2. 기존 메모리 초기화 + 전체 기록을 한 번에 교체 (Redis 트랜잭션 1회)
+        step_start = time.perf_counter()
+        memory_logger.replace_events(events)
+        write_ms = round((time.perf_counter() - step_start) * 1000)
+        total_ms = round((time.perf_counter() - start) * 1000)
 
-        logger.info(f"[{x_session_id}] Memory restore completed successfully")
-        return {"ok": True, "restored_steps": len(payload.steps)}
+        logger.info(
+            f"[{x_session_id}] Memory restore completed successfully"
+            f" ({len(events)} events, write={write_ms}ms, total={total_ms}ms)"
+        )
+        return {
+            "ok": True,
+            "restored_steps": len(payload.steps),
+            "events": len(events),
+            "timings": {
+                "build_ms": build_ms,
+                "write_ms": write_ms,
+                "total_ms": total_ms,
+            },
+        }
     except Exception as e:
         logger.error(f"[{x_session_id}] Failed to restore memory: {str(e)}")
         raise HTTPException(
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
+from langchain_core.chat_history import BaseChatMessageHistory
+
+from app.models.turn import TurnRequest, TurnResponse
+from app.services.memory_logger import MemoryManager
+from app.services.turn_processor import TurnService
+
+router = APIRouter()
+
+
+@router.post(
+    "/turn-processing",
+    response_model=TurnResponse,
+    tags=["Turn"],
+    summary="Submit Answer (Log + Evaluate + Follow-up in one call)",
+)
+async def process_turn(
+    response: Response,
+    x_session_id: str = Header(...),
+    req: TurnRequest = Body(...),
+    use_cache: bool = Query(False, description="LLM 응답 캐시 사용 여부"),
+    memory: BaseChatMessageHistory = Depends(MemoryManager.MemoryDep),
+) -> TurnResponse:
+    service = TurnService(memory=memory, session_id=x_session_id)
+
+    result = await service.aprocess_turn(req, use_cache=use_cache)
+    response.headers["X-LLM-Cache"] = service.cache_status
+    response.headers["X-Request-Coalesced"] = str(service.coalesced).lower()
+    return result
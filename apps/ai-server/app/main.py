@@ -1,19 +1,42 @@
+import asyncio
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 
-import redis.asyncio as redis
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from starlette.routing import Match
 
 from app.api.v1.endpoints import (
     emotion,
     evaluation,
     followup,
+    llm_debug,
     memory_debug,
+    metrics,
     pdf,
     question,
     session_log,
+    turn,
 )
+from app.utils.fast_json import FastJSONResponse
+from app.utils.llm_cache import llm_cache
+from app.utils.llm_utils import chain_registry
+from app.utils.metrics import (
+    current_endpoint,
+    http_request_duration,
+    http_requests_in_progress,
+)
+from app.utils.redis_pool import (
+    close_async_redis_client,
+    close_redis_client,
+    close_shared_redis_client,
+    create_async_redis_client,
+    create_redis_client,
+)
+from app.utils.singleflight import singleflight
+from app.utils.thread_pool import install_default_executor
+from app.utils.tracing import tracer
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -21,23 +44,48 @@ logger = logging.getLogger("uvicorn.error")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # asyncio.to_thread 대기·실행 수를 /metrics에 노출하는 계측 실행기
+    install_default_executor(asyncio.get_running_loop())
+
+    # 모든 세션 기록이 공유하는 Redis 커넥션 풀 (요청마다 클라이언트를 만들지 않음)
+    # 비동기 경로(single-flight, LLM 캐시)는 같은 설정의 비동기 풀을 공유
+    app.state.redis = None
+    app.state.aredis = None
     redis_url = os.getenv("REDIS_URL")
     if redis_url:
+        app.state.redis = create_redis_client(redis_url)
+        app.state.aredis = create_async_redis_client(redis_url)
+        singleflight.bind(app.state.aredis)
+        llm_cache.bind(app.state.redis, app.state.aredis)
         try:
-            client = redis.from_url(redis_url)
-            pong = await client.ping()  # type: ignore[misc]
+            pong = await asyncio.to_thread(app.state.redis.ping)
             logger.info(f"Redis connected: {pong}")
-            await client.aclose()
         except Exception as e:
             logger.error(f"Redis connection failed: {e}")
     else:
         logger.warning("REDIS_URL not configured, skipping Redis connection")
 
+    # 프롬프트 파싱 및 LCEL 체인 컴파일을 요청 경로 밖에서 미리 수행
+    compiled = chain_registry.warmup()
+    logger.info(f"LLM chains compiled: {compiled}")
+
     yield
     # Shutdown
+    if app.state.redis is not None:
+        singleflight.bind(None)
+        llm_cache.bind(None, None)
+        close_redis_client(app.state.redis)
+        await close_async_redis_client(app.state.aredis)
+    close_shared_redis_client()
+    tracer.shutdown()
 
 
-app = FastAPI(title="AIew", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="AIew",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 app.include_router(session_log.router, prefix="/api/v1/session-log", tags=["Session"])
 app.include_router(memory_debug.router, prefix="/api/v1/memory-debug", tags=["Session"])
@@ -45,7 +93,48 @@ app.include_router(pdf.router, prefix="/api/v1/pdf", tags=["PDF"])
 app.include_router(question.router, prefix="/api/v1/question", tags=["Question"])
 app.include_router(evaluation.router, prefix="/api/v1/evaluation", tags=["Evaluation"])
 app.include_router(followup.router, prefix="/api/v1/followup", tags=["Question"])
+app.include_router(turn.router, prefix="/api/v1/turn", tags=["Turn"])
 app.include_router(emotion.router, prefix="/api/v1/emotion", tags=["Emotion"])
+app.include_router(llm_debug.router, prefix="/api/v1/llm-debug", tags=["LLM"])
+app.include_router(metrics.router, tags=["Metrics"])
+
+
+def _route_label(request: Request) -> str:
+    """라벨 카디널리티 제한: 등록된 라우트 경로만 사용"""
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    endpoint = _route_label(request)
+    token = current_endpoint.set(endpoint)
+    start = time.perf_counter()
+    status = 500
+    try:
+        # core-api가 보낸 traceparent가 있으면 같은 trace로 이어서 기록
+        with (
+            tracer.start_trace(
+                f"{request.method} {endpoint}",
+                request.headers,
+                **{"http.method": request.method, "http.route": endpoint},
+            ) as span,
+            http_requests_in_progress.labels(endpoint=endpoint).track_inprogress(),
+        ):
+            response = await call_next(request)
+            status = response.status_code
+            span.set_attribute("http.status_code", status)
+            tracer.inject(response.headers)
+        return response
+    finally:
+        # 스트리밍 응답은 응답 시작 시점까지의 시간
+        http_request_duration.labels(
+            endpoint=endpoint, method=request.method, status=str(status)
+        ).observe(time.perf_counter() - start)
+        current_endpoint.reset(token)
 
 
 @app.get("/healthz")
@@ -158,6 +158,29 @@ class AnswerEvaluationRequest(BaseModel):
     }
 
 
+class AnswerEvaluationBatchRequest(BaseModel):
+    items: List[AnswerEvaluationRequest] = Field(
+        ..., min_length=1, max_length=50, description="평가할 질문/답변 목록"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "items": [
+                    AnswerEvaluationRequest.model_config["json_schema_extra"]["example"]
+                ]
+            }
+        }
+    }
+
+
+class AnswerEvaluationBatchResponse(BaseModel):
+    results: List[AnswerEvaluationResult] = Field(
+        ..., description="요청 순서와 동일한 평가 결과 목록"
+    )
+    elapsedMs: int = Field(..., ge=0, description="배치 전체 처리 시간(ms)")
+
+
 class SessionEvaluationResult(BaseModel):
     averageScore: float = Field(..., ge=1.0, le=5.0, description="세션 전체 평균 점수")
     sessionFeedback: str = Field(..., description="1000±50자 내외의 세션 종합 피드백")
@@ -176,3 +199,9 @@ class SessionFeedbackOutput(BaseModel):
     """LLM 출력 전용 래퍼 — averageScore는 메모리에서 계산 후 주입"""
 
     sessionFeedback: str = Field(..., description="1000+자 세션 종합 피드백")
+
+
+class SessionGroupSummaryOutput(BaseModel):
+    """map-reduce 세션 평가의 map 단계 출력 (메인 질문 단위 요약)"""
+
+    summary: str = Field(..., description="메인 질문과 꼬리질문 묶음 요약")
@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -11,8 +11,13 @@ class Message(BaseModel):
 
 class MemoryDump(BaseModel):
     session_id: str = Field(..., description="세션 ID")
-    history_str: str = Field(..., description="Memory가 합쳐서 내주는 문자열")
+    history_str: Optional[str] = Field(
+        None, description="Memory가 합쳐서 내주는 문자열 (include_history=false면 null)"
+    )
     messages: List[Message] = Field(..., description="원본 메시지 배열 (role, content)")
+    next_cursor: Optional[str] = Field(
+        None, description="다음 페이지 cursor (마지막 페이지면 null)"
+    )
 
 
 """ session_log.py 에서 사용되는 모델들 """
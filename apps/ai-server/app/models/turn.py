@@ -0,0 +1,65 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.evaluation import AnswerEvaluationRequest, AnswerEvaluationResult
+from app.models.followup import FollowupResponse
+from app.models.memory import QuestionAskedRequest
+
+
+class TurnRequest(BaseModel):
+    """답변 제출 1턴(기록 → 평가 → 꼬리질문 → 기록)을 한 번에 처리하는 요청"""
+
+    evaluation: AnswerEvaluationRequest = Field(..., description="평가 대상 질문/답변")
+    questionAsked: Optional[QuestionAskedRequest] = Field(
+        None,
+        description=(
+            "현재 질문의 QUESTION_ASKED를 함께 기록할 경우 전달."
+            " 이전 턴이 생성한 꼬리질문은 서버가 이미 기록했으므로 생략 (전달해도 무시)"
+        ),
+    )
+    rootQuestionId: Optional[str] = Field(
+        None,
+        pattern=r"^q\d+$",
+        description="꼬리질문의 부모 메인 질문 ID (생략 시 aiQuestionId에서 추출)",
+    )
+    allowFollowup: bool = Field(True, description="False면 꼬리질문을 생성하지 않음")
+    maxFollowups: int = Field(
+        3, ge=0, description="메인 질문당 최대 꼬리질문 수 (메모리 기준)"
+    )
+    combined: bool = Field(
+        False, description="True면 평가와 꼬리질문을 LLM 1회 호출로 함께 생성"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "evaluation": AnswerEvaluationRequest.model_config["json_schema_extra"][
+                    "example"
+                ],
+                "allowFollowup": True,
+                "maxFollowups": 3,
+                "combined": False,
+            }
+        }
+    }
+
+
+class TurnCombinedOutput(BaseModel):
+    """combined 모드 LLM 출력 전용 래퍼 — 평가 + (필요 시) 꼬리질문"""
+
+    evaluation: AnswerEvaluationResult
+    followup: Optional[FollowupResponse] = None
+
+
+class TurnResponse(BaseModel):
+    evaluation: AnswerEvaluationResult
+    followup: Optional[FollowupResponse] = Field(
+        None, description="생성된 꼬리질문 (생성하지 않았으면 null)"
+    )
+    combined: bool = Field(
+        ..., description="평가·꼬리질문을 1회 호출로 생성했는지 여부"
+    )
+    timings: Dict[str, int] = Field(
+        default_factory=dict, description="단계별 소요 시간(ms)"
+    )
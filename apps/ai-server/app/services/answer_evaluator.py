@@ -1,25 +1,61 @@
+import asyncio
+import contextvars
 import logging
+import os
 import time
-from typing import Any, Dict, List, Optional, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
+from dotenv import load_dotenv
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
 
 from app.models.evaluation import (
+    AnswerEvaluationBatchRequest,
     AnswerEvaluationRequest,
     AnswerEvaluationResult,
     SessionEvaluationResult,
     SessionFeedbackOutput,
+    SessionGroupSummaryOutput,
+    TailDecision,
 )
+from app.models.event_types import EventType
+from app.models.followup import FollowupRequest
+from app.services.followup_generator import FollowupGeneratorService
 from app.services.memory_logger import MemoryLogger
-from app.utils.extract_evaluation import extract_evaluation
-from app.utils.llm_utils import PROMPT_BASE_DIR, llm, load_prompt_template
+from app.services.speculation import speculative_followups
+from app.utils.extract_evaluation import extract_evaluation_groups
+from app.utils.llm_cache import CACHE_BYPASS
+from app.utils.llm_scheduler import LLMPriority
+from app.utils.llm_utils import ainvoke_structured, chain_registry, invoke_structured
+from app.utils.singleflight import request_key, singleflight
+from app.utils.token_budget import estimate_tokens
+from app.utils.tracing import traced
+
+load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-PROMPT_PATH = (PROMPT_BASE_DIR / "evaluation_prompt.txt").resolve()
-SESSION_PROMPT_PATH = (PROMPT_BASE_DIR / "session_evaluation_prompt.txt").resolve()
+# 배치 평가·세션 평가 map 단계에서 동시에 진행할 LLM 호출 수
+BATCH_EVALUATION_CONCURRENCY = int(os.getenv("BATCH_EVALUATION_CONCURRENCY", "5"))
+# 세션 대화 토큰 수가 이 값 이상이면 메인 질문 단위 map-reduce로 세션 평가
+SESSION_MAP_REDUCE_MIN_TOKENS = int(os.getenv("SESSION_MAP_REDUCE_MIN_TOKENS", "4000"))
+
+PROMPT_NAME = "evaluation_prompt.txt"
+SESSION_PROMPT_NAME = "session_evaluation_prompt.txt"
+GROUP_SUMMARY_PROMPT_NAME = "session_group_summary_prompt.txt"
+
+chain_registry.register(
+    PROMPT_NAME, AnswerEvaluationResult, LLMPriority.ANSWER_EVALUATION
+)
+chain_registry.register(
+    SESSION_PROMPT_NAME, SessionFeedbackOutput, LLMPriority.SESSION_EVALUATION
+)
+chain_registry.register(
+    GROUP_SUMMARY_PROMPT_NAME,
+    SessionGroupSummaryOutput,
+    LLMPriority.SESSION_EVALUATION,
+)
 
 
 class EvaluationService:
@@ -27,6 +63,8 @@ class EvaluationService:
         self.memory = memory
         self.session_id = session_id
         self.logger = MemoryLogger(memory=memory, session_id=session_id)
+        self.cache_status = CACHE_BYPASS
+        self.coalesced = False
 
     @staticmethod
     def _is_truly_empty_answer(answer: Optional[str]) -> bool:
@@ -119,10 +157,36 @@ class EvaluationService:
 
         return forced
 
+    @staticmethod
+    def _build_answer_vars(req: AnswerEvaluationRequest) -> Dict[str, Any]:
+        return {
+            "ai_question_id": req.aiQuestionId,
+            "type": req.type,
+            "criteria_csv": (", ".join(req.criteria) if req.criteria else ""),
+            "skills_csv": (", ".join(req.skills) if req.skills else ""),
+            "question_text": req.question,
+            "user_answer": req.answer,
+            "answer_duration_sec": req.answerDurationSec,
+        }
+
+    @staticmethod
+    def _build_session_result(
+        avg_score: float, result: SessionFeedbackOutput
+    ) -> SessionEvaluationResult:
+        float_avg_score = max(1.0, min(5.0, float(avg_score)))
+        return SessionEvaluationResult.model_validate(
+            {
+                "averageScore": float_avg_score,
+                "sessionFeedback": result.sessionFeedback,
+            }
+        )
+
+    @traced()
     def evaluate_answer(
         self,
         req: AnswerEvaluationRequest,
         run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
     ) -> AnswerEvaluationResult:
         # 0. '답변 누락 / 실질적 내용 없음' 예외 처리 → LLM 호출 생략
         if self._is_truly_empty_answer(req.answer):
@@ -132,65 +196,316 @@ class EvaluationService:
             return eval_result
 
         # 1. 정상 케이스 → LCEL 체인
-        raw_prompt = load_prompt_template(PROMPT_PATH)
-
-        chain = ChatPromptTemplate.from_messages(
-            [("human", raw_prompt)]
-        ) | llm.with_structured_output(AnswerEvaluationResult, method="json_mode")
-
-        vars: Dict[str, Any] = {
-            "ai_question_id": req.aiQuestionId,
-            "type": req.type,
-            "criteria_csv": (", ".join(req.criteria) if req.criteria else ""),
-            "skills_csv": (", ".join(req.skills) if req.skills else ""),
-            "question_text": req.question,
-            "user_answer": req.answer,
-            "answer_duration_sec": req.answerDurationSec,
-        }
+        vars = self._build_answer_vars(req)
 
         start = time.perf_counter()
-        eval_result = cast(
-            AnswerEvaluationResult, chain.invoke(vars, config=run_config or {})
+        eval_result, self.cache_status = invoke_structured(
+            PROMPT_NAME, AnswerEvaluationResult, vars, run_config, use_cache
         )
         duration_ms = round((time.perf_counter() - start) * 1000)
         logger.info(
             f"[{self.session_id}] evaluate_answer chain.invoke completed in {duration_ms}ms"
+            f" (cache={self.cache_status})"
         )
 
         self.logger.log_answer_evaluated(eval_result.model_dump())
 
         return eval_result
 
+    @traced()
+    async def aevaluate_answer(
+        self,
+        req: AnswerEvaluationRequest,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> AnswerEvaluationResult:
+        """
+        evaluate_answer의 비동기 버전 (chain.ainvoke, 메모리 I/O는 스레드로 위임).
+
+        같은 세션·같은 요청 본문의 동시 중복 호출(core-api 재시도 등)은 하나의
+        실행으로 합쳐지며, ANSWER_EVALUATED 이벤트도 한 번만 기록됩니다.
+        """
+        key = request_key(self.session_id, "answer-evaluating", req)
+        result, self.coalesced = await singleflight.do(
+            key,
+            lambda: self._aevaluate_answer(req, run_config, use_cache),
+            AnswerEvaluationResult,
+        )
+        return result
+
+    @staticmethod
+    def build_followup_request(
+        req: AnswerEvaluationRequest,
+        eval_result: AnswerEvaluationResult,
+        parent_qid: Optional[str] = None,
+    ) -> FollowupRequest:
+        """평가 결과로 꼬리질문 요청 구성 (core-api handleFollowupQuestion과 동일 형식)"""
+        return FollowupRequest(
+            # 꼬리질문은 항상 메인 질문 ID 기준 (q1-fu1 → q1)
+            aiQuestionId=parent_qid or req.aiQuestionId.split("-")[0],
+            type=req.type,
+            question=req.question,
+            criteria=req.criteria,
+            skills=req.skills,
+            answer=req.answer,
+            evaluationSummary=(
+                f"Strengths: {', '.join(eval_result.strengths)}, "
+                f"Improvements: {', '.join(eval_result.improvements)}"
+            ),
+        )
+
+    def _start_speculative_followup(
+        self, req: AnswerEvaluationRequest, eval_result: AnswerEvaluationResult
+    ) -> None:
+        """
+        tailDecision=create이면 core-api의 꼬리질문 요청을 기다리지 않고
+        생성을 미리 시작.
+        """
+        if eval_result.tailDecision != TailDecision.create:
+            return
+
+        followup_req = self.build_followup_request(req, eval_result)
+        key = speculative_followups.make_key(
+            self.session_id, FollowupGeneratorService._build_vars(followup_req)
+        )
+        speculative_followups.start(
+            key,
+            lambda: FollowupGeneratorService.agenerate_raw(
+                followup_req, session_id=self.session_id
+            ),
+        )
+
+    @traced()
+    async def ascore_answer(
+        self,
+        req: AnswerEvaluationRequest,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> AnswerEvaluationResult:
+        """메모리 기록·speculative 생성 없이 평가 결과만 생성 (턴 처리용)"""
+        if self._is_truly_empty_answer(req.answer):
+            forced = self._build_forced_empty_result(req)
+            return AnswerEvaluationResult.model_validate(forced)
+
+        vars = self._build_answer_vars(req)
+
+        start = time.perf_counter()
+        eval_result, self.cache_status = await ainvoke_structured(
+            PROMPT_NAME,
+            AnswerEvaluationResult,
+            vars,
+            run_config,
+            use_cache,
+            session_id=self.session_id,
+        )
+        duration_ms = round((time.perf_counter() - start) * 1000)
+        logger.info(
+            f"[{self.session_id}] aevaluate_answer chain.ainvoke completed in {duration_ms}ms"
+            f" (cache={self.cache_status})"
+        )
+        return eval_result
+
+    async def _aevaluate_answer(
+        self,
+        req: AnswerEvaluationRequest,
+        run_config: Optional[RunnableConfig],
+        use_cache: bool,
+    ) -> AnswerEvaluationResult:
+        eval_result = await self.ascore_answer(req, run_config, use_cache)
+
+        self._start_speculative_followup(req, eval_result)
+
+        await asyncio.to_thread(
+            self.logger.log_answer_evaluated, eval_result.model_dump()
+        )
+
+        return eval_result
+
+    @traced()
+    async def aevaluate_answers(
+        self,
+        batch: AnswerEvaluationBatchRequest,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> List[AnswerEvaluationResult]:
+        """
+        여러 답변을 동시에 평가 (세션 복원·재채점용).
+
+        - 동시 LLM 호출 수는 BATCH_EVALUATION_CONCURRENCY로 제한
+        - 답변 누락 항목은 항목별로 LLM 호출 없이 강제 평가
+        - ANSWER_EVALUATED 이벤트는 요청 순서대로 한 번에 기록
+        - speculative 꼬리질문은 시작하지 않음
+        """
+        semaphore = asyncio.Semaphore(BATCH_EVALUATION_CONCURRENCY)
+
+        async def score(req: AnswerEvaluationRequest) -> AnswerEvaluationResult:
+            async with semaphore:
+                return await self.ascore_answer(req, run_config, use_cache)
+
+        results = list(await asyncio.gather(*(score(req) for req in batch.items)))
+
+        await asyncio.to_thread(
+            self.logger.log_events,
+            [(EventType.ANSWER_EVALUATED, r.model_dump()) for r in results],
+        )
+        return results
+
+    @staticmethod
+    def _use_map_reduce(conversation_text: str, groups: Dict[str, str]) -> bool:
+        """대화가 길고 메인 질문이 2개 이상이면 map-reduce로 세션 평가"""
+        return (
+            len(groups) > 1
+            and estimate_tokens(conversation_text) >= SESSION_MAP_REDUCE_MIN_TOKENS
+        )
+
+    @staticmethod
+    def _build_group_vars(main_qid: str, group_text: str) -> Dict[str, Any]:
+        return {"main_question_id": main_qid, "conversation": group_text}
+
+    @staticmethod
+    def _join_summaries(summaries: Dict[str, str]) -> str:
+        return "\n\n".join(
+            f"QID: {qid} (꼬리질문 포함 요약)\nSummary: {summary}"
+            for qid, summary in summaries.items()
+        )
+
+    @traced()
+    def _summarize_group(
+        self,
+        main_qid: str,
+        group_text: str,
+        run_config: Optional[RunnableConfig],
+        use_cache: bool,
+    ) -> str:
+        result, _ = invoke_structured(
+            GROUP_SUMMARY_PROMPT_NAME,
+            SessionGroupSummaryOutput,
+            self._build_group_vars(main_qid, group_text),
+            run_config,
+            use_cache,
+        )
+        return result.summary
+
+    @traced()
+    async def _asummarize_group(
+        self,
+        main_qid: str,
+        group_text: str,
+        run_config: Optional[RunnableConfig],
+        use_cache: bool,
+    ) -> str:
+        result, _ = await ainvoke_structured(
+            GROUP_SUMMARY_PROMPT_NAME,
+            SessionGroupSummaryOutput,
+            self._build_group_vars(main_qid, group_text),
+            run_config,
+            use_cache,
+            session_id=self.session_id,
+        )
+        return result.summary
+
+    @traced()
     def evaluate_session(
         self,
         run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
     ) -> SessionEvaluationResult:
-        avg_score, conversation_text = extract_evaluation(self.memory)
-
-        raw_prompt = load_prompt_template(SESSION_PROMPT_PATH)
+        """
+        세션 종합 평가. 대화가 길면 메인 질문(꼬리질문 포함) 단위로 병렬 요약(map)한
+        뒤 요약을 모아 최종 피드백을 생성(reduce)합니다.
+        동시 요약 수는 BATCH_EVALUATION_CONCURRENCY로 제한합니다.
+        """
+        avg_score, conversation_text, groups = extract_evaluation_groups(self.memory)
 
-        chain = ChatPromptTemplate.from_messages(
-            [("human", raw_prompt)]
-        ) | llm.with_structured_output(SessionFeedbackOutput, method="json_mode")
+        start = time.perf_counter()
+        mode = "single"
+        if self._use_map_reduce(conversation_text, groups):
+            mode = "map-reduce"
+            # 스레드마다 현재 context 복사본에서 실행 → endpoint 라벨·trace span 유지
+            workers = min(len(groups), BATCH_EVALUATION_CONCURRENCY)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(
+                        contextvars.copy_context().run,
+                        self._summarize_group,
+                        qid,
+                        text,
+                        run_config,
+                        use_cache,
+                    )
+                    for qid, text in groups.items()
+                ]
+                conversation_text = self._join_summaries(
+                    {qid: f.result() for qid, f in zip(groups.keys(), futures)}
+                )
 
         vars: Dict[str, Any] = {
             "conversation": conversation_text,
             "avg_score": avg_score,
         }
 
-        start = time.perf_counter()
-        result = cast(
-            SessionFeedbackOutput, chain.invoke(vars, config=run_config or {})
+        result, self.cache_status = invoke_structured(
+            SESSION_PROMPT_NAME, SessionFeedbackOutput, vars, run_config, use_cache
         )
         duration_ms = round((time.perf_counter() - start) * 1000)
         logger.info(
             f"[{self.session_id}] evaluate_session chain.invoke completed in {duration_ms}ms"
+            f" (mode={mode}, groups={len(groups)}, cache={self.cache_status})"
         )
 
-        float_avg_score = max(1.0, min(5.0, float(avg_score)))
-        return SessionEvaluationResult.model_validate(
-            {
-                "averageScore": float_avg_score,
-                "sessionFeedback": result.sessionFeedback,
-            }
+        return self._build_session_result(avg_score, result)
+
+    @traced()
+    async def aevaluate_session(
+        self,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> SessionEvaluationResult:
+        """evaluate_session의 비동기 버전"""
+        avg_score, conversation_text, groups = await asyncio.to_thread(
+            extract_evaluation_groups, self.memory
+        )
+
+        start = time.perf_counter()
+        mode = "single"
+        if self._use_map_reduce(conversation_text, groups):
+            mode = "map-reduce"
+            semaphore = asyncio.Semaphore(BATCH_EVALUATION_CONCURRENCY)
+
+            async def summarize(qid: str, text: str) -> str:
+                async with semaphore:
+                    return await self._asummarize_group(
+                        qid, text, run_config, use_cache
+                    )
+
+            summaries = await asyncio.gather(
+                *(summarize(qid, text) for qid, text in groups.items())
+            )
+            conversation_text = self._join_summaries(
+                dict(zip(groups.keys(), summaries))
+            )
+            logger.info(
+                f"[{self.session_id}] session map step: {len(groups)} groups"
+                f" in {round((time.perf_counter() - start) * 1000)}ms"
+            )
+
+        vars: Dict[str, Any] = {
+            "conversation": conversation_text,
+            "avg_score": avg_score,
+        }
+
+        result, self.cache_status = await ainvoke_structured(
+            SESSION_PROMPT_NAME,
+            SessionFeedbackOutput,
+            vars,
+            run_config,
+            use_cache,
+            session_id=self.session_id,
         )
+        duration_ms = round((time.perf_counter() - start) * 1000)
+        logger.info(
+            f"[{self.session_id}] aevaluate_session chain.ainvoke completed in {duration_ms}ms"
+            f" (mode={mode}, groups={len(groups)}, cache={self.cache_status})"
+        )
+
+        return self._build_session_result(avg_score, result)
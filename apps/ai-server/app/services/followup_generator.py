@@ -1,20 +1,31 @@
-import json
+import asyncio
 import logging
 import time
-from typing import Any, Dict, Optional, cast
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
 
-from app.models.event_types import EventType
 from app.models.followup import FollowupRequest, FollowupResponse
 from app.services.memory_logger import MemoryLogger
-from app.utils.llm_utils import PROMPT_BASE_DIR, llm, load_prompt_template
+from app.services.speculation import speculative_followups
+from app.utils.llm_cache import CACHE_BYPASS
+from app.utils.llm_scheduler import LLMPriority, llm_scheduler
+from app.utils.llm_utils import (
+    ainvoke_structured,
+    chain_registry,
+    estimate_call_tokens,
+    invoke_structured,
+)
+from app.utils.session_projection import count_followups
+from app.utils.singleflight import request_key, singleflight
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
-PROMPT_PATH = (PROMPT_BASE_DIR / "followup_prompt.txt").resolve()
+PROMPT_NAME = "followup_prompt.txt"
+
+chain_registry.register(PROMPT_NAME, FollowupResponse, LLMPriority.FOLLOWUP)
 
 
 class FollowupGeneratorService:
@@ -26,33 +37,24 @@ class FollowupGeneratorService:
         self.memory = memory
         self.session_id = session_id
         self.logger = MemoryLogger(memory=memory, session_id=session_id)
+        self.cache_status = CACHE_BYPASS
+        self.coalesced = False
+        self.speculative_hit = False
 
+    @traced()
     def _count_existing_followups(self, parent_qid: str = "") -> int:
-        """타입 필드 기반 꼬리질문 카운팅"""
-        messages = self.memory.messages
-        if not messages:
-            return 0
-        cnt = 0
-        for m in messages:
-            content = str(getattr(m, "content", ""))
-            try:
-                event = json.loads(content)
-                if (
-                    event.get("type") == EventType.QUESTION_ASKED
-                    and event.get("data", {}).get("parentQuestionId") == parent_qid
-                ):
-                    cnt += 1
-            except (json.JSONDecodeError, AttributeError):
-                continue
-        return cnt
+        """세션 projection 기반 꼬리질문 카운팅 (메시지 전체를 다시 읽지 않음)"""
+        return count_followups(self.memory, parent_qid)
 
     def _normalize_items(
         self,
         parsed: FollowupResponse,
         req: FollowupRequest,
+        existing: Optional[int] = None,
     ) -> Dict[str, Any]:
         if req.autoSequence:
-            existing = self._count_existing_followups(req.aiQuestionId)
+            if existing is None:
+                existing = self._count_existing_followups(req.aiQuestionId)
             idx = existing + 1
         else:
             idx = req.nextFollowupIndex or 1
@@ -66,18 +68,9 @@ class FollowupGeneratorService:
             "expectedAnswerTimeSec": parsed.expectedAnswerTimeSec,
         }
 
-    def generate_followups(
-        self,
-        req: FollowupRequest,
-        run_config: Optional[RunnableConfig] = None,
-    ) -> FollowupResponse:
-        raw_prompt = load_prompt_template(PROMPT_PATH)
-
-        chain = ChatPromptTemplate.from_messages(
-            [("human", raw_prompt)]
-        ) | llm.with_structured_output(FollowupResponse, method="json_mode")
-
-        vars: Dict[str, Any] = {
+    @staticmethod
+    def _build_vars(req: FollowupRequest) -> Dict[str, Any]:
+        return {
             "ai_question_id": req.aiQuestionId,
             "type": req.type,
             "question_text": req.question,
@@ -87,12 +80,139 @@ class FollowupGeneratorService:
             "evaluation_summary": req.evaluationSummary or "",
         }
 
+    @traced()
+    def generate_followups(
+        self,
+        req: FollowupRequest,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> FollowupResponse:
+        vars = self._build_vars(req)
+
         start = time.perf_counter()
-        result = cast(FollowupResponse, chain.invoke(vars, config=run_config or {}))
+        result, self.cache_status = invoke_structured(
+            PROMPT_NAME, FollowupResponse, vars, run_config, use_cache
+        )
         duration_ms = round((time.perf_counter() - start) * 1000)
         logger.info(
             f"[{self.session_id}] generate_followups chain.invoke completed in {duration_ms}ms"
+            f" (cache={self.cache_status})"
         )
 
         norm = self._normalize_items(result, req)
         return FollowupResponse.model_validate(norm)
+
+    @traced()
+    async def agenerate_followups(
+        self,
+        req: FollowupRequest,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> FollowupResponse:
+        """
+        generate_followups의 비동기 버전 (꼬리질문 카운팅은 스레드로 위임).
+
+        같은 세션·같은 요청 본문의 동시 중복 호출은 하나의 실행으로 합쳐집니다.
+        """
+        key = request_key(self.session_id, "followup-generating", req)
+        result, self.coalesced = await singleflight.do(
+            key,
+            lambda: self._agenerate_followups(req, run_config, use_cache),
+            FollowupResponse,
+        )
+        return result
+
+    @classmethod
+    @traced()
+    async def agenerate_raw(
+        cls,
+        req: FollowupRequest,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+        session_id: str = "",
+    ) -> FollowupResponse:
+        """정규화(fu 번호 부여) 전의 LLM 출력만 생성 (speculative 실행·턴 처리용)"""
+        result, _ = await ainvoke_structured(
+            PROMPT_NAME,
+            FollowupResponse,
+            cls._build_vars(req),
+            run_config,
+            use_cache,
+            session_id=session_id,
+        )
+        return result
+
+    async def _agenerate_followups(
+        self,
+        req: FollowupRequest,
+        run_config: Optional[RunnableConfig],
+        use_cache: bool,
+    ) -> FollowupResponse:
+        start = time.perf_counter()
+
+        # 평가 단계에서 미리 시작해 둔 생성 결과가 있으면 그대로 사용
+        vars = self._build_vars(req)
+        spec_key = speculative_followups.make_key(self.session_id, vars)
+        speculative = await speculative_followups.claim(spec_key)
+        if speculative is not None:
+            self.speculative_hit = True
+            result = speculative
+            duration_ms = round((time.perf_counter() - start) * 1000)
+            logger.info(
+                f"[{self.session_id}] agenerate_followups speculative result claimed in {duration_ms}ms"
+            )
+        else:
+            result, self.cache_status = await ainvoke_structured(
+                PROMPT_NAME,
+                FollowupResponse,
+                vars,
+                run_config,
+                use_cache,
+                session_id=self.session_id,
+            )
+            duration_ms = round((time.perf_counter() - start) * 1000)
+            logger.info(
+                f"[{self.session_id}] agenerate_followups chain.ainvoke completed in {duration_ms}ms"
+                f" (cache={self.cache_status})"
+            )
+
+        norm = await asyncio.to_thread(self._normalize_items, result, req)
+        return FollowupResponse.model_validate(norm)
+
+    @traced()
+    async def astream_followups(
+        self,
+        req: FollowupRequest,
+        run_config: Optional[RunnableConfig] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        꼬리질문 스트리밍: 생성 중인 질문 본문은 ("partial", {...})으로,
+        JSON이 완성되면 정규화된 FollowupResponse를 ("followup", {...})로 yield.
+        """
+        chain = chain_registry.get_stream_chain(PROMPT_NAME)
+        vars = self._build_vars(req)
+
+        start = time.perf_counter()
+        last: Dict[str, Any] = {}
+        sent_question = ""
+        async with llm_scheduler.slot(
+            LLMPriority.FOLLOWUP,
+            self.session_id,
+            estimate_call_tokens(PROMPT_NAME, vars),
+        ):
+            async for partial in chain.astream(vars, config=run_config or {}):
+                if not isinstance(partial, dict):
+                    continue
+                last = partial
+                question = partial.get("question")
+                if isinstance(question, str) and question != sent_question:
+                    sent_question = question
+                    yield "partial", {"question": question}
+
+        result = FollowupResponse.model_validate(last)
+        norm = await asyncio.to_thread(self._normalize_items, result, req)
+        duration_ms = round((time.perf_counter() - start) * 1000)
+        logger.info(
+            f"[{self.session_id}] astream_followups completed in {duration_ms}ms"
+        )
+        yield "followup", FollowupResponse.model_validate(norm).model_dump(mode="json")
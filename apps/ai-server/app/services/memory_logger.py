@@ -1,15 +1,616 @@
-import json
 import os
-from typing import Any, Dict
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
-from fastapi import Header, HTTPException
+from fastapi import Header, HTTPException, Request
 from langchain_core.chat_history import (
     BaseChatMessageHistory,
     InMemoryChatMessageHistory,
 )
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    ToolMessage,
+    message_to_dict,
+    messages_from_dict,
+)
 from langchain_redis import RedisChatMessageHistory
+from pydantic import PrivateAttr
+from redis import Redis
+from redis.client import Pipeline
+from redisvl.index import SearchIndex
+from redisvl.query import FilterQuery
+from redisvl.query.filter import Num, Tag
+from ulid import ULID
 
 from app.models.event_types import EventType
+from app.utils import fast_json
+from app.utils.event_codec import decode_event, encode_event, event_type_of
+from app.utils.metrics import current_endpoint, memory_operation_duration
+from app.utils.redis_pool import get_shared_redis_client
+from app.utils.session_projection import (
+    SessionProjection,
+    projection_key,
+    recording,
+)
+from app.utils.session_store import SessionStore, create_session_store
+from app.utils.sqlite_memory import SQLiteMemoryDB, get_sqlite_memory_db
+from app.utils.tracing import traced, tracer
+
+INDEX_COMPLETE = "*"  # 인덱스 Set에 기존 메시지 키까지 모두 등록되었음을 표시
+MAX_TIED_MESSAGES = 10000  # 페이지 조회 시 timestamp가 같은 메시지 묶음 최대 크기
+MIGRATE_BATCH = 1000  # 인덱스 이전 시 한 번에 조회하는 메시지 수
+
+
+def _backend(memory: BaseChatMessageHistory) -> str:
+    if isinstance(memory, RedisChatMessageHistory):
+        return "redis"
+    if isinstance(memory, SQLiteSessionHistory):
+        return "sqlite"
+    return "memory"
+
+
+MessagePage = Tuple[List[BaseMessage], Optional[str]]  # (메시지, 다음 cursor)
+
+
+def _matches(
+    message: BaseMessage,
+    roles: Optional[Sequence[str]],
+    event_types: Optional[Sequence[str]],
+) -> bool:
+    if roles and message.type not in roles:
+        return False
+    return not event_types or event_type_of(message.content) in event_types
+
+
+def _page_list(
+    messages: Sequence[BaseMessage],
+    after: Optional[str],
+    limit: int,
+    roles: Optional[Sequence[str]] = None,
+    event_types: Optional[Sequence[str]] = None,
+) -> MessagePage:
+    """메시지 목록 페이지 (cursor: 다음에 읽을 위치)"""
+    start = int(after) if after else 0
+    if start < 0:
+        raise ValueError(f"Invalid cursor: {after}")
+    page: List[BaseMessage] = []
+    position = start
+    while position < len(messages) and len(page) < limit:
+        message = messages[position]
+        position += 1
+        if _matches(message, roles, event_types):
+            page.append(message)
+    next_cursor = str(position) if position < len(messages) else None
+    return page, next_cursor
+
+
+def _row_cursor(row: Dict[str, Any]) -> str:
+    """Redis 페이지 cursor (마지막으로 읽은 행의 timestamp:키)"""
+    return f"{float(row['timestamp'])!r}:{row['id']}"
+
+
+def page_messages(
+    memory: BaseChatMessageHistory,
+    after: Optional[str],
+    limit: int,
+    roles: Optional[Sequence[str]] = None,
+    event_types: Optional[Sequence[str]] = None,
+) -> MessagePage:
+    """
+    세션 메시지를 cursor 기준으로 limit개씩 조회 (오래된 순).
+    모든 백엔드가 필터에 맞는 메시지를 limit개 채우거나 끝에 닿을 때까지 읽으므로
+    limit보다 적은 페이지는 마지막 페이지뿐이며, next_cursor가 None이면 끝.
+    cursor 형식은 백엔드마다 다름 (불투명 문자열).
+    잘못된 cursor는 ValueError.
+    """
+    if isinstance(memory, (RedisSessionHistory, SQLiteSessionHistory)):
+        return memory.page_messages(after, limit, roles, event_types)
+    return _page_list(memory.messages, after, limit, roles, event_types)
+
+
+class RedisSessionHistory(RedisChatMessageHistory):
+    """
+    세션 Redis 기록.
+    - 메시지 키를 세션별 인덱스 Set(chat_index:{session_id})에 함께 기록 →
+      TTL 갱신·삭제가 키스페이스 SCAN 없이 세션 크기에 비례
+    - 인덱스가 없는 기존 세션은 첫 TTL 갱신/삭제 때 검색 인덱스로 키를 찾아 등록
+    - Redis 왕복(메시지 조회·추가·삭제)마다 span 기록
+    - 검색 인덱스 확인·생성(FT.INFO/FT.CREATE)은 클라이언트당 한 번만 수행하고,
+      이후 세션은 같은 SearchIndex를 재사용
+    """
+
+    _search_indexes: "weakref.WeakKeyDictionary[Redis, SearchIndex]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _search_indexes_lock = threading.Lock()
+
+    def __init__(self, session_id: str, redis_client: Redis, ttl: Optional[int]):
+        super().__init__(session_id=session_id, redis_client=redis_client, ttl=ttl)
+
+    def _create_search_index(self) -> None:
+        """부모 __init__이 호출하는 인덱스 생성 단계: 클라이언트별 첫 세션만 수행"""
+        with self._search_indexes_lock:
+            index = self._search_indexes.get(self.redis_client)
+        if index is not None:
+            self.index = index
+            return
+        super()._create_search_index()
+        with self._search_indexes_lock:
+            self.index = self._search_indexes.setdefault(self.redis_client, self.index)
+
+    @property
+    def index_key(self) -> str:
+        return f"{self.key_prefix.rstrip(':')}_index:{self.session_id}"
+
+    @property
+    def messages(self) -> List[BaseMessage]:  # type: ignore[override]
+        with tracer.span("redis.messages", session_id=self.session_id) as span:
+            messages = super().messages
+            if span is not None:
+                span.set_attribute("messages", len(messages))
+            return messages
+
+    def _query_page_rows(self, expression: Any, limit: int) -> List[Dict[str, Any]]:
+        query = FilterQuery(
+            filter_expression=expression,
+            return_fields=["type", "$.data", "timestamp"],
+            num_results=limit,
+        ).sort_by("timestamp", asc=True)
+        with tracer.span("redis.page_messages", session_id=self.session_id) as span:
+            rows = self.index.query(query)
+            if span is not None:
+                span.set_attribute("messages", len(rows))
+        return rows
+
+    def _page_rows(
+        self, base: Any, after: Optional[str], limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        (timestamp, 키) 순 행 페이지 조회 (cursor: 마지막으로 읽은 "timestamp:키").
+        timestamp가 같은 행은 키 순으로 이어 읽으므로 페이지 경계에서 누락되지 않습니다.
+        """
+
+        def position(row: Dict[str, Any]) -> Tuple[float, str]:
+            return float(row["timestamp"]), row["id"]
+
+        rows: List[Dict[str, Any]] = []
+        expression = base
+        if after:
+            after_ts, _, after_key = after.partition(":")
+            cursor = (float(after_ts), after_key)
+            if after_key:
+                # cursor와 timestamp가 같은 나머지 메시지
+                ties = self._query_page_rows(
+                    base & (Num("timestamp") == cursor[0]),
+                    MAX_TIED_MESSAGES,
+                )
+                rows = [r for r in ties if position(r) > cursor]
+            expression = base & (Num("timestamp") > cursor[0])
+
+        rest = self._query_page_rows(expression, limit)
+        truncated = len(rest) == limit
+        if truncated:
+            # 마지막 timestamp 묶음이 limit에서 잘렸을 수 있어 묶음 전체를 다시 조회
+            boundary = float(rest[-1]["timestamp"])
+            rest = [r for r in rest if float(r["timestamp"]) < boundary]
+            rest += self._query_page_rows(
+                base & (Num("timestamp") == boundary),
+                MAX_TIED_MESSAGES,
+            )
+        rows = sorted(rows, key=position) + sorted(rest, key=position)
+        has_more = truncated or len(rows) > limit
+        rows = rows[:limit]
+        return rows, _row_cursor(rows[-1]) if has_more else None
+
+    def page_messages(
+        self,
+        after: Optional[str],
+        limit: int,
+        roles: Optional[Sequence[str]] = None,
+        event_types: Optional[Sequence[str]] = None,
+    ) -> MessagePage:
+        """
+        (timestamp, 키) 순 페이지 조회 (역할은 서버 필터, 이벤트 타입은 읽은 뒤 필터).
+        이벤트 타입으로 걸러져 limit개가 안 되면 다음 범위를 이어 읽습니다.
+        """
+        base = Tag("session_id") == self.session_id
+        if roles:
+            base = base & (Tag("type") == list(roles))
+        page: List[BaseMessage] = []
+        cursor = after
+        while True:
+            rows, next_cursor = self._page_rows(base, cursor, limit)
+            messages = messages_from_dict(
+                [
+                    {"type": r["type"], "data": fast_json.loads(r["$.data"])}
+                    for r in rows
+                ]
+            )
+            for i, (row, message) in enumerate(zip(rows, messages)):
+                if not _matches(message, None, event_types):
+                    continue
+                page.append(message)
+                if len(page) == limit:
+                    more = i + 1 < len(rows) or next_cursor is not None
+                    return page, _row_cursor(row) if more else None
+            if next_cursor is None:
+                return page, None
+            cursor = next_cursor
+
+    def _message_entry(self, message: BaseMessage) -> Tuple[Dict[str, Any], str]:
+        """메시지 JSON 문서와 키 (langchain_redis 저장 형식과 동일)"""
+        message_id = str(ULID())
+        data: Dict[str, Any] = {
+            "content": message.content,
+            "additional_kwargs": message.additional_kwargs,
+            "type": message.type,
+        }
+        if isinstance(message, ToolMessage):
+            data["tool_call_id"] = message.tool_call_id
+            data["status"] = message.status
+        document = {
+            "type": message.type,
+            "message_id": message_id,
+            "data": data,
+            "session_id": self.session_id,
+            "timestamp": time.time(),
+        }
+        return document, f"{self.key_prefix}{self.session_id}:{message_id}"
+
+    def _queue_messages(self, pipe: Pipeline, messages: Sequence[BaseMessage]) -> None:
+        """메시지 JSON 문서·TTL·인덱스 등록 명령을 파이프라인에 추가"""
+        if any(message is None for message in messages):
+            raise ValueError("Message cannot be None")
+        entries = [self._message_entry(message) for message in messages]
+        # 조회는 timestamp 정렬 → 한 번에 기록하는 메시지도 순서가 유지되도록 단조 증가
+        for (prev, _), (data, _) in zip(entries, entries[1:]):
+            data["timestamp"] = max(data["timestamp"], prev["timestamp"] + 1e-6)
+        for data, key in entries:
+            pipe.json().set(key, "$", data)
+            if self.ttl:
+                pipe.expire(key, self.ttl)
+        pipe.sadd(self.index_key, *(key for _, key in entries))
+        if self.ttl:
+            pipe.expire(self.index_key, self.ttl)
+
+    def add_message(self, message: BaseMessage) -> None:
+        with (
+            tracer.span("redis.add_message", session_id=self.session_id),
+            self.redis_client.pipeline(transaction=True) as pipe,
+        ):
+            self._queue_messages(pipe, [message])
+            pipe.execute()
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        if not messages:
+            return
+        with (
+            tracer.span(
+                "redis.add_messages", session_id=self.session_id, messages=len(messages)
+            ),
+            self.redis_client.pipeline(transaction=True) as pipe,
+        ):
+            self._queue_messages(pipe, messages)
+            pipe.execute()
+
+    def _migrate_index(self) -> Set[str]:
+        """
+        기존 레이아웃 세션: 검색 인덱스로 메시지 키를 찾아 인덱스 Set에 등록
+        (page_messages와 같은 cursor로 MIGRATE_BATCH씩 끝까지 조회)
+        """
+        base = Tag("session_id") == self.session_id
+        keys: Set[str] = set()
+        cursor: Optional[str] = None
+        while True:
+            rows, cursor = self._page_rows(base, cursor, MIGRATE_BATCH)
+            keys.update(row["id"] for row in rows)
+            if cursor is None:
+                break
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.sadd(self.index_key, INDEX_COMPLETE, *keys)
+            if self.ttl:
+                pipe.expire(self.index_key, self.ttl)
+            pipe.execute()
+        return keys
+
+    def session_keys(self) -> Set[str]:
+        """세션의 메시지 키 목록 (인덱스 Set 조회, 없으면 1회 이전)"""
+        members = {
+            m.decode() if isinstance(m, bytes) else m
+            for m in self.redis_client.smembers(self.index_key)  # type: ignore[union-attr]
+        }
+        if INDEX_COMPLETE not in members:
+            members |= self._migrate_index()
+        members.discard(INDEX_COMPLETE)
+        return members
+
+    def refresh_ttl(self, ttl: int) -> int:
+        """세션 키 전체의 TTL을 한 번의 파이프라인으로 갱신, 갱신한 메시지 수 반환"""
+        with tracer.span("redis.refresh_ttl", session_id=self.session_id):
+            keys = self.session_keys()
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.expire(key, ttl)
+                pipe.expire(self.index_key, ttl)
+                pipe.expire(projection_key(self), ttl)
+                pipe.execute()
+            return len(keys)
+
+    def replace_messages(
+        self, messages: Sequence[BaseMessage], projection: SessionProjection
+    ) -> None:
+        """
+        세션 기록을 messages로 교체 (복원용).
+        기존 키 삭제·메시지 기록·TTL·인덱스·projection을 MULTI/EXEC 한 번으로 처리.
+        """
+        with tracer.span(
+            "redis.replace_messages", session_id=self.session_id, messages=len(messages)
+        ):
+            old_keys = self.session_keys()
+            with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(*old_keys, self.index_key, projection_key(self))
+                if messages:
+                    self._queue_messages(pipe, messages)
+                pipe.sadd(self.index_key, INDEX_COMPLETE)
+                pipe.hset(projection_key(self), mapping=projection.to_hash())
+                if self.ttl:
+                    pipe.expire(self.index_key, self.ttl)
+                    pipe.expire(projection_key(self), self.ttl)
+                pipe.execute()
+
+    def clear(self) -> None:
+        """메시지·인덱스 Set·projection을 DEL 한 번으로 삭제"""
+        with tracer.span("redis.clear", session_id=self.session_id):
+            keys = self.session_keys()
+            self.redis_client.delete(*keys, self.index_key, projection_key(self))
+
+
+def _message_size(message: BaseMessage) -> int:
+    return sys.getsizeof(message.content)
+
+
+class InMemorySessionHistory(InMemoryChatMessageHistory):
+    """
+    세션 projection을 함께 보관하는 InMemory 기록 (Redis 미사용 시).
+    기록할 때마다 저장소(SessionStore)에 크기를 알려 TTL 연장·상한 검사를 받음
+    """
+
+    session_id: str = ""
+    _projection: SessionProjection = PrivateAttr(default_factory=SessionProjection)
+    _store: Optional[SessionStore] = PrivateAttr(default=None)
+    _size: int = PrivateAttr(default=0)
+
+    @property
+    def projection(self) -> SessionProjection:
+        return self._projection
+
+    def attach(self, store: SessionStore) -> "InMemorySessionHistory":
+        self._store = store
+        return self
+
+    def _resized(self, size: int) -> None:
+        self._size = size
+        if self._store is not None:
+            self._store.resize(self.session_id, self, size)
+
+    def add_message(self, message: BaseMessage) -> None:
+        super().add_message(message)
+        self._resized(self._size + _message_size(message))
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        self.messages.extend(messages)
+        self._resized(self._size + sum(_message_size(m) for m in messages))
+
+    def refresh_ttl(self, ttl: int) -> int:
+        """저장소의 세션 만료 시각 연장, 갱신한 메시지 수 반환"""
+        if self._store is None or not self._store.refresh(self.session_id, self, ttl):
+            return 0
+        return len(self.messages)
+
+    def replace_messages(
+        self, messages: Sequence[BaseMessage], projection: SessionProjection
+    ) -> None:
+        self.messages = list(messages)
+        self._projection = projection
+        self._resized(sum(_message_size(m) for m in self.messages))
+
+    def clear(self) -> None:
+        super().clear()
+        self._projection = SessionProjection()
+        self._resized(0)
+
+
+class SQLiteSessionHistory(BaseChatMessageHistory):
+    """
+    로컬 SQLite(WAL) 세션 기록 (MEMORY_BACKEND=sqlite).
+    - 여러 워커 프로세스가 같은 DB 파일을 공유 → Redis 없이도 세션 유지
+    - 메시지마다 이벤트 타입을 함께 저장 (세션·이벤트 타입 인덱스)
+    - projection은 sessions 행에 보관하고 메시지 기록과 같은 트랜잭션에서 갱신
+    - TTL: 기록·refresh 시 세션 만료 시각 연장, 만료 세션은 조회되지 않고 주기적으로 삭제
+    """
+
+    def __init__(self, session_id: str, db: SQLiteMemoryDB, ttl: int):
+        self.session_id = session_id
+        self.db = db
+        self.ttl = ttl
+
+    @property
+    def messages(self) -> List[BaseMessage]:  # type: ignore[override]
+        with tracer.span("sqlite.messages", session_id=self.session_id):
+            rows = self.db.conn.execute(
+                "SELECT m.message FROM messages m"
+                " JOIN sessions s ON s.session_id = m.session_id"
+                " WHERE m.session_id = ? AND s.expires_at > ? ORDER BY m.id",
+                (self.session_id, time.time()),
+            ).fetchall()
+            return messages_from_dict([fast_json.loads(row[0]) for row in rows])
+
+    def page_messages(
+        self,
+        after: Optional[str],
+        limit: int,
+        roles: Optional[Sequence[str]] = None,
+        event_types: Optional[Sequence[str]] = None,
+    ) -> MessagePage:
+        """id 순 페이지 조회 (cursor: 마지막으로 읽은 id, 역할·이벤트 타입은 SQL 필터)"""
+        sql = (
+            "SELECT m.id, m.message FROM messages m"
+            " JOIN sessions s ON s.session_id = m.session_id"
+            " WHERE m.session_id = ? AND s.expires_at > ? AND m.id > ?"
+        )
+        params: List[Any] = [self.session_id, time.time(), int(after or 0)]
+        if event_types:
+            sql += f" AND m.event_type IN ({','.join('?' * len(event_types))})"
+            params.extend(event_types)
+        if roles:
+            sql += (
+                " AND json_extract(m.message, '$.type')"
+                f" IN ({','.join('?' * len(roles))})"
+            )
+            params.extend(roles)
+        sql += " ORDER BY m.id LIMIT ?"
+        params.append(limit)
+        with tracer.span("sqlite.page_messages", session_id=self.session_id):
+            rows = self.db.conn.execute(sql, params).fetchall()
+        messages = messages_from_dict([fast_json.loads(row[1]) for row in rows])
+        return messages, str(rows[-1][0]) if len(rows) == limit else None
+
+    def _open_session(self, conn: sqlite3.Connection, now: float) -> SessionProjection:
+        """쓰기 트랜잭션 안에서 세션 projection 조회 (없거나 만료됐으면 초기화)"""
+        row = conn.execute(
+            "SELECT expires_at, projection FROM sessions WHERE session_id = ?",
+            (self.session_id,),
+        ).fetchone()
+        if row is None or row[0] <= now:
+            conn.execute(
+                "DELETE FROM messages WHERE session_id = ?", (self.session_id,)
+            )
+            return SessionProjection()
+        projection = SessionProjection.from_hash(fast_json.loads(row[1] or "{}"))
+        if projection is None:  # 버전 변경 → 메시지에서 재생성
+            rows = conn.execute(
+                "SELECT message FROM messages WHERE session_id = ? ORDER BY id",
+                (self.session_id,),
+            ).fetchall()
+            projection = SessionProjection.from_messages(
+                messages_from_dict([fast_json.loads(r[0]) for r in rows])
+            )
+        return projection
+
+    def _save_session(
+        self, conn: sqlite3.Connection, projection: SessionProjection, now: float
+    ) -> None:
+        conn.execute(
+            "INSERT INTO sessions (session_id, expires_at, projection) VALUES (?, ?, ?)"
+            " ON CONFLICT (session_id) DO UPDATE"
+            " SET expires_at = excluded.expires_at, projection = excluded.projection",
+            (self.session_id, now + self.ttl, fast_json.dumps(projection.to_hash())),
+        )
+
+    def _insert(
+        self, conn: sqlite3.Connection, messages: Sequence[BaseMessage]
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        decoded = [decode_event(m.content) for m in messages]
+        conn.executemany(
+            "INSERT INTO messages (session_id, event_type, message) VALUES (?, ?, ?)",
+            [
+                (
+                    self.session_id,
+                    event_type_of(m.content),
+                    fast_json.dumps(message_to_dict(m)),
+                )
+                for m in messages
+            ],
+        )
+        return decoded
+
+    def add_message(self, message: BaseMessage) -> None:
+        self.add_messages([message])
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        if not messages:
+            return
+        with (
+            tracer.span(
+                "sqlite.add_messages",
+                session_id=self.session_id,
+                messages=len(messages),
+            ),
+            self.db.write() as conn,
+        ):
+            now = time.time()
+            projection = self._open_session(conn, now)
+            for message, event in zip(messages, self._insert(conn, messages)):
+                # SessionProjection.from_messages와 같은 규칙으로 반영
+                if event is not None and (
+                    message.type == "ai" or event[0] == EventType.QUESTION_ASKED
+                ):
+                    projection.apply(*event)
+            self._save_session(conn, projection, now)
+
+    def load_projection(self) -> SessionProjection:
+        """저장된 projection 조회 (없거나 버전이 다르면 메시지에서 재생성)"""
+        row = self.db.conn.execute(
+            "SELECT projection FROM sessions WHERE session_id = ? AND expires_at > ?",
+            (self.session_id, time.time()),
+        ).fetchone()
+        if row is None:
+            return SessionProjection()
+        projection = SessionProjection.from_hash(fast_json.loads(row[0] or "{}"))
+        if projection is None:
+            projection = SessionProjection.from_messages(self.messages)
+        return projection
+
+    def refresh_ttl(self, ttl: int) -> int:
+        """세션 만료 시각 연장, 갱신한 메시지 수 반환 (만료된 세션은 0)"""
+        with tracer.span("sqlite.refresh_ttl", session_id=self.session_id):
+            now = time.time()
+            with self.db.write() as conn:
+                updated = conn.execute(
+                    "UPDATE sessions SET expires_at = ?"
+                    " WHERE session_id = ? AND expires_at > ?",
+                    (now + ttl, self.session_id, now),
+                ).rowcount
+                if not updated:
+                    return 0
+                (count,) = conn.execute(
+                    "SELECT COUNT(*) FROM messages WHERE session_id = ?",
+                    (self.session_id,),
+                ).fetchone()
+            return count
+
+    def replace_messages(
+        self, messages: Sequence[BaseMessage], projection: SessionProjection
+    ) -> None:
+        """세션 기록을 messages로 교체 (복원용, 트랜잭션 1회)"""
+        with (
+            tracer.span(
+                "sqlite.replace_messages",
+                session_id=self.session_id,
+                messages=len(messages),
+            ),
+            self.db.write() as conn,
+        ):
+            conn.execute(
+                "DELETE FROM messages WHERE session_id = ?", (self.session_id,)
+            )
+            self._insert(conn, messages)
+            self._save_session(conn, projection, time.time())
+
+    def clear(self) -> None:
+        with tracer.span("sqlite.clear", session_id=self.session_id):
+            with self.db.write() as conn:
+                conn.execute(
+                    "DELETE FROM messages WHERE session_id = ?", (self.session_id,)
+                )
+                conn.execute(
+                    "DELETE FROM sessions WHERE session_id = ?", (self.session_id,)
+                )
 
 
 class MemoryLogger:
@@ -21,11 +622,61 @@ class MemoryLogger:
         self.memory = memory
         self.session_id = session_id
 
+    @staticmethod
+    def _encode(event_type: str, data: Dict[str, Any]) -> str:
+        # 잘라내지 않고 큰 이벤트는 압축 (event_codec 참고)
+        return encode_event(event_type, data)
+
+    @traced()
     def _log(self, event_type: str, data: Dict[str, Any]) -> None:
-        """단일 메시지로 이벤트 로깅 (JSON with type)"""
-        message = {"type": event_type, "data": data}
-        json_str = json.dumps(message, ensure_ascii=False)
-        self.memory.add_ai_message(json_str[:8000])  # prevent exceeding memory limit
+        """단일 메시지로 이벤트 로깅 (JSON with type), 세션 projection 갱신"""
+        with (
+            recording(self.memory, [(event_type, data)]),
+            memory_operation_duration.labels(
+                operation="add_message",
+                backend=_backend(self.memory),
+                endpoint=current_endpoint.get(),
+            ).time(),
+        ):
+            self.memory.add_ai_message(self._encode(event_type, data))
+
+    @traced()
+    def log_events(self, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """여러 이벤트를 한 번의 add_messages 호출로 기록 (Redis 왕복 1회)"""
+        if not events:
+            return
+        messages = [AIMessage(content=self._encode(t, d)) for t, d in events]
+        with (
+            recording(self.memory, events),
+            memory_operation_duration.labels(
+                operation="add_messages",
+                backend=_backend(self.memory),
+                endpoint=current_endpoint.get(),
+            ).time(),
+        ):
+            self.memory.add_messages(messages)
+
+    @traced()
+    def replace_events(self, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """세션 기록 전체를 events로 교체 (복원용, Redis는 트랜잭션 1회)"""
+        messages = [AIMessage(content=self._encode(t, d)) for t, d in events]
+        projection = SessionProjection()
+        for event_type, data in events:
+            projection.apply(event_type, data)
+
+        with memory_operation_duration.labels(
+            operation="replace",
+            backend=_backend(self.memory),
+            endpoint=current_endpoint.get(),
+        ).time():
+            if isinstance(
+                self.memory,
+                (RedisSessionHistory, InMemorySessionHistory, SQLiteSessionHistory),
+            ):
+                self.memory.replace_messages(messages, projection)
+            else:
+                self.memory.clear()
+                self.memory.add_messages(messages)
 
     # === 신규 메서드 (Phase 3에서 사용 예정) ===
 
@@ -44,25 +695,55 @@ class MemoryLogger:
 
 class MemoryManager:
     _ttl: int = 900  # 15분 (ping TTL 갱신과 함께 사용)
-    _memory_store: Dict[str, InMemoryChatMessageHistory] = {}
+    # Redis 미사용 시: TTL·LRU·크기 상한이 있는 프로세스 내 저장소
+    _memory_store: SessionStore[InMemorySessionHistory] = create_session_store(_ttl)
 
     @classmethod
-    def get_memory(cls, session_id: str = "") -> BaseChatMessageHistory:
+    def get_memory(
+        cls, session_id: str = "", redis_client: Optional[Redis] = None
+    ) -> BaseChatMessageHistory:
+        """
+        MEMORY_BACKEND: auto(기본, REDIS_URL 있으면 redis 아니면 memory) | redis |
+        sqlite | memory
+        redis_client: 앱 전역 커넥션 풀을 쓰는 공유 클라이언트 (app.state.redis).
+        없으면 REDIS_URL로 만든 프로세스 공용 풀 클라이언트를 사용합니다.
+        """
         redis_url = os.getenv("REDIS_URL", "")
-        if redis_url:
-            return RedisChatMessageHistory(
-                session_id=session_id,
-                redis_url=redis_url,
-                ttl=cls._ttl,
-            )
+        backend = os.getenv("MEMORY_BACKEND", "auto").lower()
+        if backend == "auto":
+            backend = "redis" if redis_url else "memory"
+
+        if backend == "redis" and redis_url:
+            # 클라이언트별 첫 생성 시에만 인덱스 확인 왕복이 발생
+            with (
+                tracer.span("redis.open", session_id=session_id),
+                memory_operation_duration.labels(
+                    operation="open", backend="redis", endpoint=current_endpoint.get()
+                ).time(),
+            ):
+                return RedisSessionHistory(
+                    session_id=session_id,
+                    redis_client=redis_client or get_shared_redis_client(redis_url),
+                    ttl=cls._ttl,
+                )
+        if backend == "sqlite":
+            # 여러 워커가 같은 DB 파일 공유, 만료 세션 정리는 주기적으로만 수행
+            db = get_sqlite_memory_db()
+            db.sweep()
+            return SQLiteSessionHistory(session_id=session_id, db=db, ttl=cls._ttl)
         # Redis URL이 없으면 InMemory fallback
-        if session_id not in cls._memory_store:
-            cls._memory_store[session_id] = InMemoryChatMessageHistory()
-        return cls._memory_store[session_id]
+        return cls._memory_store.get_or_create(
+            session_id,
+            lambda: InMemorySessionHistory(session_id=session_id).attach(
+                cls._memory_store
+            ),
+        )
 
     @classmethod
-    def MemoryDep(cls, x_session_id: str = Header(...)) -> BaseChatMessageHistory:
+    def MemoryDep(
+        cls, request: Request, x_session_id: str = Header(...)
+    ) -> BaseChatMessageHistory:
         if not x_session_id:
             raise HTTPException(status_code=400, detail="X-Session-Id header required")
 
-        return cls.get_memory(x_session_id)
+        return cls.get_memory(x_session_id, getattr(request.app.state, "redis", None))
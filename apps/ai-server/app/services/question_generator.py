@@ -1,10 +1,10 @@
 import logging
 import time
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
+from pydantic import ValidationError
 
 from app.models.question import (
     QuestionConstraints,
@@ -13,11 +13,24 @@ from app.models.question import (
     UserInfo,
 )
 from app.services.memory_logger import MemoryLogger
-from app.utils.llm_utils import PROMPT_BASE_DIR, llm, load_prompt_template
+from app.utils.llm_cache import CACHE_BYPASS
+from app.utils.llm_scheduler import LLMPriority, llm_scheduler
+from app.utils.llm_utils import (
+    ainvoke_structured,
+    chain_registry,
+    estimate_call_tokens,
+    invoke_structured,
+)
+from app.utils.token_budget import apply_field_budgets
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
-PROMPT_PATH = (PROMPT_BASE_DIR / "question_prompt.txt").resolve()
+PROMPT_NAME = "question_prompt.txt"
+
+chain_registry.register(
+    PROMPT_NAME, QuestionListOutput, LLMPriority.QUESTION_GENERATION
+)
 
 
 class QuestionGeneratorService:
@@ -29,6 +42,7 @@ class QuestionGeneratorService:
         self.memory = memory
         self.session_id = session_id
         self.logger = MemoryLogger(memory=memory, session_id=session_id)
+        self.cache_status = CACHE_BYPASS
 
     def _normalize_items(
         self,
@@ -59,24 +73,31 @@ class QuestionGeneratorService:
             out.append(q)
         return out[:5]
 
-    def generate_questions(
-        self,
-        user_info: UserInfo,
-        constraints: QuestionConstraints,
-        run_config: Optional[RunnableConfig] = None,
-    ) -> List[QuestionResponse]:
-        raw = load_prompt_template(PROMPT_PATH)
-
-        chain = ChatPromptTemplate.from_messages(
-            [("human", raw)]
-        ) | llm.with_structured_output(QuestionListOutput, method="json_mode")
+    def _build_vars(
+        self, user_info: UserInfo, constraints: QuestionConstraints
+    ) -> Dict[str, Any]:
+        # 자기소개서/포트폴리오는 압축 후 필드별 토큰 예산 안으로 맞춤
+        fields, report = apply_field_budgets(
+            {
+                "core_values": user_info.core_values,
+                "resume_text": user_info.resume_text,
+                "portfolio_text": user_info.portfolio_text,
+            }
+        )
+        before = sum(r["before"] for r in report.values())
+        after = sum(r["after"] for r in report.values())
+        logger.info(
+            f"[{self.session_id}] question prompt input tokens {before} -> {after} "
+            + ", ".join(
+                f"{name}={r['before']}->{r['after']}{' (truncated)' if r['truncated'] else ''}"
+                for name, r in report.items()
+            )
+        )
 
-        vars: Dict[str, Any] = {
+        return {
             "desired_role": user_info.desired_role,
             "company": user_info.company,
-            "core_values": user_info.core_values,
-            "resume_text": user_info.resume_text,
-            "portfolio_text": user_info.portfolio_text,
+            **fields,
             "language": constraints.language,
             "timebox_total_sec": constraints.timebox_total_sec,
             "avoid_ids_csv": ", ".join(constraints.avoid_question_ids)
@@ -85,14 +106,129 @@ class QuestionGeneratorService:
             "seed": constraints.seed if constraints.seed is not None else "null",
         }
 
+    def _finalize(
+        self, result: QuestionListOutput, constraints: QuestionConstraints
+    ) -> List[QuestionResponse]:
+        norm = self._normalize_items(result.main_questions)
+        final = self._dedupe_and_enforce(norm, constraints.avoid_question_ids)
+
+        return [QuestionResponse.model_validate(i) for i in final]
+
+    @traced()
+    def generate_questions(
+        self,
+        user_info: UserInfo,
+        constraints: QuestionConstraints,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> List[QuestionResponse]:
+        vars = self._build_vars(user_info, constraints)
+
         start = time.perf_counter()
-        result = cast(QuestionListOutput, chain.invoke(vars, config=run_config or {}))
+        result, self.cache_status = invoke_structured(
+            PROMPT_NAME, QuestionListOutput, vars, run_config, use_cache
+        )
         duration_ms = round((time.perf_counter() - start) * 1000)
         logger.info(
             f"[{self.session_id}] generate_questions chain.invoke completed in {duration_ms}ms"
+            f" (cache={self.cache_status})"
         )
 
-        norm = self._normalize_items(result.main_questions)
-        final = self._dedupe_and_enforce(norm, constraints.avoid_question_ids)
+        return self._finalize(result, constraints)
 
-        return [QuestionResponse.model_validate(i) for i in final]
+    @traced()
+    async def agenerate_questions(
+        self,
+        user_info: UserInfo,
+        constraints: QuestionConstraints,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> List[QuestionResponse]:
+        """generate_questions의 비동기 버전"""
+        vars = self._build_vars(user_info, constraints)
+
+        start = time.perf_counter()
+        result, self.cache_status = await ainvoke_structured(
+            PROMPT_NAME,
+            QuestionListOutput,
+            vars,
+            run_config,
+            use_cache,
+            session_id=self.session_id,
+        )
+        duration_ms = round((time.perf_counter() - start) * 1000)
+        logger.info(
+            f"[{self.session_id}] agenerate_questions chain.ainvoke completed in {duration_ms}ms"
+            f" (cache={self.cache_status})"
+        )
+
+        return self._finalize(result, constraints)
+
+    def _finalize_streamed_item(
+        self, raw: Any, index: int, constraints: QuestionConstraints
+    ) -> Optional[QuestionResponse]:
+        """스트리밍 중 완성된 질문 1개를 검증·정규화 (실패/회피 대상이면 None)"""
+        try:
+            item = QuestionResponse.model_validate(raw)
+        except ValidationError as e:
+            logger.warning(
+                f"[{self.session_id}] streamed question q{index} invalid: {e}"
+            )
+            return None
+
+        norm = self._normalize_items([item])[0]
+        norm["main_question_id"] = f"q{index}"
+        final = self._dedupe_and_enforce([norm], constraints.avoid_question_ids)
+        return QuestionResponse.model_validate(final[0]) if final else None
+
+    @traced()
+    async def astream_questions(
+        self,
+        user_info: UserInfo,
+        constraints: QuestionConstraints,
+        run_config: Optional[RunnableConfig] = None,
+    ) -> AsyncIterator[QuestionResponse]:
+        """
+        질문을 하나씩 완성되는 즉시 yield.
+
+        부분 JSON의 main_questions 배열에 다음 항목이 등장하면 직전 항목은
+        완성된 것으로 보고 내보내며, 마지막 항목은 스트림 종료 시 내보냅니다.
+        """
+        chain = chain_registry.get_stream_chain(PROMPT_NAME)
+        vars = self._build_vars(user_info, constraints)
+
+        start = time.perf_counter()
+        emitted = 0
+        items: List[Any] = []
+        async with llm_scheduler.slot(
+            LLMPriority.QUESTION_GENERATION,
+            self.session_id,
+            estimate_call_tokens(PROMPT_NAME, vars),
+        ):
+            async for partial in chain.astream(vars, config=run_config or {}):
+                if not isinstance(partial, dict):
+                    continue
+                items = partial.get("main_questions") or []
+                while emitted < min(len(items) - 1, 5):
+                    emitted += 1
+                    q = self._finalize_streamed_item(
+                        items[emitted - 1], emitted, constraints
+                    )
+                    if q is not None:
+                        if emitted == 1:
+                            first_ms = round((time.perf_counter() - start) * 1000)
+                            logger.info(
+                                f"[{self.session_id}] astream_questions first item in {first_ms}ms"
+                            )
+                        yield q
+
+        while emitted < min(len(items), 5):
+            emitted += 1
+            q = self._finalize_streamed_item(items[emitted - 1], emitted, constraints)
+            if q is not None:
+                yield q
+
+        duration_ms = round((time.perf_counter() - start) * 1000)
+        logger.info(
+            f"[{self.session_id}] astream_questions completed in {duration_ms}ms"
+        )
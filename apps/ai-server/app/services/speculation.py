@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.models.followup import FollowupResponse
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeFollowupStore:
+    """
+    평가 직후 미리 생성해 둔(speculative) 꼬리질문 보관소.
+
+    - 키: 세션 ID + 모델에 전달되는 프롬프트 변수 전체의 해시
+      (평가 요약·기준 등이 다른 요청은 미리 생성한 결과를 가져가지 않음)
+    - TTL 내에 /followup-generating 요청이 오면 진행 중/완료된 결과를 넘겨주고,
+      TTL이 지나도록 사용되지 않으면 작업을 취소하고 폐기합니다.
+    - 프로세스 단위 저장소이므로 다른 워커로 간 요청은 일반 경로로 생성됩니다.
+    """
+
+    def __init__(self, enabled: bool = True, ttl_sec: int = 120):
+        self.enabled = enabled
+        self.ttl_sec = ttl_sec
+        self._entries: Dict[str, Tuple[float, asyncio.Task]] = {}
+        self._counters: Dict[str, int] = {
+            "started": 0,
+            "claimed": 0,
+            "failed": 0,
+            "expired": 0,
+        }
+
+    @staticmethod
+    def make_key(session_id: str, vars: Dict[str, Any]) -> str:
+        raw = json.dumps(vars, ensure_ascii=False, sort_keys=True, default=str)
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return f"{session_id}:{digest}"
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        for key, (expires_at, task) in list(self._entries.items()):
+            if expires_at <= now:
+                self._entries.pop(key, None)
+                if not task.done():
+                    task.cancel()
+                self._counters["expired"] += 1
+
+    @staticmethod
+    def _consume_exception(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Speculative followup failed: {task.exception()}")
+
+    def start(
+        self, key: str, factory: Callable[[], Awaitable[FollowupResponse]]
+    ) -> None:
+        """백그라운드에서 꼬리질문 생성을 시작 (이미 진행 중인 키는 무시)"""
+        if not self.enabled:
+            return
+        self._sweep()
+        if key in self._entries:
+            return
+
+        task = asyncio.get_running_loop().create_task(factory())
+        task.add_done_callback(self._consume_exception)
+        self._entries[key] = (time.monotonic() + self.ttl_sec, task)
+        self._counters["started"] += 1
+
+    async def claim(self, key: str) -> Optional[FollowupResponse]:
+        """미리 생성된 결과를 가져감 (없거나 실패했으면 None)"""
+        self._sweep()
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+
+        try:
+            result = await entry[1]
+        except Exception:
+            self._counters["failed"] += 1
+            return None
+
+        self._counters["claimed"] += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "enabled": self.enabled,
+            "pending": len(self._entries),
+        }
+
+
+speculative_followups = SpeculativeFollowupStore(
+    enabled=os.getenv("SPECULATIVE_FOLLOWUP_ENABLED", "true").lower() == "true",
+    ttl_sec=int(os.getenv("SPECULATIVE_FOLLOWUP_TTL_SEC", "120")),
+)
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.runnables import RunnableConfig
+
+from app.models.evaluation import AnswerEvaluationResult, TailDecision
+from app.models.event_types import EventType
+from app.models.followup import FollowupResponse
+from app.models.turn import TurnCombinedOutput, TurnRequest, TurnResponse
+from app.services.answer_evaluator import EvaluationService
+from app.services.followup_generator import FollowupGeneratorService
+from app.services.memory_logger import MemoryLogger
+from app.utils.llm_cache import CACHE_BYPASS
+from app.utils.llm_scheduler import LLMPriority
+from app.utils.llm_utils import ainvoke_structured, chain_registry
+from app.utils.singleflight import request_key, singleflight
+from app.utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+PROMPT_NAME = "turn_prompt.txt"
+
+# 평가 + 라이브 꼬리질문을 함께 만드는 호출이므로 꼬리질문 우선순위로 처리
+chain_registry.register(PROMPT_NAME, TurnCombinedOutput, LLMPriority.FOLLOWUP)
+
+
+def _elapsed_ms(start: float) -> int:
+    return round((time.perf_counter() - start) * 1000)
+
+
+class TurnService:
+    """
+    답변 제출 1턴을 서버 내부에서 처리.
+
+    core-api가 순서대로 호출하던 log/answer-received → answer-evaluating →
+    followup-generating → log/question-asked를 대체합니다.
+    - 꼬리질문 수 카운팅(메모리 읽기)은 평가 LLM 호출과 동시에 수행
+    - 이벤트 기록은 마지막에 add_messages 1회로 일괄 기록
+    - combined=True면 평가와 꼬리질문을 turn_prompt.txt 1회 호출로 생성
+    - 생성한 꼬리질문의 QUESTION_ASKED는 이 턴에서 기록하므로, 다음 턴에서
+      그 질문을 questionAsked로 다시 보낼 필요가 없음 (보내도 중복 기록하지 않음)
+    """
+
+    def __init__(self, memory: BaseChatMessageHistory, session_id: str = ""):
+        self.memory = memory
+        self.session_id = session_id
+        self.logger = MemoryLogger(memory=memory, session_id=session_id)
+        self.evaluator = EvaluationService(memory=memory, session_id=session_id)
+        self.followup = FollowupGeneratorService(memory=memory, session_id=session_id)
+        self.cache_status = CACHE_BYPASS
+        self.coalesced = False
+
+    @traced()
+    async def aprocess_turn(
+        self,
+        req: TurnRequest,
+        run_config: Optional[RunnableConfig] = None,
+        use_cache: bool = False,
+    ) -> TurnResponse:
+        """같은 세션·같은 요청 본문의 동시 중복 호출은 하나의 실행으로 합쳐집니다."""
+        key = request_key(self.session_id, "turn-processing", req)
+        result, self.coalesced = await singleflight.do(
+            key,
+            lambda: self._aprocess_turn(req, run_config, use_cache),
+            TurnResponse,
+        )
+        return result
+
+    async def _aprocess_turn(
+        self,
+        req: TurnRequest,
+        run_config: Optional[RunnableConfig],
+        use_cache: bool,
+    ) -> TurnResponse:
+        start = time.perf_counter()
+        timings: Dict[str, int] = {}
+        ev_req = req.evaluation
+        parent_qid = req.rootQuestionId or ev_req.aiQuestionId.split("-")[0]
+
+        # 평가와 독립적인 메모리 읽기를 먼저 시작
+        count_task = asyncio.create_task(
+            asyncio.to_thread(self.followup._count_existing_followups, parent_qid)
+        )
+
+        try:
+            step = time.perf_counter()
+            raw_followup: Optional[FollowupResponse] = None
+            combined = req.combined and not self.evaluator._is_truly_empty_answer(
+                ev_req.answer
+            )
+            if combined:
+                eval_result, raw_followup = await self._acombined(
+                    req, run_config, use_cache
+                )
+            else:
+                eval_result = await self.evaluator.ascore_answer(
+                    ev_req, run_config, use_cache
+                )
+                self.cache_status = self.evaluator.cache_status
+            timings["evaluation_ms"] = _elapsed_ms(step)
+
+            existing = await count_task
+        except BaseException:
+            count_task.cancel()
+            raise
+
+        # 현재 질문이 같은 부모의 꼬리질문이면 카운트에 반영 (이미 기록된 경우 제외)
+        is_new = self._is_new_followup(req, parent_qid, existing)
+        log_question_asked = req.questionAsked is not None and is_new is not False
+        if is_new is False:
+            logger.info(
+                f"[{self.session_id}] questionAsked {req.questionAsked.aiQuestionId}"
+                " already recorded by a previous turn, skipping"
+            )
+        elif is_new:
+            existing += 1
+
+        followup: Optional[FollowupResponse] = None
+        if (
+            req.allowFollowup
+            and existing < req.maxFollowups
+            and eval_result.tailDecision == TailDecision.create
+        ):
+            step = time.perf_counter()
+            followup_req = EvaluationService.build_followup_request(
+                ev_req, eval_result, parent_qid
+            )
+            if raw_followup is None or not raw_followup.question:
+                raw_followup = await FollowupGeneratorService.agenerate_raw(
+                    followup_req, run_config, use_cache, session_id=self.session_id
+                )
+            norm = self.followup._normalize_items(raw_followup, followup_req, existing)
+            followup = FollowupResponse.model_validate(norm)
+            timings["followup_ms"] = _elapsed_ms(step)
+
+        step = time.perf_counter()
+        events = self._build_events(
+            req, eval_result, followup, parent_qid, log_question_asked
+        )
+        await asyncio.to_thread(self.logger.log_events, events)
+        timings["memory_write_ms"] = _elapsed_ms(step)
+        timings["total_ms"] = _elapsed_ms(start)
+
+        logger.info(
+            f"[{self.session_id}] aprocess_turn completed (combined={combined},"
+            f" followup={followup is not None}, events={len(events)}): {timings}"
+        )
+        return TurnResponse(
+            evaluation=eval_result,
+            followup=followup,
+            combined=combined,
+            timings=timings,
+        )
+
+    @traced()
+    async def _acombined(
+        self,
+        req: TurnRequest,
+        run_config: Optional[RunnableConfig],
+        use_cache: bool,
+    ) -> Tuple[AnswerEvaluationResult, Optional[FollowupResponse]]:
+        vars = EvaluationService._build_answer_vars(req.evaluation)
+        result, self.cache_status = await ainvoke_structured(
+            PROMPT_NAME,
+            TurnCombinedOutput,
+            vars,
+            run_config,
+            use_cache,
+            session_id=self.session_id,
+        )
+        return result.evaluation, result.followup
+
+    @staticmethod
+    def _is_new_followup(
+        req: TurnRequest, parent_qid: str, existing: int
+    ) -> Optional[bool]:
+        """
+        questionAsked가 parent_qid의 꼬리질문이면 아직 기록되지 않았는지 여부,
+        꼬리질문이 아니면 None.
+        꼬리질문 ID는 기록 순서대로 fu1, fu2, ... 이므로 번호가 기존 개수 이하면
+        이전 턴이 이미 기록한 질문입니다.
+        """
+        asked = req.questionAsked
+        if asked is None or asked.parentQuestionId != parent_qid:
+            return None
+        match = re.fullmatch(rf"{re.escape(parent_qid)}-fu(\d+)", asked.aiQuestionId)
+        return match is None or int(match.group(1)) > existing
+
+    @staticmethod
+    def _build_events(
+        req: TurnRequest,
+        eval_result: AnswerEvaluationResult,
+        followup: Optional[FollowupResponse],
+        parent_qid: str,
+        log_question_asked: bool = True,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """core-api가 개별 호출로 기록하던 순서 그대로 이벤트 구성"""
+        ev_req = req.evaluation
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        if req.questionAsked is not None and log_question_asked:
+            events.append((EventType.QUESTION_ASKED, req.questionAsked.model_dump()))
+        events.append(
+            (
+                EventType.ANSWER_RECEIVED,
+                {
+                    "aiQuestionId": ev_req.aiQuestionId,
+                    "answer": ev_req.answer,
+                    "answerDurationSec": ev_req.answerDurationSec,
+                },
+            )
+        )
+        events.append((EventType.ANSWER_EVALUATED, eval_result.model_dump()))
+        if followup is not None:
+            events.append(
+                (
+                    EventType.QUESTION_ASKED,
+                    {
+                        "aiQuestionId": followup.followupId,
+                        "question": followup.question,
+                        "type": ev_req.type,
+                        "criteria": followup.focusCriteria,
+                        "skills": ev_req.skills,
+                        "rationale": followup.rationale,
+                        "estimatedAnswerTimeSec": followup.expectedAnswerTimeSec,
+                        "parentQuestionId": parent_qid,
+                    },
+                )
+            )
+        return events
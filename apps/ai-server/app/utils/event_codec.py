@@ -0,0 +1,211 @@
+"""
+세션 메모리 이벤트 인코딩.
+
+- v1 (레거시): {"type": ..., "data": ...} JSON 문자열
+- v2 (읽기 전용): "e2:{타입 코드}:{JSON}", 중첩 객체까지 짧은 키
+      압축 시 "e2z:{타입 코드}:{base64(zlib(JSON))}"
+- v3: "e3:{타입 코드}:{JSON}", 최상위 키만 짧은 키 → 디코딩은 JSON 파싱 1회 + 최상위 키 치환
+      압축(선택, EVENT_COMPRESS_MIN_BYTES > 0) 시 "e3z:{타입 코드}:{base64(zlib(JSON))}"
+메시지 content는 문자열이어야 하므로(RedisJSON 문서) 압축 결과는 base64로 저장합니다.
+"""
+
+import base64
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.models.event_types import EventType
+from app.utils import fast_json
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+V2_PREFIX = "e2:"
+V2_COMPRESSED_PREFIX = "e2z:"
+V3_PREFIX = "e3:"
+V3_COMPRESSED_PREFIX = "e3z:"
+# 접두사 → (압축 여부, 중첩 키까지 복원 필요 여부)
+_VERSIONS = {
+    V3_PREFIX: (False, False),
+    V3_COMPRESSED_PREFIX: (True, False),
+    V2_PREFIX: (False, True),
+    V2_COMPRESSED_PREFIX: (True, True),
+}
+
+EVENT_ENCODING = os.getenv("EVENT_ENCODING", "compact").lower()  # compact | json
+# 0이면 압축하지 않음 (압축은 크기를 ~1/5로 줄이지만 인코딩·디코딩이 수 배 느림)
+EVENT_COMPRESS_MIN_BYTES = int(os.getenv("EVENT_COMPRESS_MIN_BYTES", "0"))
+EVENT_WARN_BYTES = 256 * 1024
+
+_TYPE_CODES = {
+    EventType.QUESTION_ASKED: "Q",
+    EventType.ANSWER_RECEIVED: "R",
+    EventType.ANSWER_EVALUATED: "E",
+}
+_TYPES_BY_CODE = {code: t for t, code in _TYPE_CODES.items()}
+
+# 짧은 키 테이블: v3는 최상위 키에만, v2는 중첩 객체까지 적용
+# (변경 시 새 버전 접두사를 추가하고 기존 테이블은 유지)
+_SHORT_KEYS = {
+    "aiQuestionId": "i",
+    "parentQuestionId": "p",
+    "question": "q",
+    "type": "t",
+    "criteria": "c",
+    "skills": "s",
+    "rationale": "ra",
+    "estimatedAnswerTimeSec": "et",
+    "answer": "a",
+    "answerDurationSec": "d",
+    "overallScore": "o",
+    "strengths": "st",
+    "improvements": "im",
+    "redFlags": "rf",
+    "criterionScores": "cs",
+    "name": "n",
+    "score": "sc",
+    "reason": "r",
+    "feedback": "f",
+    "tailRationale": "tr",
+    "tailDecision": "td",
+}
+_LONG_KEYS = {short: long for long, short in _SHORT_KEYS.items()}
+
+_decoder = json.JSONDecoder()
+
+# 이벤트 로그 외에 태그 접두사로 기록되는 메시지 (EmotionAnalysisService)
+_TAGGED_PREFIXES = {"[FACE_ANALYSIS]": "FACE_ANALYSIS"}
+_ESCAPE = "~"  # 짧은 키와 겹치는 임의 키 표시
+
+
+def _shorten(data: Dict[str, Any]) -> Dict[str, Any]:
+    """최상위 키만 짧은 키로 (짧은 키와 겹치는 임의 키는 _ESCAPE 표시)"""
+    out = {}
+    for key, item in data.items():
+        short = _SHORT_KEYS.get(key)
+        if short is None:
+            short = _ESCAPE + key if key in _LONG_KEYS or key[:1] == _ESCAPE else key
+        out[short] = item
+    return out
+
+
+def _expand_top(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key[1:] if key[:1] == _ESCAPE else _LONG_KEYS.get(key, key): item
+        for key, item in data.items()
+    }
+
+
+def _expand(value: Any) -> Any:
+    """v2: 중첩 객체까지 키 복원"""
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            if key.startswith(_ESCAPE):
+                key = key[len(_ESCAPE) :]
+            else:
+                key = _LONG_KEYS.get(key, key)
+            out[key] = _expand(item)
+        return out
+    if isinstance(value, list):
+        return [_expand(item) for item in value]
+    return value
+
+
+def _version(content: str) -> Optional[str]:
+    head = content[:4]
+    for prefix in _VERSIONS:
+        if head.startswith(prefix):
+            return prefix
+    return None
+
+
+def encode_legacy(event_type: str, data: Dict[str, Any]) -> str:
+    return json.dumps({"type": event_type, "data": data}, ensure_ascii=False)
+
+
+def encode_event(event_type: str, data: Dict[str, Any]) -> str:
+    """이벤트를 메시지 content 문자열로 인코딩 (잘라내지 않음)"""
+    if EVENT_ENCODING == "json":
+        encoded = encode_legacy(event_type, data)
+    else:
+        code = _TYPE_CODES.get(event_type, event_type)
+        raw = fast_json.dumpb(_shorten(data))
+        encoded = ""
+        if EVENT_COMPRESS_MIN_BYTES and len(raw) >= EVENT_COMPRESS_MIN_BYTES:
+            packed = base64.b64encode(zlib.compress(raw, 6)).decode("ascii")
+            if len(packed) < len(raw):
+                encoded = f"{V3_COMPRESSED_PREFIX}{code}:{packed}"
+        if not encoded:
+            encoded = f"{V3_PREFIX}{code}:{raw.decode()}"
+
+    if len(encoded) >= EVENT_WARN_BYTES:
+        logger.warning(f"Large session event ({event_type}): {len(encoded)} chars")
+    return encoded
+
+
+def decode_event(content: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """메시지 content → (이벤트 타입, 데이터). 이벤트가 아니거나 손상되면 None"""
+    if not isinstance(content, str):
+        return None
+    try:
+        version = _version(content)
+        if version is not None:
+            compressed, nested = _VERSIONS[version]
+            sep = content.index(":", len(version))
+            code = content[len(version) : sep]
+            if compressed:
+                data = fast_json.loads(
+                    zlib.decompress(base64.b64decode(content[sep + 1 :]))
+                )
+            else:
+                # 본문을 잘라 복사하지 않고 그 위치부터 파싱 (비ASCII str은 orjson이
+                # UTF-8로 다시 인코딩해야 해서 표준 json 디코더가 더 빠름)
+                data, end = _decoder.raw_decode(content, sep + 1)
+                if end != len(content):
+                    return None
+            if not isinstance(data, dict):
+                return None
+            data = _expand(data) if nested else _expand_top(data)
+            event_type = _TYPES_BY_CODE.get(code, code)
+        else:
+            content = content.strip()
+            if not content.startswith("{"):
+                return None
+            event = fast_json.loads(content)
+            if not isinstance(event, dict):
+                return None
+            event_type, data = event.get("type"), event.get("data")
+    except (ValueError, zlib.error):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return event_type, data
+
+
+def event_type_of(content: Any) -> Optional[str]:
+    """메시지의 이벤트 타입만 조회 (v2/v3는 접두사만 확인, 필터링용)"""
+    if not isinstance(content, str):
+        return None
+    for prefix, event_type in _TAGGED_PREFIXES.items():
+        if content.startswith(prefix):
+            return event_type
+    if _version(content) is not None:
+        code = content.split(":", 2)[1]
+        return _TYPES_BY_CODE.get(code, code)
+    decoded = decode_event(content)
+    return decoded[0] if decoded is not None else None
+
+
+def to_legacy_json(content: Any) -> Any:
+    """디버그 출력용: 이벤트 메시지는 레거시 JSON 형태로, 그 외는 그대로"""
+    if isinstance(content, str) and not content.startswith("{"):
+        decoded = decode_event(content)
+        if decoded is not None:
+            return encode_legacy(*decoded)
+    return content
@@ -1,75 +1,42 @@
-import json
-from statistics import mean
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from langchain_core.chat_history import BaseChatMessageHistory
 
-from app.models.event_types import EventType
+from app.utils.session_projection import load_projection
 
 
-def extract_evaluation(memory: BaseChatMessageHistory) -> tuple[float, str]:
-    """타입 필드 기반 평가 데이터 추출"""
-    msgs = memory.messages
-    qa_pairs: List[Dict] = []
-    scores: List[float] = []
-    conversation_blocks: List[str] = []
-
-    # 마지막 답변 텍스트 추적 (ANSWER_RECEIVED에서)
-    last_answer_text: str | None = None
-
-    for m in msgs:
-        if not isinstance(m.content, str):
-            continue
-
-        if m.type != "ai":
-            continue
-
-        content = m.content.strip()
-        if not content.startswith("{"):
-            continue
-
-        try:
-            event = json.loads(content)
-            event_type = event.get("type")
-            data = event.get("data", {})
-
-            # ANSWER_RECEIVED: 답변 텍스트 저장
-            if event_type == EventType.ANSWER_RECEIVED:
-                last_answer_text = data.get("answer")
-
-            # ANSWER_EVALUATED: 평가 데이터 추출
-            elif event_type == EventType.ANSWER_EVALUATED:
-                qid = data.get("aiQuestionId")
-                score = data.get("overallScore")
-                feedback = data.get("feedback")
+def _collect_blocks(
+    memory: BaseChatMessageHistory,
+) -> tuple[float, List[Tuple[str, str]]]:
+    """세션 projection에서 (평균 점수, [(질문 ID, QA 블록)]) 조회"""
+    projection = load_projection(memory)
+    blocks = [
+        (qid, f"QID: {qid}\nAnswer: {answer}\nFeedback: {feedback}")
+        for qid, answer, feedback in projection.evaluations
+    ]
+    return projection.average_score(), blocks
 
-                if qid is None:
-                    continue
 
-                qa = {
-                    "aiQuestionId": qid,
-                    "overallScore": score,
-                    "answerText": last_answer_text or "",
-                    "feedback": feedback or "",
-                }
-                qa_pairs.append(qa)
-
-                if score is not None:
-                    scores.append(score)
-
-                block = (
-                    f"QID: {qid}\n"
-                    f"Answer: {last_answer_text or ''}\n"
-                    f"Feedback: {feedback or ''}"
-                )
-                conversation_blocks.append(block)
-
-                last_answer_text = None  # Reset after processing
-
-        except json.JSONDecodeError:
-            continue
-
-    avg_score = round(mean(scores), 2) if scores else 0.0
-    conversation_text = "\n\n".join(conversation_blocks)
-
-    return float(avg_score), conversation_text
+def extract_evaluation(memory: BaseChatMessageHistory) -> tuple[float, str]:
+    """타입 필드 기반 평가 데이터 추출"""
+    avg_score, blocks = _collect_blocks(memory)
+    conversation_text = "\n\n".join(block for _, block in blocks)
+
+    return avg_score, conversation_text
+
+
+def extract_evaluation_groups(
+    memory: BaseChatMessageHistory,
+) -> tuple[float, str, Dict[str, str]]:
+    """
+    extract_evaluation + 메인 질문별 대화 묶음 ({"q1": q1·q1-fu1·q1-fu2 블록, ...}).
+    묶음 순서는 메인 질문이 처음 평가된 순서입니다.
+    """
+    avg_score, blocks = _collect_blocks(memory)
+    groups: Dict[str, List[str]] = {}
+    for qid, block in blocks:
+        groups.setdefault(str(qid).split("-")[0], []).append(block)
+
+    conversation_text = "\n\n".join(block for _, block in blocks)
+    grouped = {qid: "\n\n".join(items) for qid, items in groups.items()}
+    return avg_score, conversation_text, grouped
@@ -0,0 +1,371 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+import typing
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Type
+
+from annotated_types import Ge, Le, MaxLen, MinLen
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, PrivateAttr
+
+from app.models.evaluation import AnswerEvaluationResult, SessionFeedbackOutput
+from app.models.followup import FollowupResponse
+from app.models.question import QuestionListOutput
+
+_SENTENCES = [
+    "지원자는 문제 상황을 구체적으로 정의하고 해결 과정을 단계별로 설명했습니다.",
+    "사용한 기술의 선택 이유와 대안 비교가 다소 부족했습니다.",
+    "성과를 수치로 제시하여 설득력을 높인 점이 돋보였습니다.",
+    "협업 과정에서 본인의 역할과 기여도를 명확히 구분할 필요가 있습니다.",
+    "장애 대응 경험을 통해 원인 분석과 재발 방지 대책을 설명했습니다.",
+    "핵심 개념에 대한 이해는 충분하나 실제 적용 사례가 더 필요합니다.",
+]
+_NOUNS = ["명확성", "깊이", "근거", "문제 해결", "협업", "성능 이해도", "책임감"]
+_SKILLS = ["React", "TypeScript", "Node.js", "Redis", "PostgreSQL", "Docker"]
+_QUESTIONS = [
+    "해당 프로젝트에서 성능 병목을 어떤 지표로 확인하고 어떻게 개선하셨는지 설명해 주시겠습니까?",
+    "팀원과 기술적 의견이 충돌했을 때 어떤 근거로 결정을 내리셨는지 말씀해 주시겠습니까?",
+    "장애가 발생했을 때 원인을 추적한 과정과 재발 방지 방법을 구체적으로 설명해 주세요.",
+    "캐싱 전략을 설계할 때 무효화 시점을 어떤 기준으로 정하셨는지 설명해 주세요.",
+    "새로운 기술을 도입할 때 어떤 방식으로 검증하고 팀에 공유하셨는지 말씀해 주시겠습니까?",
+]
+
+# 출력 스키마 지정 없이 호출되는 스트리밍 체인용: 프롬프트의 출력 예시 키로 스키마 추정
+_STREAM_SCHEMA_HINTS: List[Tuple[str, Type[BaseModel]]] = [
+    ("main_questions", QuestionListOutput),
+    ("followupId", FollowupResponse),
+    ("tailDecision", AnswerEvaluationResult),
+    ("sessionFeedback", SessionFeedbackOutput),
+]
+
+# 필드명별 텍스트 길이 (프롬프트의 최소 글자 수 요구사항 반영)
+_TEXT_LENGTHS = {"feedback": 320, "sessionFeedback": 1050}
+
+
+class FakeLLMError(Exception):
+    """주입된 오류 (status_code 429면 스케줄러가 rate limit으로 처리)"""
+
+    def __init__(self, status_code: int, retry_after_sec: float = 1.0):
+        super().__init__(f"Injected fake LLM error (status {status_code})")
+        self.status_code = status_code
+        self.response = type(
+            "FakeResponse", (), {"headers": {"retry-after": str(retry_after_sec)}}
+        )()
+
+
+def _parse_latency(spec: str) -> Tuple[str, List[float]]:
+    """'fixed:500', 'uniform:200,1200', 'normal:800,200', 'lognormal:800,0.5' (ms)"""
+    kind, _, params = spec.partition(":")
+    values = [float(p) for p in params.split(",") if p.strip()]
+    if kind not in ("fixed", "uniform", "normal", "lognormal") or not values:
+        raise ValueError(f"Invalid FAKE_LLM_LATENCY spec: {spec}")
+    return kind, values
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Groq 호출 없이 부하 테스트를 하기 위한 로컬 대체 모델 (LLM_PROVIDER=fake).
+
+    - 구조화 출력 스키마(AnswerEvaluationResult, FollowupResponse,
+      QuestionListOutput, SessionFeedbackOutput 등)에 맞는 JSON을 생성
+    - 같은 seed·같은 프롬프트면 항상 같은 응답 (결정적)
+    - 첫 토큰 지연(latency 분포) + 초당 토큰 수 기반 생성 시간 시뮬레이션
+    - 오류(5xx), rate limit(429), 잘린 JSON을 확률적으로 주입
+    """
+
+    model_name: str = "fake-llm"
+    temperature: float = 0.0
+    max_tokens: Optional[int] = 2048
+    seed: int = 0
+    latency: str = "lognormal:600,0.4"
+    tokens_per_sec: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    malformed_rate: float = 0.0
+    create_rate: float = 0.7
+
+    _rng: random.Random = PrivateAttr()
+    _latency: Tuple[str, List[float]] = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        self._latency = _parse_latency(self.latency)
+
+    @classmethod
+    def from_env(cls) -> "FakeChatModel":
+        return cls(
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+            latency=os.getenv("FAKE_LLM_LATENCY", "lognormal:600,0.4"),
+            tokens_per_sec=float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", "0")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0")),
+            malformed_rate=float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0")),
+            create_rate=float(os.getenv("FAKE_LLM_CREATE_RATE", "0.7")),
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def with_structured_output(  # type: ignore[override]
+        self,
+        schema: Type[BaseModel],
+        *,
+        include_raw: bool = False,
+        method: str = "json_mode",
+        **kwargs: Any,
+    ) -> Runnable:
+        """ChatGroq json_mode와 같은 형태: JSON 텍스트 생성 → Pydantic 파싱"""
+        return self.bind(fake_schema=schema) | PydanticOutputParser(
+            pydantic_object=schema
+        )
+
+    # === 응답 생성 ===
+
+    def _draw_latency_sec(self) -> float:
+        kind, p = self._latency
+        if kind == "fixed":
+            ms = p[0]
+        elif kind == "uniform":
+            ms = self._rng.uniform(p[0], p[1] if len(p) > 1 else p[0])
+        elif kind == "normal":
+            ms = self._rng.gauss(p[0], p[1] if len(p) > 1 else 0.0)
+        else:
+            # lognormal: 중앙값 p[0]ms, 로그 표준편차 p[1] (긴 꼬리 지연)
+            ms = p[0] * self._rng.lognormvariate(0.0, p[1] if len(p) > 1 else 0.5)
+        return max(0.0, ms) / 1000
+
+    def _inject_error(self) -> None:
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            raise FakeLLMError(429)
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise FakeLLMError(503)
+
+    def _render(
+        self, messages: List[BaseMessage], schema: Optional[Type[BaseModel]]
+    ) -> Tuple[str, int]:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if schema is None:
+            schema = next(
+                (s for hint, s in _STREAM_SCHEMA_HINTS if hint in prompt),
+                SessionFeedbackOutput,
+            )
+
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).digest()
+        builder = _PayloadBuilder(
+            random.Random(int.from_bytes(digest[:8], "big")), prompt, self.create_rate
+        )
+        content = json.dumps(builder.build(schema), ensure_ascii=False)
+        if self._rng.random() < self.malformed_rate:
+            content = content[: max(1, len(content) * 2 // 3)]  # 잘린 JSON
+        return content, _approx_tokens(prompt)
+
+    def _result(self, content: str, prompt_tokens: int) -> ChatResult:
+        usage = _usage(prompt_tokens, _approx_tokens(content))
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": usage["prompt_tokens"],
+                "output_tokens": usage["completion_tokens"],
+                "total_tokens": usage["total_tokens"],
+            },
+        )
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": usage, "model_name": self.model_name},
+        )
+
+    def _generation_sec(self, content: str) -> float:
+        if self.tokens_per_sec <= 0:
+            return 0.0
+        return _approx_tokens(content) / self.tokens_per_sec
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._draw_latency_sec())
+        self._inject_error()
+        content, prompt_tokens = self._render(messages, kwargs.get("fake_schema"))
+        time.sleep(self._generation_sec(content))
+        return self._result(content, prompt_tokens)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._draw_latency_sec())
+        self._inject_error()
+        content, prompt_tokens = self._render(messages, kwargs.get("fake_schema"))
+        await asyncio.sleep(self._generation_sec(content))
+        return self._result(content, prompt_tokens)
+
+    def _chunks(self, content: str, prompt_tokens: int) -> Iterator[AIMessageChunk]:
+        # 약 4자(≈3토큰) 단위로 분할, 마지막 청크에 사용량 포함
+        for i in range(0, len(content), 4):
+            yield AIMessageChunk(content=content[i : i + 4])
+        usage = _usage(prompt_tokens, _approx_tokens(content))
+        yield AIMessageChunk(
+            content="",
+            usage_metadata={
+                "input_tokens": usage["prompt_tokens"],
+                "output_tokens": usage["completion_tokens"],
+                "total_tokens": usage["total_tokens"],
+            },
+        )
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self._draw_latency_sec())
+        self._inject_error()
+        content, prompt_tokens = self._render(messages, kwargs.get("fake_schema"))
+        per_chunk = self._generation_sec(content[:4])
+        for chunk in self._chunks(content, prompt_tokens):
+            time.sleep(per_chunk)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._draw_latency_sec())
+        self._inject_error()
+        content, prompt_tokens = self._render(messages, kwargs.get("fake_schema"))
+        per_chunk = self._generation_sec(content[:4])
+        for chunk in self._chunks(content, prompt_tokens):
+            await asyncio.sleep(per_chunk)
+            yield ChatGenerationChunk(message=chunk)
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) * 2 // 3)
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+class _PayloadBuilder:
+    """Pydantic 모델 필드 정의를 따라 스키마에 맞는 샘플 값을 생성"""
+
+    def __init__(self, rng: random.Random, prompt: str, create_rate: float):
+        self.rng = rng
+        self.prompt = prompt
+        self.create_rate = create_rate
+        qid = re.search(r"질문 ID:\s*(q\d+(?:-fu\d+)?)", prompt)
+        qtype = re.search(r"타입:\s*(\w+)", prompt)
+        self.question_id = qid.group(1) if qid else "q1"
+        self.parent_id = self.question_id.split("-")[0]
+        self.question_type = qtype.group(1) if qtype else "technical"
+
+    def build(self, model: Type[BaseModel]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, field in model.model_fields.items():
+            bounds = {type(m): m for m in field.metadata}
+            out[name] = self._value(name, field.annotation, bounds)
+        return out
+
+    def _text(self, length: int) -> str:
+        parts: List[str] = []
+        while sum(len(p) + 1 for p in parts) < length:
+            parts.append(self.rng.choice(_SENTENCES))
+        return " ".join(parts)
+
+    def _value(self, name: str, annotation: Any, bounds: Dict[type, Any]) -> Any:
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+
+        if origin is typing.Union or (origin is not None and type(None) in args):
+            inner = [a for a in args if a is not type(None)]
+            return self._value(name, inner[0], bounds) if inner else None
+        if origin in (list, List):
+            return self._list(name, args[0] if args else str, bounds)
+        if origin in (dict, Dict):
+            return {}
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return self.build(annotation)
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            return self._enum(name, annotation)
+        if annotation is int:
+            lo = bounds[Ge].ge if Ge in bounds else 1
+            hi = bounds[Le].le if Le in bounds else max(lo, 5)
+            if name.endswith("Sec"):
+                return self.rng.choice([60, 90, 120])
+            return self.rng.randint(int(lo), int(hi))
+        if annotation is float:
+            return round(self.rng.uniform(1.0, 5.0), 1)
+        if annotation is bool:
+            return self.rng.random() < 0.5
+        return self._string(name)
+
+    def _list(self, name: str, item: Any, bounds: Dict[type, Any]) -> List[Any]:
+        lo = bounds[MinLen].min_length if MinLen in bounds else 1
+        hi = bounds[MaxLen].max_length if MaxLen in bounds else 5
+        if name == "main_questions":
+            lo = hi = 5
+        lo = max(1, lo)
+        count = self.rng.randint(lo, max(lo, min(hi, 3)))
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            items = [self.build(item) for _ in range(count)]
+            if name == "main_questions":
+                for i, q in enumerate(items, start=1):
+                    q["main_question_id"] = f"q{i}"
+                    q["question"] = _QUESTIONS[(i - 1) % len(_QUESTIONS)]
+            return items
+        pool = _SKILLS if name == "skills" else _NOUNS
+        return self.rng.sample(pool, min(count, len(pool)))
+
+    def _enum(self, name: str, enum: Type[Enum]) -> Any:
+        values = [e.value for e in enum]
+        if name == "tailDecision" and {"create", "skip"} <= set(values):
+            return "create" if self.rng.random() < self.create_rate else "skip"
+        return self.rng.choice(values)
+
+    def _string(self, name: str) -> str:
+        if name == "aiQuestionId":
+            return self.question_id
+        if name == "parentQuestionId":
+            return self.parent_id
+        if name == "followupId":
+            return f"{self.parent_id}-fu1"
+        if name == "main_question_id":
+            return "q1"
+        if name == "type":
+            return self.question_type
+        if name == "question":
+            return self.rng.choice(_QUESTIONS)
+        if name == "name":
+            return self.rng.choice(_NOUNS)
+        return self._text(_TEXT_LENGTHS.get(name, 60))
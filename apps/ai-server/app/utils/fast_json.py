@@ -0,0 +1,64 @@
+"""
+앱 공용 JSON 직렬화 (orjson 사용, 설치되지 않은 환경에서는 표준 json).
+
+출력은 json.dumps(ensure_ascii=False, separators=(",", ":"))와 같은 바이트이며
+(FastAPI 기본 JSONResponse와 동일), 다음만 다릅니다.
+- 1e-4 미만 float: 지수 표기 대신 소수 표기 (예: 1e-05 → 0.00001, 같은 값)
+- NaN/Infinity: 오류 대신 null
+orjson이 처리하지 못하는 값(64비트 초과 정수 등)은 표준 json으로 직렬화합니다.
+"""
+
+import json
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None  # type: ignore[assignment]
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumpb(obj: Any) -> bytes:
+    """compact JSON (UTF-8 bytes)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return _stdlib_dumps(obj).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """compact JSON (str)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            pass
+    return _stdlib_dumps(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """JSON 파싱 (오류는 모두 ValueError 계열)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    앱 기본 응답 클래스: JSONResponse보다 빠르게 직렬화.
+    바이트가 다른 경우는 모듈 설명 참고 (1e-4 미만 float, NaN/Infinity → null)
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumpb(content)
@@ -0,0 +1,453 @@
+import json
+import logging
+import re
+import threading
+import typing
+from enum import Enum
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+_CODE_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+# 잘린 JSON을 닫을 때 뒤에서부터 잘라볼 최대 횟수
+_MAX_TRIM_STEPS = 32
+
+
+# === 텍스트 → JSON ===
+
+
+def strip_code_fences(text: str) -> str:
+    """```json ... ``` 블록이 있으면 안쪽만, 없으면 첫 { 또는 [ 부터 반환"""
+    match = _CODE_FENCE.search(text)
+    if match:
+        text = match.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    return text[min(starts) :].strip() if starts else text.strip()
+
+
+def _normalize_outside_strings(text: str) -> str:
+    """문자열 밖의 후행 쉼표 제거, Python 리터럴(True/False/None) → JSON"""
+    out: List[str] = []
+    in_str = False
+    escaped = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_str:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+            i += 1
+            continue
+
+        if ch == '"':
+            in_str = True
+        elif ch == ",":
+            rest = text[i + 1 :].lstrip()
+            if rest[:1] in ("}", "]"):
+                i += 1
+                continue
+        else:
+            word = next(
+                (w for w in _PY_LITERALS if text.startswith(w, i)),
+                None,
+            )
+            if word and not (i and (text[i - 1].isalnum() or text[i - 1] == "_")):
+                out.append(_PY_LITERALS[word])
+                i += len(word)
+                continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _scan(text: str) -> tuple[List[str], bool, List[int]]:
+    """(열린 괄호 스택, 문자열 안에서 끝났는지, 잘라볼 수 있는 구분 위치 목록)"""
+    stack: List[str] = []
+    cut_points: List[int] = []
+    in_str = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            cut_points.append(i + 1)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            cut_points.append(i + 1)
+        elif ch == ",":
+            cut_points.append(i)
+    return stack, in_str, cut_points
+
+
+def _close(text: str) -> str:
+    stack, in_str, _ = _scan(text)
+    if in_str:
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1]
+    elif text.endswith(":"):
+        text += " null"
+    return text + "".join(reversed(stack))
+
+
+def close_truncated_json(text: str) -> Optional[Any]:
+    """
+    잘린 JSON을 닫아서 파싱. 그대로 닫아서 안 되면(키만 남은 경우 등)
+    마지막 구분 위치까지 잘라낸 뒤 다시 닫아봄.
+    """
+    candidate = text
+    for _ in range(_MAX_TRIM_STEPS):
+        try:
+            return json.loads(_close(candidate), strict=False)
+        except json.JSONDecodeError:
+            pass
+        _, _, cut_points = _scan(candidate)
+        cut_points = [p for p in cut_points if p < len(candidate.rstrip())]
+        if not cut_points:
+            return None
+        candidate = candidate[: cut_points[-1]]
+    return None
+
+
+def parse_json_lenient(text: str) -> tuple[Any, bool]:
+    """
+    (파싱 결과, 복구 여부) 반환. 복구로도 파싱할 수 없으면 ValueError.
+    """
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+
+    body = _normalize_outside_strings(strip_code_fences(text))
+    try:
+        return json.loads(body, strict=False), True
+    except json.JSONDecodeError:
+        pass
+
+    closed = close_truncated_json(body)
+    if closed is None:
+        raise ValueError("JSON repair failed")
+    return closed, True
+
+
+# === JSON → 스키마 타입 보정 ===
+
+
+def _camel_key(key: str) -> str:
+    head, *rest = key.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def _match_keys(data: Dict[str, Any], schema: Type[BaseModel]) -> Dict[str, Any]:
+    """대소문자·snake_case 차이로 어긋난 키를 스키마 필드명으로 맞춤"""
+    lookup = {}
+    for name in schema.model_fields:
+        lookup[name.lower()] = name
+        lookup[_camel_key(name).lower()] = name
+    out: Dict[str, Any] = {}
+    for key, value in data.items():
+        target = key if key in schema.model_fields else None
+        if target is None:
+            target = lookup.get(key.lower()) or lookup.get(_camel_key(key).lower())
+        if target and target not in out:
+            out[target] = value
+        elif key not in out:
+            out[key] = value
+    return out
+
+
+def _unwrap(annotation: Any) -> Any:
+    """Optional[X] → X"""
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+        return args[0]
+    return annotation
+
+
+def _coerce(value: Any, annotation: Any) -> Any:
+    annotation = _unwrap(annotation)
+    origin = typing.get_origin(annotation)
+
+    if value is None:
+        return None
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if isinstance(value, list) and len(value) == 1:
+            value = value[0]
+        return coerce_to_schema(value, annotation) if isinstance(value, dict) else value
+
+    if origin in (list, List):
+        (item_type,) = typing.get_args(annotation) or (Any,)
+        if isinstance(value, str):
+            value = [line.strip(" -•") for line in value.splitlines() if line.strip()]
+        elif isinstance(value, dict):
+            value = [value]
+        if isinstance(value, list):
+            return [_coerce(item, item_type) for item in value]
+        return value
+
+    if annotation is int:
+        if isinstance(value, float):
+            return int(round(value))
+        if isinstance(value, str):
+            match = _NUMBER.search(value)  # "4점", "4/5" 등
+            return int(round(float(match.group()))) if match else value
+        return value
+
+    if annotation is float and isinstance(value, str):
+        match = _NUMBER.search(value)
+        return float(match.group()) if match else value
+
+    if annotation is str:
+        if isinstance(value, list):
+            return ", ".join(str(v) for v in value if v is not None)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        return value
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return value.strip().lower() if isinstance(value, str) else value
+
+    return value
+
+
+def coerce_to_schema(data: Any, schema: Type[BaseModel]) -> Any:
+    """
+    스키마 필드 타입에 맞게 값 보정 (범위 clamp는 모델 validator가 담당).
+
+    - {"result": {...}}처럼 한 번 감싼 객체, 리스트 필드 하나짜리 스키마에 맨
+      리스트가 온 경우 등 형태 보정
+    - 키 이름 보정, 숫자 문자열 → int, 리스트 → 문자열, 문자열 → 리스트 등
+    """
+    fields = schema.model_fields
+    list_fields = [
+        name
+        for name, f in fields.items()
+        if typing.get_origin(_unwrap(f.annotation)) in (list, List)
+    ]
+    if isinstance(data, list) and len(fields) == 1 and list_fields:
+        data = {list_fields[0]: data}
+    if not isinstance(data, dict):
+        return data
+
+    data = _match_keys(data, schema)
+    if not set(data) & set(fields) and len(data) == 1:
+        (inner,) = data.values()
+        if isinstance(inner, (dict, list)):
+            return coerce_to_schema(inner, schema)
+
+    return {
+        key: _coerce(value, fields[key].annotation) if key in fields else value
+        for key, value in data.items()
+    }
+
+
+def drop_truncated_items(data: Any, schema: Type[BaseModel]) -> Any:
+    """
+    부분 검증: 모델 리스트 필드의 마지막 항목이 검증에 실패하면(출력이 잘려
+    생긴 미완성 항목) 제거. 중간 항목 오류는 그대로 두어 재호출로 넘김.
+    """
+    if not isinstance(data, dict):
+        return data
+    out = dict(data)
+    for name, field in schema.model_fields.items():
+        annotation = _unwrap(field.annotation)
+        items = out.get(name)
+        if typing.get_origin(annotation) not in (list, List) or not items:
+            continue
+        (item_type,) = typing.get_args(annotation) or (Any,)
+        if not (isinstance(item_type, type) and issubclass(item_type, BaseModel)):
+            continue
+        try:
+            item_type.model_validate(items[-1])
+        except ValidationError:
+            if len(items) > 1:
+                out[name] = items[:-1]
+    return out
+
+
+def fill_missing_fields(data: Any, schema: Type[BaseModel]) -> Any:
+    """
+    잘린 출력에서 빠진 필수 Enum 필드(예: tailDecision)를 null로 채워 모델
+    validator의 기본값(skip)을 따르게 함. 본문·점수 같은 내용 필드는 채우지
+    않으므로 빠져 있으면 검증에 실패해 재호출됩니다.
+    """
+    if not isinstance(data, dict):
+        return data
+    missing = {}
+    for name, field in schema.model_fields.items():
+        annotation = _unwrap(field.annotation)
+        if (
+            field.is_required()
+            and name not in data
+            and isinstance(annotation, type)
+            and issubclass(annotation, Enum)
+        ):
+            missing[name] = None
+    return {**data, **missing}
+
+
+# === 통계 ===
+
+
+class JsonRepairStats:
+    """
+    스키마별 구조화 출력 처리 결과 카운터.
+
+    - ok: 그대로 검증 통과
+    - repaired: 로컬 복구 후 통과
+    - recalled: 로컬 복구 실패 → LLM 재호출
+    - failed: 재호출 결과도 복구 실패
+    """
+
+    _KEYS = ("ok", "repaired", "recalled", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, schema_name: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                schema_name, {key: 0 for key in self._KEYS}
+            )
+            counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._counts.items()}
+
+
+json_repair_stats = JsonRepairStats()
+
+
+# === LCEL 단계 ===
+
+
+def failed_generation(error: Exception) -> Optional[str]:
+    """Groq json_validate_failed(400) 오류에 담긴 모델 원문 출력"""
+    if getattr(error, "status_code", None) != 400:
+        return None
+    body = getattr(error, "body", None)
+    if not isinstance(body, dict):
+        return None
+    detail = body.get("error", body)
+    if not isinstance(detail, dict) or detail.get("code") != "json_validate_failed":
+        return None
+    text = detail.get("failed_generation")
+    return text if isinstance(text, str) and text else None
+
+
+class RepairingOutputParser:
+    """
+    모델 출력(AIMessage) → JSON 복구 → 타입 보정 → Pydantic 검증.
+
+    복구할 수 없으면 OutputParserException을 던져 호출 측 fallback(LLM 재호출)이
+    동작하게 합니다. final=True는 재호출 단계의 파서입니다.
+    """
+
+    def __init__(self, schema: Type[T], final: bool = False):
+        self.schema = schema
+        self.final = final
+
+    def __call__(self, message: BaseMessage) -> T:
+        text = message.content if isinstance(message.content, str) else ""
+        name = self.schema.__name__
+        try:
+            try:
+                return self._record(self.schema.model_validate_json(text), "ok")
+            except ValidationError:
+                pass
+            data, _ = parse_json_lenient(text)
+            data = coerce_to_schema(data, self.schema)
+            try:
+                result = self.schema.model_validate(data)
+            except ValidationError:
+                data = drop_truncated_items(data, self.schema)
+                result = self.schema.model_validate(
+                    fill_missing_fields(data, self.schema)
+                )
+            logger.info(f"Repaired LLM output locally for {name}")
+            return self._record(result, "repaired")
+        except (ValueError, ValidationError) as e:
+            json_repair_stats.record(name, "failed" if self.final else "recalled")
+            logger.warning(
+                f"LLM output repair failed for {name}"
+                f"{'' if self.final else ', re-calling'}: {str(e)[:200]}"
+            )
+            raise OutputParserException(
+                f"Failed to parse {name} from LLM output", llm_output=text
+            ) from e
+
+    def _record(self, result: T, outcome: str) -> T:
+        json_repair_stats.record(self.schema.__name__, outcome)
+        return result
+
+
+def _tolerate_json_validate_failed(model_step: Runnable) -> Runnable:
+    """json_validate_failed 오류를 원문 출력 메시지로 바꿔 로컬 복구 단계로 넘김"""
+
+    def fallback(error: Exception) -> AIMessage:
+        text = failed_generation(error)
+        if text is None:
+            raise error
+        logger.info("Groq rejected JSON output, trying local repair")
+        return AIMessage(content=text)
+
+    def invoke(value: Any, config: RunnableConfig) -> BaseMessage:
+        try:
+            return model_step.invoke(value, config)
+        except Exception as e:
+            return fallback(e)
+
+    async def ainvoke(value: Any, config: RunnableConfig) -> BaseMessage:
+        try:
+            return await model_step.ainvoke(value, config)
+        except Exception as e:
+            return fallback(e)
+
+    return RunnableLambda(invoke, afunc=ainvoke, name="json_mode_model")
+
+
+def build_repairing_chain(
+    prompt: Runnable, model_step: Runnable, schema: Type[BaseModel]
+) -> Runnable:
+    """
+    prompt → 모델(JSON mode) → 로컬 복구 파서.
+    로컬 복구가 실패한 경우에만 같은 체인으로 LLM을 한 번 더 호출합니다.
+    """
+    model_step = _tolerate_json_validate_failed(model_step)
+
+    def attempt(final: bool) -> Runnable:
+        parser = RepairingOutputParser(schema, final=final)
+        return prompt | model_step | RunnableLambda(parser, name="json_repair")
+
+    return attempt(False).with_fallbacks(
+        [attempt(True)], exceptions_to_handle=(OutputParserException,)
+    )
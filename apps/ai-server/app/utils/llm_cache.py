@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT = "HIT"
+CACHE_MISS = "MISS"
+CACHE_BYPASS = "BYPASS"
+
+
+class LLMResponseCache:
+    """
+    결정적 생성 결과용 2단 캐시 (프로세스 내 LRU → Redis).
+
+    - 대상: temperature 0 호출, 또는 호출자가 명시적으로 요청한 경우(use_cache=true)만.
+      질문 생성(temperature 0.8)처럼 샘플링하는 호출은 seed가 있어도 기본 대상이 아님
+      (seed는 프롬프트에만 전달되고 모델 샘플링을 고정하지 않음)
+    - 키: 프롬프트 ID + 렌더링 변수 + 모델명 + temperature + 출력 스키마의 해시
+    - 값: 구조화 출력(model_dump) + 원본 호출 소요시간/토큰 수 (절감량 집계용)
+    - Redis 장애 시 경고만 남기고 LRU 단독으로 동작
+    - Redis 클라이언트는 lifespan에서 bind()로 주입 (앱 공용 커넥션 풀 사용)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_sec: int = 3600,
+        key_prefix: str = "llm_cache:",
+    ):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.key_prefix = key_prefix
+        self._lru: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self._aredis: Optional[aioredis.Redis] = None
+        self._counters: Dict[str, float] = {
+            "hits_local": 0,
+            "hits_redis": 0,
+            "misses": 0,
+            "saved_ms": 0,
+            "saved_tokens": 0,
+        }
+
+    @staticmethod
+    def make_key(
+        prompt_name: str,
+        schema_name: str,
+        vars: Dict[str, Any],
+        model: str,
+        temperature: Optional[float],
+    ) -> str:
+        raw = json.dumps(
+            {
+                "prompt": prompt_name,
+                "schema": schema_name,
+                "vars": vars,
+                "model": model,
+                "temperature": temperature,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # === 프로세스 내 LRU ===
+
+    def _local_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+            return entry
+
+    def _local_set(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _record_hit(self, tier: str, entry: Dict[str, Any]) -> None:
+        self._counters[f"hits_{tier}"] += 1
+        self._counters["saved_ms"] += entry.get("ms", 0)
+        self._counters["saved_tokens"] += entry.get("tokens", 0)
+
+    # === Redis 계층 ===
+
+    def bind(
+        self, client: Optional[redis.Redis], async_client: Optional[aioredis.Redis]
+    ) -> None:
+        """Redis 계층 클라이언트 설정 (None이면 LRU 단독)"""
+        self._redis = client
+        self._aredis = async_client
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local_get(key)
+        if entry is not None:
+            self._record_hit("local", entry)
+            return entry
+
+        client = self._redis
+        if client is not None:
+            try:
+                raw = client.get(self.key_prefix + key)
+            except redis.RedisError as e:
+                logger.warning(f"LLM cache Redis get failed: {e}")
+                raw = None
+            if raw:
+                entry = json.loads(raw)
+                self._local_set(key, entry)
+                self._record_hit("redis", entry)
+                return entry
+
+        self._counters["misses"] += 1
+        return None
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local_get(key)
+        if entry is not None:
+            self._record_hit("local", entry)
+            return entry
+
+        client = self._aredis
+        if client is not None:
+            try:
+                raw = await client.get(self.key_prefix + key)
+            except redis.RedisError as e:
+                logger.warning(f"LLM cache Redis get failed: {e}")
+                raw = None
+            if raw:
+                entry = json.loads(raw)
+                self._local_set(key, entry)
+                self._record_hit("redis", entry)
+                return entry
+
+        self._counters["misses"] += 1
+        return None
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self._local_set(key, entry)
+        client = self._redis
+        if client is not None:
+            try:
+                client.set(
+                    self.key_prefix + key,
+                    json.dumps(entry, ensure_ascii=False),
+                    ex=self.ttl_sec,
+                )
+            except redis.RedisError as e:
+                logger.warning(f"LLM cache Redis set failed: {e}")
+
+    async def aset(self, key: str, entry: Dict[str, Any]) -> None:
+        self._local_set(key, entry)
+        client = self._aredis
+        if client is not None:
+            try:
+                await client.set(
+                    self.key_prefix + key,
+                    json.dumps(entry, ensure_ascii=False),
+                    ex=self.ttl_sec,
+                )
+            except redis.RedisError as e:
+                logger.warning(f"LLM cache Redis set failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "local_entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "redis_enabled": self._redis is not None,
+        }
+
+
+llm_cache = LLMResponseCache(
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256")),
+    ttl_sec=int(os.getenv("LLM_CACHE_TTL_SEC", "3600")),
+)
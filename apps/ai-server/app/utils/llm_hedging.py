@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+
+class LatencyWindow:
+    """최근 N건의 성공 호출 지연(초)으로 백분위수 계산"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class HedgingPolicy:
+    """
+    LLM 호출 hedging + 순차 failover.
+
+    - 1차 호출이 프롬프트별 지연 백분위수(deadline) 안에 끝나지 않으면 다음
+      provider로 2차 요청을 보내고 먼저 끝난 결과를 사용, 나머지 요청은 취소
+    - 같은 provider로는 hedge하지 않음 (중복 요청은 토큰만 두 배로 쓰고 한도를 잠식)
+      → LLM_FALLBACK_PROVIDERS가 없으면 hedging 없이 1차 호출만 기다림
+    - 진행 중인 요청이 모두 실패하면 아직 시도하지 않은 provider로 failover
+    - 샘플이 부족할 때는 default_deadline_sec를 deadline으로 사용
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window_size: int = 200,
+        default_deadline_sec: float = 8.0,
+        min_deadline_sec: float = 1.0,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.default_deadline_sec = default_deadline_sec
+        self.min_deadline_sec = min_deadline_sec
+        self._windows: Dict[str, LatencyWindow] = {}
+        self._counters: Dict[str, int] = {
+            "calls": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "failovers": 0,
+            "attempt_errors": 0,
+        }
+        self._wins_by_provider: Dict[int, int] = {}
+
+    def _window(self, key: str) -> LatencyWindow:
+        if key not in self._windows:
+            self._windows[key] = LatencyWindow(self.window_size)
+        return self._windows[key]
+
+    def deadline(self, key: str) -> float:
+        window = self._window(key)
+        observed = (
+            window.percentile(self.percentile)
+            if len(window) >= self.min_samples
+            else None
+        )
+        if observed is None:
+            return self.default_deadline_sec
+        return max(self.min_deadline_sec, observed)
+
+    async def run(
+        self,
+        key: str,
+        provider_count: int,
+        make_call: Callable[[int, bool], Awaitable[R]],
+    ) -> R:
+        """
+        make_call(provider_index, extra)로 호출을 만들어 실행.
+        extra=True는 hedge/failover로 추가된 요청입니다.
+        """
+        self._counters["calls"] += 1
+        start = time.monotonic()
+        deadline = self.deadline(key) if self.enabled else None
+        running: Dict["asyncio.Future[R]", Tuple[int, float, bool]] = {}
+        next_index = 0
+        hedged = False
+        first_error: Optional[BaseException] = None
+
+        def launch(is_hedge: bool) -> None:
+            nonlocal next_index
+            index = next_index
+            next_index += 1
+            task = asyncio.ensure_future(make_call(index, index > 0))
+            running[task] = (index, time.monotonic(), is_hedge)
+
+        launch(False)
+        try:
+            while running:
+                timeout = None
+                if deadline is not None and not hedged and next_index < provider_count:
+                    timeout = max(0.0, start + deadline - time.monotonic())
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # deadline 경과 → hedge 요청 추가
+                    hedged = True
+                    self._counters["hedged"] += 1
+                    logger.info(f"LLM call exceeded {deadline:.2f}s, hedging: {key}")
+                    launch(True)
+                    continue
+
+                for task in done:
+                    index, started, is_hedge = running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        self._window(key).add(time.monotonic() - started)
+                        if is_hedge:
+                            self._counters["hedge_wins"] += 1
+                        self._wins_by_provider[index] = (
+                            self._wins_by_provider.get(index, 0) + 1
+                        )
+                        return task.result()
+
+                    self._counters["attempt_errors"] += 1
+                    first_error = first_error or error
+                    logger.warning(f"LLM provider #{index} failed for {key}: {error}")
+
+                if not running and next_index < provider_count:
+                    self._counters["failovers"] += 1
+                    launch(False)
+        finally:
+            for task in running:
+                task.cancel()
+
+        assert first_error is not None
+        raise first_error
+
+    def stats(self) -> Dict[str, Any]:
+        hedged = self._counters["hedged"]
+        calls = self._counters["calls"]
+        return {
+            **self._counters,
+            "enabled": self.enabled,
+            "hedge_rate": round(hedged / calls, 4) if calls else 0.0,
+            "win_rate": round(self._counters["hedge_wins"] / hedged, 4)
+            if hedged
+            else 0.0,
+            "wins_by_provider": dict(self._wins_by_provider),
+            "deadlines_sec": {
+                key: round(self.deadline(key), 3) for key in self._windows
+            },
+        }
+
+
+hedging_policy = HedgingPolicy(
+    enabled=os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true",
+    percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+    min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+    default_deadline_sec=float(os.getenv("LLM_HEDGE_DEFAULT_DEADLINE_SEC", "8")),
+    min_deadline_sec=float(os.getenv("LLM_HEDGE_MIN_DEADLINE_SEC", "1")),
+)
@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    TypeVar,
+)
+
+from dotenv import load_dotenv
+
+from app.utils.tracing import tracer
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+
+class LLMPriority(IntEnum):
+    """값이 작을수록 먼저 처리"""
+
+    FOLLOWUP = 0
+    ANSWER_EVALUATION = 1
+    QUESTION_GENERATION = 2
+    SESSION_EVALUATION = 3
+
+
+class TokenBucket:
+    """분당 한도(capacity)를 초당 capacity/60 속도로 채우는 토큰 버킷"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 꺼낼 수 있을 때까지 남은 시간(초)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """예상치와 실제 사용량 차이를 정산 (음수 잔량 = 다음 요청이 대기)"""
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+    def drain(self) -> None:
+        self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass
+class _Ticket:
+    priority: LLMPriority
+    session_id: str
+    tokens: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = None
+
+
+class LLMScheduler:
+    """
+    Groq 요청/토큰 한도(RPM·TPM)를 고려한 LLM 호출 스케줄러.
+
+    - 우선순위: 꼬리질문 > 답변 평가 > 질문 생성 > 세션 평가
+    - 같은 우선순위 안에서는 세션 단위 라운드로빈 (한 세션이 큐를 독점하지 않음)
+    - 호출 전 예상 토큰을 차감하고, 완료 후 실제 사용량으로 정산
+    - 429 응답 시 retry-after 동안 전체 디스패치를 멈추고 같은 우선순위로 재시도
+    - 버킷은 프로세스 단위: 워커/파드 N개면 각자 rpm·tpm을 쓰므로 합계는 N배
+      (LLM_RPM_LIMIT·LLM_TPM_LIMIT는 provider 한도 ÷ 프로세스 수로 설정)
+    - 비동기 경로(ainvoke_structured·스트리밍)만 스케줄링, 동기 invoke_structured는 제외
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        rpm: int = 30,
+        tpm: int = 6000,
+        max_retries: int = 3,
+        default_backoff_sec: float = 5.0,
+    ):
+        self.enabled = enabled
+        self.max_retries = max_retries
+        self.default_backoff_sec = default_backoff_sec
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._queues: Dict[LLMPriority, "OrderedDict[str, Deque[_Ticket]]"] = {
+            p: OrderedDict() for p in LLMPriority
+        }
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._wait_stats: Dict[LLMPriority, Dict[str, float]] = {
+            p: {"granted": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+            for p in LLMPriority
+        }
+        self._counters: Dict[str, int] = {"rate_limited": 0, "retries": 0}
+
+    # === 큐 ===
+
+    def _head(self) -> Optional[_Ticket]:
+        for priority in LLMPriority:
+            sessions = self._queues[priority]
+            while sessions:
+                session_id, queue = next(iter(sessions.items()))
+                while queue and queue[0].future is not None and queue[0].future.done():
+                    queue.popleft()  # 대기 중 취소된 요청
+                if queue:
+                    return queue[0]
+                del sessions[session_id]
+        return None
+
+    def _pop(self, ticket: _Ticket) -> None:
+        sessions = self._queues[ticket.priority]
+        queue = sessions.pop(ticket.session_id)
+        queue.popleft()
+        if queue:
+            # 라운드로빈: 남은 요청이 있는 세션은 맨 뒤로
+            sessions[ticket.session_id] = queue
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        while True:
+            ticket = self._head()
+            if ticket is None:
+                return
+
+            now = time.monotonic()
+            delay = max(
+                self._paused_until - now,
+                self._requests.wait_time(1, now),
+                self._tokens.wait_time(ticket.tokens, now),
+            )
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(
+                    delay, self._dispatch
+                )
+                return
+
+            self._pop(ticket)
+            self._requests.consume(1)
+            self._tokens.consume(ticket.tokens)
+            self._record_wait(ticket, now)
+            assert ticket.future is not None
+            ticket.future.set_result(None)
+
+    def _kick(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._dispatch()
+
+    def _record_wait(self, ticket: _Ticket, now: float) -> None:
+        wait_ms = (now - ticket.enqueued_at) * 1000
+        stats = self._wait_stats[ticket.priority]
+        stats["granted"] += 1
+        stats["wait_ms_total"] += wait_ms
+        stats["wait_ms_max"] = max(stats["wait_ms_max"], wait_ms)
+        if wait_ms >= 1000:
+            logger.info(
+                f"[{ticket.session_id}] LLM request ({ticket.priority.name}) waited {round(wait_ms)}ms"
+            )
+
+    # === 공개 API ===
+
+    async def acquire(
+        self, priority: LLMPriority, session_id: str, tokens: int
+    ) -> _Ticket:
+        """한도 안에서 차례가 올 때까지 대기 후 티켓 반환"""
+        ticket = _Ticket(priority=priority, session_id=session_id, tokens=tokens)
+        if not self.enabled:
+            return ticket
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(session_id, deque()).append(ticket)
+        self._kick()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                self.settle(ticket, 0)  # 차감 직후 취소 → 환불
+            else:
+                ticket.future.cancel()
+            raise
+        return ticket
+
+    def settle(self, ticket: _Ticket, used_tokens: int) -> None:
+        """예상 토큰과 실제 사용량의 차이를 정산"""
+        if not self.enabled:
+            return
+        self._tokens.adjust(ticket.tokens - used_tokens)
+        if used_tokens < ticket.tokens:
+            self._kick()  # 환불된 토큰으로 대기 중인 요청 처리
+
+    def charge(self, tokens: int) -> None:
+        """대기 없이 한도만 차감 (이미 차례를 받은 호출의 hedge/failover 요청)"""
+        if not self.enabled:
+            return
+        self._requests.consume(1)
+        self._tokens.consume(tokens)
+
+    def on_rate_limited(self, retry_after_sec: Optional[float]) -> None:
+        """429 수신: retry-after 동안 디스패치를 멈추고 버킷을 비움"""
+        backoff = retry_after_sec or self.default_backoff_sec
+        self._counters["rate_limited"] += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + backoff)
+        self._requests.drain()
+        self._tokens.drain()
+        logger.warning(f"LLM rate limited, pausing dispatch for {backoff:.1f}s")
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: LLMPriority,
+        session_id: str,
+        tokens: int,
+        used_tokens: Optional[Callable[[], int]] = None,
+    ) -> AsyncIterator[_Ticket]:
+        """acquire → 호출 → settle (스트리밍 호출용)"""
+        with tracer.span("llm.scheduler_wait", priority=priority.name):
+            ticket = await self.acquire(priority, session_id, tokens)
+        try:
+            yield ticket
+        finally:
+            # 사용량을 알 수 없으면(스트리밍 등) 예상치를 그대로 사용
+            self.settle(ticket, (used_tokens() if used_tokens else 0) or tokens)
+
+    async def run(
+        self,
+        priority: LLMPriority,
+        session_id: str,
+        tokens: int,
+        fn: Callable[[], Awaitable[R]],
+        used_tokens: Optional[Callable[[], int]] = None,
+    ) -> R:
+        """스케줄링된 차례에 fn 실행, 429면 backoff 후 같은 우선순위로 재시도"""
+        attempt = 0
+        while True:
+            async with self.slot(priority, session_id, tokens, used_tokens):
+                try:
+                    return await fn()
+                except Exception as e:
+                    if not self.enabled or not _is_rate_limit(e):
+                        raise
+                    self.on_rate_limited(_retry_after(e))
+                    if attempt >= self.max_retries:
+                        raise
+            attempt += 1
+            self._counters["retries"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        by_priority: Dict[str, Any] = {}
+        for priority in LLMPriority:
+            sessions = self._queues[priority]
+            wait = self._wait_stats[priority]
+            granted = int(wait["granted"])
+            by_priority[priority.name] = {
+                "queue_depth": sum(len(q) for q in sessions.values()),
+                "queued_sessions": len(sessions),
+                "granted": granted,
+                "wait_ms_avg": round(wait["wait_ms_total"] / granted) if granted else 0,
+                "wait_ms_max": round(wait["wait_ms_max"]),
+            }
+        return {
+            **self._counters,
+            "enabled": self.enabled,
+            "paused_sec": round(max(0.0, self._paused_until - now), 2),
+            "requests_available": round(self._requests.tokens, 1),
+            "tokens_available": round(self._tokens.tokens),
+            "priorities": by_priority,
+        }
+
+
+def _is_rate_limit(e: Exception) -> bool:
+    return getattr(e, "status_code", None) == 429
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+llm_scheduler = LLMScheduler(
+    enabled=os.getenv("LLM_SCHEDULER_ENABLED", "false").lower() == "true",
+    rpm=int(os.getenv("LLM_RPM_LIMIT", "30")),
+    tpm=int(os.getenv("LLM_TPM_LIMIT", "6000")),
+    max_retries=int(os.getenv("LLM_SCHEDULER_MAX_RETRIES", "3")),
+)
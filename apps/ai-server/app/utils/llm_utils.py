@@ -1,10 +1,44 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+from uuid import UUID
 
 from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.outputs import LLMResult
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableSequence
 from langchain_groq import ChatGroq
+from pydantic import BaseModel
+
+from app.utils.json_repair import build_repairing_chain
+from app.utils.llm_cache import CACHE_BYPASS, CACHE_HIT, CACHE_MISS, llm_cache
+from app.utils.llm_hedging import hedging_policy
+from app.utils.llm_scheduler import LLMPriority, llm_scheduler
+from app.utils.metrics import (
+    current_endpoint,
+    llm_completion_tokens,
+    llm_prompt_tokens,
+    llm_request_duration,
+)
+from app.utils.token_budget import estimate_tokens
+from app.utils.tracing import tracing_callback
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# 스케줄러 예상치에 쓰는 호출당 출력 토큰 (실제 사용량으로 정산)
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "512"))
+
 PROMPT_BASE_DIR = (
     Path(__file__).resolve().parent.parent / "config" / "prompt"
 ).resolve()
@@ -15,9 +49,443 @@ def load_prompt_template(path: Path) -> str:
         return f.read()
 
 
-llm = ChatGroq(
-    model="llama-3.1-8b-instant",
-    temperature=0.8,
-    max_tokens=2048,
-    max_retries=2,
-)
+def build_chat_model(
+    provider: str = "groq",
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+) -> BaseChatModel:
+    """
+    provider 설정에 따라 채팅 모델 생성.
+
+    - groq (기본): ChatGroq (base_url 지정 시 해당 엔드포인트 사용)
+    - fake: Groq 쿼터 없이 부하 테스트용 로컬 대체 모델 (app/utils/fake_llm.py)
+    """
+    if provider == "fake":
+        from app.utils.fake_llm import FakeChatModel
+
+        logger.warning("LLM provider 'fake': using local fake chat model")
+        return FakeChatModel.from_env()
+    if provider != "groq":
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    kwargs: Dict[str, Any] = {"base_url": base_url} if base_url else {}
+    return ChatGroq(
+        model=model or "llama-3.1-8b-instant",
+        temperature=0.8,
+        max_tokens=2048,
+        max_retries=2,
+        **kwargs,
+    )
+
+
+@dataclass(frozen=True)
+class LLMProvider:
+    name: str
+    model: Any
+
+
+def parse_provider_spec(spec: str) -> LLMProvider:
+    """'groq:llama-3.3-70b-versatile', 'groq:llama-3.1-8b-instant@http://host:port', 'fake'"""
+    spec = spec.strip()
+    head, _, base_url = spec.partition("@")
+    provider, _, model = head.partition(":")
+    return LLMProvider(
+        name=spec,
+        model=build_chat_model(provider.lower(), model or None, base_url or None),
+    )
+
+
+# 순서대로 1차 → hedge/failover 대상 (LLM_FALLBACK_PROVIDERS: 쉼표 구분 spec)
+llm_providers: List[LLMProvider] = [
+    parse_provider_spec(
+        "fake"
+        if os.getenv("LLM_PROVIDER", "groq").lower() == "fake"
+        else f"{os.getenv('LLM_PROVIDER', 'groq')}:{os.getenv('LLM_MODEL', 'llama-3.1-8b-instant')}"
+    ),
+    *[
+        parse_provider_spec(spec)
+        for spec in os.getenv("LLM_FALLBACK_PROVIDERS", "").split(",")
+        if spec.strip()
+    ],
+]
+llm: Any = llm_providers[0].model
+
+
+def _json_mode_model(model: Any, schema: Type[BaseModel]) -> Runnable:
+    """with_structured_output(json_mode)에서 출력 파서를 뺀 모델 호출 단계"""
+    structured = model.with_structured_output(schema, method="json_mode")
+    *steps, _parser = structured.steps
+    return steps[0] if len(steps) == 1 else RunnableSequence(*steps)
+
+
+class ChainRegistry:
+    """
+    프롬프트 파일 → LCEL 체인 컴파일 캐시.
+
+    - 프롬프트는 파일 단위로 한 번만 파싱하고, (프롬프트, 출력 스키마) 조합별로
+      `prompt | llm.with_structured_output(...)` 체인을 재사용합니다.
+    - 요청마다 파일 mtime만 확인하여, 파일이 바뀐 경우에만 다시 컴파일합니다.
+    """
+
+    def __init__(self, base_dir: Path = PROMPT_BASE_DIR):
+        self.base_dir = base_dir
+        self._lock = threading.RLock()
+        self._prompts: Dict[str, Tuple[int, ChatPromptTemplate]] = {}
+        self._chains: Dict[Tuple[str, str], Tuple[int, Runnable]] = {}
+        self._specs: List[Tuple[str, Type[BaseModel]]] = []
+        self._priorities: Dict[str, LLMPriority] = {}
+        self._template_tokens: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {"hits": 0, "misses": 0, "reloads": 0}
+
+    def _path(self, prompt_name: str) -> Path:
+        return (self.base_dir / prompt_name).resolve()
+
+    def _mtime(self, prompt_name: str) -> int:
+        return os.stat(self._path(prompt_name)).st_mtime_ns
+
+    def _compile_prompt(self, prompt_name: str) -> ChatPromptTemplate:
+        raw = load_prompt_template(self._path(prompt_name))
+        self._template_tokens[prompt_name] = estimate_tokens(raw)
+        return ChatPromptTemplate.from_messages([("human", raw)])
+
+    def register(
+        self,
+        prompt_name: str,
+        schema: Type[BaseModel],
+        priority: LLMPriority = LLMPriority.ANSWER_EVALUATION,
+    ) -> None:
+        """
+        서비스 모듈에서 사용하는 (프롬프트, 스키마) 조합을 등록 (warmup 대상).
+        priority는 스케줄러 대기열에서 이 프롬프트 호출의 우선순위입니다.
+        """
+        if (prompt_name, schema) not in self._specs:
+            self._specs.append((prompt_name, schema))
+        self._priorities[prompt_name] = priority
+
+    def template_tokens(self, prompt_name: str) -> int:
+        self.get_prompt(prompt_name)
+        return self._template_tokens.get(prompt_name, 0)
+
+    def priority(self, prompt_name: str) -> LLMPriority:
+        return self._priorities.get(prompt_name, LLMPriority.ANSWER_EVALUATION)
+
+    def get_prompt(self, prompt_name: str) -> ChatPromptTemplate:
+        mtime = self._mtime(prompt_name)
+        cached = self._prompts.get(prompt_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with self._lock:
+            cached = self._prompts.get(prompt_name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            prompt = self._compile_prompt(prompt_name)
+            self._prompts[prompt_name] = (mtime, prompt)
+            return prompt
+
+    def _get_or_build(
+        self,
+        prompt_name: str,
+        variant: str,
+        build: Callable[[ChatPromptTemplate], Runnable],
+    ) -> Runnable:
+        key = (prompt_name, variant)
+        mtime = self._mtime(prompt_name)
+        cached = self._chains.get(key)
+        if cached and cached[0] == mtime:
+            self._counters["hits"] += 1
+            return cached[1]
+
+        with self._lock:
+            cached = self._chains.get(key)
+            if cached and cached[0] == mtime:
+                self._counters["hits"] += 1
+                return cached[1]
+
+            if cached:
+                self._counters["reloads"] += 1
+                logger.info(f"Prompt changed on disk, recompiling: {prompt_name}")
+            else:
+                self._counters["misses"] += 1
+
+            chain = build(self.get_prompt(prompt_name)).with_config(
+                callbacks=[llm_metrics_callback, tracing_callback],
+                metadata={"chain": prompt_name},
+            )
+            self._chains[key] = (mtime, chain)
+            return chain
+
+    def get_chain(
+        self, prompt_name: str, schema: Type[BaseModel], provider_index: int = 0
+    ) -> Runnable:
+        """provider_index: llm_providers 내 위치 (0 = 1차 모델)"""
+        model = llm_providers[provider_index].model
+        variant = schema.__name__
+        if provider_index:
+            variant += f"@{llm_providers[provider_index].name}"
+        return self._get_or_build(
+            prompt_name,
+            variant,
+            lambda prompt: build_repairing_chain(
+                prompt, _json_mode_model(model, schema), schema
+            ),
+        )
+
+    def get_stream_chain(self, prompt_name: str) -> Runnable:
+        """
+        토큰 스트리밍용 체인: 누적된 부분 JSON을 dict로 계속 yield.
+
+        Groq는 JSON mode(response_format)에서 스트리밍을 지원하지 않으므로
+        프롬프트의 JSON 출력 규칙에 의존하고 JsonOutputParser로 점진 파싱합니다.
+        """
+        return self._get_or_build(
+            prompt_name, "stream", lambda prompt: prompt | llm | JsonOutputParser()
+        )
+
+    def warmup(self) -> int:
+        """등록된 모든 체인을 미리 컴파일 (앱 시작 시 호출)"""
+        for prompt_name, schema in self._specs:
+            for index in range(len(llm_providers)):
+                self.get_chain(prompt_name, schema, index)
+        return len(self._specs) * len(llm_providers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "prompts": sorted(self._prompts.keys()),
+            "chains": [f"{p}:{v}" for p, v in self._chains.keys()],
+        }
+
+
+chain_registry = ChainRegistry()
+
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """LLM 호출의 토큰 사용량 집계 (ChatGroq llm_output.token_usage 기준)"""
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self.total_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        self.total_tokens += int(usage.get("total_tokens") or 0)
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    LLM 호출별 지연·토큰 수를 /metrics 히스토그램에 기록.
+    라벨: chain(프롬프트 파일), model, endpoint(요청 경로), outcome
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._runs: Dict[UUID, Tuple[float, str, str, str]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        params = kwargs.get("invocation_params") or {}
+        model = (
+            metadata.get("ls_model_name")
+            or params.get("model")
+            or params.get("model_name")
+            or "unknown"
+        )
+        with self._lock:
+            self._runs[run_id] = (
+                time.perf_counter(),
+                str(metadata.get("chain", "unknown")),
+                str(model),
+                current_endpoint.get(),
+            )
+
+    def _finish(self, run_id: UUID, outcome: str) -> Optional[Tuple[str, str, str]]:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        start, chain, model, endpoint = run
+        llm_request_duration.labels(
+            chain=chain, model=model, endpoint=endpoint, outcome=outcome
+        ).observe(time.perf_counter() - start)
+        return chain, model, endpoint
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        labels = self._finish(run_id, "ok")
+        if labels is None:
+            return
+        chain, model, endpoint = labels
+        prompt_tokens, completion_tokens = _usage_from_result(response)
+        if prompt_tokens or completion_tokens:
+            llm_prompt_tokens.labels(
+                chain=chain, model=model, endpoint=endpoint
+            ).observe(prompt_tokens)
+            llm_completion_tokens.labels(
+                chain=chain, model=model, endpoint=endpoint
+            ).observe(completion_tokens)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        cancelled = isinstance(error, asyncio.CancelledError)
+        self._finish(run_id, "cancelled" if cancelled else "error")
+
+
+def _usage_from_result(response: LLMResult) -> Tuple[int, int]:
+    """(prompt, completion) 토큰 수: llm_output.token_usage → 메시지 usage_metadata 순"""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return (
+            int(usage.get("prompt_tokens") or 0),
+            int(usage.get("completion_tokens") or 0),
+        )
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(
+                getattr(generation, "message", None), "usage_metadata", None
+            )
+            if metadata:
+                return (
+                    int(metadata.get("input_tokens") or 0),
+                    int(metadata.get("output_tokens") or 0),
+                )
+    return 0, 0
+
+
+llm_metrics_callback = LLMMetricsCallback()
+
+
+def _with_callback(
+    run_config: Optional[RunnableConfig], callback: BaseCallbackHandler
+) -> RunnableConfig:
+    config: RunnableConfig = dict(run_config or {})  # type: ignore[assignment]
+    config["callbacks"] = [*(config.get("callbacks") or []), callback]  # type: ignore[misc]
+    return config
+
+
+def estimate_call_tokens(prompt_name: str, vars: Dict[str, Any]) -> int:
+    """
+    스케줄러용 호출 토큰 예상치 (프롬프트 + 변수 근사치 + 예상 출력 토큰).
+    호출 후 실제 사용량으로 정산되므로 대략적인 값이면 충분하며, 출력은 상한
+    (max_tokens) 대신 평균에 가까운 값으로 잡아 과도한 선점을 피합니다.
+    """
+    tokens = chain_registry.template_tokens(prompt_name)
+    tokens += sum(estimate_tokens(str(v)) for v in vars.values())
+    return tokens + min(LLM_EXPECTED_OUTPUT_TOKENS, llm.max_tokens or 0)
+
+
+def is_deterministic() -> bool:
+    """기본 모델이 temperature 0이면 같은 입력에 같은 출력 → 캐시 기본 대상"""
+    return getattr(llm, "temperature", None) == 0
+
+
+def _cache_key(prompt_name: str, schema: Type[BaseModel], vars: Dict[str, Any]) -> str:
+    return llm_cache.make_key(
+        prompt_name, schema.__name__, vars, llm.model_name, llm.temperature
+    )
+
+
+def invoke_structured(
+    prompt_name: str,
+    schema: Type[T],
+    vars: Dict[str, Any],
+    run_config: Optional[RunnableConfig] = None,
+    use_cache: bool = False,
+) -> Tuple[T, str]:
+    """
+    등록된 체인을 실행하여 구조화 출력을 반환.
+
+    use_cache=True이면 응답 캐시를 먼저 조회하며, (결과, 캐시 상태)를 반환합니다.
+    temperature > 0 모델의 응답을 캐시하면 같은 입력에 항상 같은 결과가 반환되므로,
+    호출자는 is_deterministic()이거나 캐시를 명시적으로 요청받은 경우에만 켭니다.
+    동기 경로는 스케줄러·hedging을 거치지 않습니다 (엔드포인트는 비동기 경로 사용).
+    """
+    chain = chain_registry.get_chain(prompt_name, schema)
+    if not use_cache:
+        return chain.invoke(vars, config=run_config or {}), CACHE_BYPASS
+
+    key = _cache_key(prompt_name, schema, vars)
+    entry = llm_cache.get(key)
+    if entry is not None:
+        return schema.model_validate(entry["value"]), CACHE_HIT
+
+    usage = TokenUsageCallback()
+    start = time.perf_counter()
+    result = chain.invoke(vars, config=_with_callback(run_config, usage))
+    llm_cache.set(
+        key,
+        {
+            "value": result.model_dump(mode="json"),
+            "ms": round((time.perf_counter() - start) * 1000),
+            "tokens": usage.total_tokens,
+        },
+    )
+    return result, CACHE_MISS
+
+
+async def ainvoke_structured(
+    prompt_name: str,
+    schema: Type[T],
+    vars: Dict[str, Any],
+    run_config: Optional[RunnableConfig] = None,
+    use_cache: bool = False,
+    session_id: str = "",
+) -> Tuple[T, str]:
+    """
+    invoke_structured의 비동기 버전.
+
+    실제 LLM 호출은 스케줄러(RPM/TPM 한도, 우선순위, 세션 간 라운드로빈)를
+    거쳐 실행되며, 캐시 히트는 스케줄러를 거치지 않습니다. 느린 응답은
+    hedging, 실패는 다음 provider로 failover 합니다 (llm_hedging.py).
+    """
+    key = ""
+    if use_cache:
+        key = _cache_key(prompt_name, schema, vars)
+        entry = await llm_cache.aget(key)
+        if entry is not None:
+            return schema.model_validate(entry["value"]), CACHE_HIT
+
+    usage = TokenUsageCallback()
+    config = _with_callback(run_config, usage)
+    tokens = estimate_call_tokens(prompt_name, vars)
+
+    def attempt(provider_index: int, extra: bool) -> Awaitable[T]:
+        if extra:
+            llm_scheduler.charge(tokens)  # hedge/failover 요청도 한도에 반영
+        provider_chain = chain_registry.get_chain(prompt_name, schema, provider_index)
+        return provider_chain.ainvoke(vars, config=config)
+
+    start = time.perf_counter()
+    result = await llm_scheduler.run(
+        chain_registry.priority(prompt_name),
+        session_id,
+        tokens,
+        lambda: hedging_policy.run(prompt_name, len(llm_providers), attempt),
+        lambda: usage.total_tokens,
+    )
+    if not use_cache:
+        return result, CACHE_BYPASS
+
+    await llm_cache.aset(
+        key,
+        {
+            "value": result.model_dump(mode="json"),
+            "ms": round((time.perf_counter() - start) * 1000),
+            "tokens": usage.total_tokens,
+        },
+    )
+    return result, CACHE_MISS
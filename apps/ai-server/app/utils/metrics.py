@@ -0,0 +1,147 @@
+import contextvars
+from typing import Callable, Dict, Iterator, Sequence, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# 요청 경로 라벨 (미들웨어가 설정, to_thread/create_task로 전파)
+current_endpoint: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_endpoint", default="background"
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LLM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+LabelValues = Tuple[str, ...]
+
+
+class CallbackGauge(Collector):
+    """
+    스크레이프 시점에 collect 콜백으로 값을 읽는 gauge
+    (스레드풀·대기열처럼 다른 객체가 상태를 가진 경우).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Dict[LabelValues, float]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = list(labelnames)
+        self._collect = collect
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        family = GaugeMetricFamily(
+            self.name, self.documentation, labels=self.labelnames
+        )
+        for labels, value in sorted(self._collect().items()):
+            family.add_metric(list(labels), value)
+        yield family
+
+
+# 앱 메트릭 전용 레지스트리 (/metrics에서 generate_latest로 노출)
+metrics_registry = CollectorRegistry()
+
+# === HTTP ===
+
+http_request_duration = Histogram(
+    "aiew_http_request_duration_seconds",
+    "HTTP request latency",
+    ("endpoint", "method", "status"),
+    buckets=LATENCY_BUCKETS,
+    registry=metrics_registry,
+)
+http_requests_in_progress = Gauge(
+    "aiew_http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ("endpoint",),
+    registry=metrics_registry,
+)
+
+# === LLM ===
+
+llm_request_duration = Histogram(
+    "aiew_llm_request_duration_seconds",
+    "LLM call latency per chain (prompt), model and endpoint",
+    ("chain", "model", "endpoint", "outcome"),
+    buckets=LLM_LATENCY_BUCKETS,
+    registry=metrics_registry,
+)
+llm_prompt_tokens = Histogram(
+    "aiew_llm_prompt_tokens",
+    "Prompt tokens per LLM call",
+    ("chain", "model", "endpoint"),
+    buckets=TOKEN_BUCKETS,
+    registry=metrics_registry,
+)
+llm_completion_tokens = Histogram(
+    "aiew_llm_completion_tokens",
+    "Completion tokens per LLM call",
+    ("chain", "model", "endpoint"),
+    buckets=TOKEN_BUCKETS,
+    registry=metrics_registry,
+)
+
+# === 세션 메모리 (Redis / InMemory) ===
+
+memory_operation_duration = Histogram(
+    "aiew_memory_operation_duration_seconds",
+    "Session memory operation latency",
+    ("operation", "backend", "endpoint"),
+    buckets=LATENCY_BUCKETS,
+    registry=metrics_registry,
+)
+
+memory_store_evictions = Counter(
+    "aiew_memory_store_evictions_total",
+    "Sessions evicted from the in-process memory store (no Redis)",
+    ("reason",),
+    registry=metrics_registry,
+)
+
+projection_write_conflicts = Counter(
+    "aiew_projection_write_conflicts_total",
+    "Redis projection WATCH conflicts (retry) and projections dropped after retries",
+    ("outcome",),
+    registry=metrics_registry,
+)
+
+redis_pool_checkout_duration = Histogram(
+    "aiew_redis_pool_checkout_seconds",
+    "Time to check out a connection from the shared Redis pool (incl. waiting)",
+    ("endpoint",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+    registry=metrics_registry,
+)
+
+# === PDF / 영상 ===
+
+pdf_pages = Counter(
+    "aiew_pdf_pages_total",
+    "PDF pages processed",
+    ("method",),
+    registry=metrics_registry,
+)
+ocr_page_duration = Histogram(
+    "aiew_ocr_page_duration_seconds",
+    "Render + OCR time per PDF page",
+    buckets=(0.25, 0.5, 1, 2, 3, 5, 8, 13, 21),
+    registry=metrics_registry,
+)
+video_frames = Counter(
+    "aiew_video_frames_total",
+    "Video frames decoded vs. analyzed (sampled for emotion detection)",
+    ("stage",),
+    registry=metrics_registry,
+)
+video_analysis_duration = Histogram(
+    "aiew_video_analysis_duration_seconds",
+    "Emotion analysis time per video",
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+    registry=metrics_registry,
+)
@@ -7,6 +7,8 @@ import fitz  # PyMuPDF
 import pytesseract
 from PIL import Image
 
+from app.utils.metrics import ocr_page_duration, pdf_pages
+
 
 def is_digital_pdf(file_bytes: bytes) -> bool:
     doc = fitz.open("pdf", file_bytes)
@@ -21,6 +23,7 @@ def extract_text_from_digital_pdf(file_bytes: bytes) -> str:
         text = ""
         for page in doc:
             text += page.get_text()
+        pdf_pages.labels(method="digital").inc(len(doc))
         return text
 
 
@@ -29,12 +32,14 @@ def extract_text_from_image_pdf(file_bytes: bytes) -> str:
     full_text = ""
 
     for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        pix = page.get_pixmap(dpi=300)
-        img_data = pix.tobytes("png")
-        image = Image.open(io.BytesIO(img_data))
-
-        text = pytesseract.image_to_string(image, lang="eng+kor")
+        with ocr_page_duration.time():
+            page = doc.load_page(page_num)
+            pix = page.get_pixmap(dpi=300)
+            img_data = pix.tobytes("png")
+            image = Image.open(io.BytesIO(img_data))
+
+            text = pytesseract.image_to_string(image, lang="eng+kor")
+        pdf_pages.labels(method="ocr").inc()
         full_text += text + "\n"
 
     return full_text
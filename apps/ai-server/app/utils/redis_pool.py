@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+from dotenv import load_dotenv
+
+from app.utils.metrics import current_endpoint, redis_pool_checkout_duration
+
+load_dotenv()
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """
+    커넥션 수 상한이 있는 블로킹 풀.
+    모두 사용 중이면 최대 timeout초 대기하며, 대기 포함 체크아웃 시간을 기록합니다.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # 연결 실패 시 풀 내부에서 release가 호출되므로 객체 단위로 추적
+        self._in_use: Set[int] = set()
+        self._in_use_lock = threading.Lock()
+
+    def reset(self) -> None:
+        super().reset()  # 부모 __init__에서도 호출됨
+        self._created = 0
+
+    def make_connection(self) -> Any:
+        self._created += 1
+        return super().make_connection()
+
+    def get_connection(self, *args: Any, **kwargs: Any):
+        start = time.perf_counter()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        finally:
+            redis_pool_checkout_duration.labels(
+                endpoint=current_endpoint.get()
+            ).observe(time.perf_counter() - start)
+        with self._in_use_lock:
+            self._in_use.add(id(connection))
+        return connection
+
+    def release(self, connection: Any) -> None:
+        with self._in_use_lock:
+            self._in_use.discard(id(connection))
+        super().release(connection)
+
+    def stats(self) -> Dict[str, int]:
+        with self._in_use_lock:
+            in_use = len(self._in_use)
+        created = self._created
+        return {
+            "in_use": in_use,
+            "idle": max(0, created - in_use),
+            "max": self.max_connections,
+        }
+
+
+_active_pool: Optional[InstrumentedConnectionPool] = None
+
+
+def _pool_options() -> Dict[str, Any]:
+    """동기·비동기 풀 공통 설정 (REDIS_POOL_* / REDIS_SOCKET_*)"""
+    return {
+        "max_connections": int(os.getenv("REDIS_POOL_MAX_CONNECTIONS", "50")),
+        "timeout": float(os.getenv("REDIS_POOL_TIMEOUT_SEC", "5")),
+        "socket_timeout": float(os.getenv("REDIS_SOCKET_TIMEOUT_SEC", "5")),
+        "socket_connect_timeout": float(
+            os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT_SEC", "2")
+        ),
+        "health_check_interval": int(
+            os.getenv("REDIS_HEALTH_CHECK_INTERVAL_SEC", "30")
+        ),
+    }
+
+
+def create_redis_client(redis_url: str) -> redis.Redis:
+    """앱 전역에서 공유할 Redis 클라이언트 생성 (lifespan에서 1회)"""
+    global _active_pool
+    pool = InstrumentedConnectionPool.from_url(redis_url, **_pool_options())
+    _active_pool = pool
+    return redis.Redis(connection_pool=pool)
+
+
+def create_async_redis_client(redis_url: str) -> aioredis.Redis:
+    """비동기 경로(single-flight, LLM 캐시)용 공유 클라이언트, 동기 풀과 같은 설정"""
+    pool = aioredis.BlockingConnectionPool.from_url(redis_url, **_pool_options())
+    return aioredis.Redis(connection_pool=pool)
+
+
+def close_redis_client(client: redis.Redis) -> None:
+    global _active_pool
+    client.close()
+    client.connection_pool.disconnect()
+    if _active_pool is client.connection_pool:
+        _active_pool = None
+
+
+_shared_client: Optional[redis.Redis] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_redis_client(redis_url: str) -> redis.Redis:
+    """
+    app.state.redis 없이 호출되는 경로(스크립트·백그라운드 작업)용 프로세스 공용
+    클라이언트. 첫 사용 시 같은 풀 설정으로 생성하고 lifespan 종료 시 닫습니다.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            pool = InstrumentedConnectionPool.from_url(redis_url, **_pool_options())
+            _shared_client = redis.Redis(connection_pool=pool)
+        return _shared_client
+
+
+def close_shared_redis_client() -> None:
+    global _shared_client
+    with _shared_client_lock:
+        client, _shared_client = _shared_client, None
+    if client is not None:
+        close_redis_client(client)
+
+
+async def close_async_redis_client(client: aioredis.Redis) -> None:
+    await client.aclose()
+    await client.connection_pool.disconnect()
+
+
+def redis_pool_stats() -> Dict[str, int]:
+    return _active_pool.stats() if _active_pool is not None else {}
@@ -0,0 +1,332 @@
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage
+from langchain_redis import RedisChatMessageHistory
+from redis.exceptions import WatchError
+
+from app.models.event_types import EventType
+from app.utils import fast_json
+from app.utils.event_codec import decode_event
+from app.utils.metrics import (
+    current_endpoint,
+    memory_operation_duration,
+    projection_write_conflicts,
+)
+from app.utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_VERSION = "1"  # 필드 구성이 바뀌면 올려서 기존 projection을 재생성
+INFLIGHT_TTL_SEC = 30  # 기록 도중 프로세스가 죽어도 재생성이 막히지 않도록
+WRITE_RETRIES = 3
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class SessionProjection:
+    """
+    세션 이벤트 로그의 집계 상태.
+    MemoryLogger가 이벤트를 기록할 때마다 갱신되므로 조회 시 메시지 전체를
+    다시 읽고 파싱할 필요가 없습니다.
+    """
+
+    followups: Dict[str, int] = field(
+        default_factory=dict
+    )  # 부모 질문 ID → 꼬리질문 수
+    score_sum: float = 0.0
+    score_count: int = 0
+    answers: Dict[str, str] = field(default_factory=dict)  # 질문 ID → 마지막 답변
+    pending_answer: Optional[str] = None  # 아직 평가와 짝지어지지 않은 마지막 답변
+    evaluations: List[Tuple[str, str, str]] = field(
+        default_factory=list
+    )  # 평가 순서대로 (질문 ID, 답변, 피드백)
+
+    def apply(self, event_type: str, data: Dict[str, Any]) -> None:
+        if event_type == EventType.QUESTION_ASKED:
+            parent = data.get("parentQuestionId")
+            if parent:
+                self.followups[parent] = self.followups.get(parent, 0) + 1
+
+        elif event_type == EventType.ANSWER_RECEIVED:
+            answer = data.get("answer")
+            self.pending_answer = answer
+            qid = data.get("aiQuestionId")
+            if qid and answer is not None:
+                self.answers[qid] = answer
+
+        elif event_type == EventType.ANSWER_EVALUATED:
+            qid = data.get("aiQuestionId")
+            if qid is None:
+                return
+            score = data.get("overallScore")
+            if score is not None:
+                self.score_sum += score
+                self.score_count += 1
+            self.evaluations.append(
+                (str(qid), self.pending_answer or "", data.get("feedback") or "")
+            )
+            self.pending_answer = None
+
+    def average_score(self) -> float:
+        if not self.score_count:
+            return 0.0
+        return float(round(self.score_sum / self.score_count, 2))
+
+    def copy(self) -> "SessionProjection":
+        return SessionProjection(
+            followups=dict(self.followups),
+            score_sum=self.score_sum,
+            score_count=self.score_count,
+            answers=dict(self.answers),
+            pending_answer=self.pending_answer,
+            evaluations=list(self.evaluations),
+        )
+
+    @classmethod
+    def from_messages(cls, messages: Sequence[BaseMessage]) -> "SessionProjection":
+        """메시지 로그 전체를 재생해 projection 생성 (projection이 없을 때)"""
+        projection = cls()
+        for m in messages:
+            decoded = decode_event(m.content)
+            if decoded is None:
+                continue
+            event_type, data = decoded
+            # 꼬리질문 수는 메시지 종류와 무관하게, 평가 데이터는 AI 메시지에서만 집계
+            if m.type != "ai" and event_type != EventType.QUESTION_ASKED:
+                continue
+            projection.apply(event_type, data)
+        return projection
+
+    # === Redis hash 직렬화 ===
+
+    def to_hash(self) -> Dict[str, str]:
+        mapping = {
+            "version": PROJECTION_VERSION,
+            "score_sum": repr(self.score_sum),
+            "score_count": str(self.score_count),
+            "evals": str(len(self.evaluations)),
+        }
+        mapping.update({f"fu:{k}": str(v) for k, v in self.followups.items()})
+        mapping.update({f"answer:{k}": v for k, v in self.answers.items()})
+        mapping.update(
+            {f"eval:{i}": fast_json.dumps(e) for i, e in enumerate(self.evaluations, 1)}
+        )
+        if self.pending_answer is not None:
+            mapping["pending_answer"] = self.pending_answer
+        return mapping
+
+    @classmethod
+    def from_hash(cls, raw: Dict[Any, Any]) -> Optional["SessionProjection"]:
+        fields = {_str(k): _str(v) for k, v in raw.items()}
+        if fields.get("version") != PROJECTION_VERSION:
+            return None
+        projection = cls(
+            score_sum=float(fields.get("score_sum") or 0),
+            score_count=int(fields.get("score_count") or 0),
+            pending_answer=fields.get("pending_answer"),
+        )
+        evaluations: Dict[int, Tuple[str, str, str]] = {}
+        for name, value in fields.items():
+            kind, _, key = name.partition(":")
+            if kind == "fu":
+                projection.followups[key] = int(value)
+            elif kind == "answer":
+                projection.answers[key] = value
+            elif kind == "eval":
+                evaluations[int(key)] = tuple(fast_json.loads(value))  # type: ignore[assignment]
+        projection.evaluations = [evaluations[i] for i in sorted(evaluations)]
+        return projection
+
+
+def _str(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _backend(memory: BaseChatMessageHistory) -> str:
+    return "redis" if isinstance(memory, RedisChatMessageHistory) else "memory"
+
+
+def _timed(operation: str, memory: BaseChatMessageHistory):
+    return memory_operation_duration.labels(
+        operation=operation, backend=_backend(memory), endpoint=current_endpoint.get()
+    ).time()
+
+
+def projection_key(memory: RedisChatMessageHistory) -> str:
+    """메시지 키와 같은 접두사 → TTL 갱신(refresh-ttl) 대상에 함께 포함"""
+    return f"{memory.key_prefix}{memory.session_id}:projection"
+
+
+# InMemory 기록은 projection을 객체에 함께 보관 (memory.projection)
+_memory_lock = threading.Lock()
+
+
+def _in_memory(memory: BaseChatMessageHistory) -> Optional[SessionProjection]:
+    return getattr(memory, "projection", None)
+
+
+def _stored(memory: BaseChatMessageHistory) -> Optional[SessionProjection]:
+    """기록과 함께 projection을 직접 갱신하는 저장소 (SQLite)"""
+    load = getattr(memory, "load_projection", None)
+    return load() if load is not None else None
+
+
+# === 기록 ===
+
+
+@contextmanager
+def recording(memory: BaseChatMessageHistory, events: List[Event]) -> Iterator[None]:
+    """
+    메시지 기록을 감싸 projection에 이벤트를 반영.
+
+    Redis: 기록 전에 진행 표시(inflight)를 올려 두어, 그 사이 조회가 메시지를
+    재생해 만든 projection을 저장하지 못하게 함 (이중 집계 방지).
+    projection이 아직 없으면 반영하지 않고 다음 조회 때 메시지에서 생성.
+    """
+    projection = _in_memory(memory)
+    if projection is not None:
+        yield
+        with _memory_lock:
+            for event_type, data in events:
+                projection.apply(event_type, data)
+        return
+
+    if not isinstance(memory, RedisChatMessageHistory):
+        yield
+        return
+
+    client = memory.redis_client
+    key = projection_key(memory)
+    inflight = f"{key}:inflight"
+    with client.pipeline(transaction=False) as pipe:
+        pipe.incr(inflight)
+        pipe.expire(inflight, INFLIGHT_TTL_SEC)
+        pipe.execute()
+    try:
+        yield
+        with _timed("projection_write", memory):
+            _redis_apply(memory, key, events)
+    finally:
+        client.decr(inflight)
+
+
+def _redis_apply(
+    memory: RedisChatMessageHistory, key: str, events: List[Event]
+) -> None:
+    client = memory.redis_client
+    for _ in range(WRITE_RETRIES):
+        with client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                version, pending, evals = pipe.hmget(
+                    key, "version", "pending_answer", "evals"
+                )
+                if _str(version) != PROJECTION_VERSION:
+                    return
+
+                # pending_answer에서 시작한 증분만 계산해 HINCRBY/HSET으로 반영
+                delta = SessionProjection(pending_answer=_str(pending))
+                for event_type, data in events:
+                    delta.apply(event_type, data)
+
+                pipe.multi()
+                for parent, count in delta.followups.items():
+                    pipe.hincrby(key, f"fu:{parent}", count)
+                if delta.score_count:
+                    pipe.hincrbyfloat(key, "score_sum", delta.score_sum)
+                    pipe.hincrby(key, "score_count", delta.score_count)
+                base = int(_str(evals) or 0)
+                mapping = {f"answer:{k}": v for k, v in delta.answers.items()}
+                for i, evaluation in enumerate(delta.evaluations, base + 1):
+                    mapping[f"eval:{i}"] = fast_json.dumps(evaluation)
+                if delta.evaluations:
+                    mapping["evals"] = str(base + len(delta.evaluations))
+                if delta.pending_answer is not None:
+                    mapping["pending_answer"] = delta.pending_answer
+                else:
+                    pipe.hdel(key, "pending_answer")
+                if mapping:
+                    pipe.hset(key, mapping=mapping)
+                if memory.ttl:
+                    pipe.expire(key, memory.ttl)
+                pipe.execute()
+                return
+            except WatchError:
+                projection_write_conflicts.labels(outcome="retry").inc()
+                continue
+    # 경합이 계속되면 무효화 → 다음 조회 때 메시지에서 재생성
+    projection_write_conflicts.labels(outcome="invalidated").inc()
+    logger.warning(
+        f"Projection write conflicted {WRITE_RETRIES} times, invalidating: {key}"
+    )
+    client.delete(key)
+
+
+# === 조회 ===
+
+
+@traced("session_projection.rebuild")
+def _redis_rebuild(memory: RedisChatMessageHistory, key: str) -> SessionProjection:
+    """메시지 로그를 재생해 projection 생성 후 저장 (진행 중인 기록이 없을 때만)"""
+    client = memory.redis_client
+    inflight = f"{key}:inflight"
+    with _timed("projection_rebuild", memory), client.pipeline() as pipe:
+        try:
+            pipe.watch(key, inflight)
+            projection = SessionProjection.from_messages(memory.messages)
+            if int(_str(pipe.get(inflight)) or 0) > 0:
+                return projection
+            pipe.multi()
+            pipe.delete(key)
+            pipe.hset(key, mapping=projection.to_hash())
+            if memory.ttl:
+                pipe.expire(key, memory.ttl)
+            pipe.execute()
+        except WatchError:
+            pass  # 재생성 도중 기록 발생 → 저장하지 않음 (다음 조회 때 재시도)
+    return projection
+
+
+def load_projection(memory: BaseChatMessageHistory) -> SessionProjection:
+    """세션 projection 조회 (없으면 메시지 로그에서 재생성)"""
+    projection = _in_memory(memory)
+    if projection is not None:
+        with _memory_lock:
+            return projection.copy()
+
+    stored = _stored(memory)
+    if stored is not None:
+        return stored
+
+    if not isinstance(memory, RedisChatMessageHistory):
+        return SessionProjection.from_messages(memory.messages)
+
+    key = projection_key(memory)
+    with _timed("projection_read", memory):
+        loaded = SessionProjection.from_hash(memory.redis_client.hgetall(key))
+    return loaded if loaded is not None else _redis_rebuild(memory, key)
+
+
+def count_followups(memory: BaseChatMessageHistory, parent_qid: str) -> int:
+    """부모 질문에 대해 이미 기록된 꼬리질문 수"""
+    projection = _in_memory(memory)
+    if projection is not None:
+        with _memory_lock:
+            return projection.followups.get(parent_qid, 0)
+
+    if not isinstance(memory, RedisChatMessageHistory):
+        projection = _stored(memory) or SessionProjection.from_messages(memory.messages)
+        return projection.followups.get(parent_qid, 0)
+
+    key = projection_key(memory)
+    with _timed("projection_read", memory):
+        version, count = memory.redis_client.hmget(key, "version", f"fu:{parent_qid}")
+    if _str(version) == PROJECTION_VERSION:
+        return int(_str(count) or 0)
+    return _redis_rebuild(memory, key).followups.get(parent_qid, 0)
@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+from dotenv import load_dotenv
+
+from app.utils.metrics import memory_store_evictions
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SWEEP_INTERVAL_SEC = 10.0  # 만료 세션 전체 검사 주기 (조회·기록 시 함께 수행)
+
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    expires_at: float
+    size: int = 0
+
+
+class SessionStore(Generic[T]):
+    """
+    Redis 미사용 시 세션 기록을 담는 프로세스 내 저장소.
+
+    - TTL: 기록·refresh 시 만료 시각을 연장 (Redis 키 TTL과 같은 의미, 조회는 연장 안 함)
+    - LRU: 세션 수(max_sessions)·전체 크기(max_bytes) 상한을 넘으면 가장 오래 쓰지 않은
+      세션부터 제거
+    - 크기는 기록 객체가 resize()로 알려 주는 추정치 (메시지 content 기준)
+    - 모든 상태 변경은 단일 Lock 아래에서 수행 (threadpool 동시 접근)
+    - clock: 단조 시계 (테스트에서 교체)
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_bytes: int = 0,
+        ttl_sec: int = 900,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes  # 0이면 크기 상한 없음
+        self.ttl_sec = ttl_sec
+        self.clock = clock
+        self._entries: "OrderedDict[str, _Entry[T]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    # === 내부 (Lock 보유 상태에서 호출) ===
+
+    def _remove(self, session_id: str, reason: str) -> None:
+        entry = self._entries.pop(session_id)
+        self._bytes -= entry.size
+        memory_store_evictions.labels(reason=reason).inc()
+
+    def _sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + SWEEP_INTERVAL_SEC
+        for session_id, entry in list(self._entries.items()):
+            if entry.expires_at <= now:
+                self._remove(session_id, "ttl")
+
+    def _enforce_limits(self, keep: str) -> None:
+        """상한 초과 시 LRU 순으로 제거 (방금 사용한 keep 세션은 마지막까지 유지)"""
+        while len(self._entries) > self.max_sessions:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._remove(oldest, "lru")
+        while self.max_bytes and self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                logger.warning(
+                    f"[{keep}] In-memory session exceeds store limit"
+                    f" ({self._bytes} > {self.max_bytes} bytes)"
+                )
+                break
+            self._remove(oldest, "bytes")
+
+    def _live(self, session_id: str, value: Any, now: float) -> Optional[_Entry[T]]:
+        entry = self._entries.get(session_id)
+        if entry is None or entry.value is not value:
+            return None  # 이미 제거된 세션의 기록 객체
+        if entry.expires_at <= now:
+            self._remove(session_id, "ttl")
+            return None
+        return entry
+
+    # === 공개 API ===
+
+    def get_or_create(self, session_id: str, factory: Callable[[], T]) -> T:
+        now = self.clock()
+        with self._lock:
+            self._sweep(now)
+            entry = self._entries.get(session_id)
+            if entry is not None and entry.expires_at <= now:
+                self._remove(session_id, "ttl")
+                entry = None
+            if entry is None:
+                entry = _Entry(factory(), now + self.ttl_sec)
+                self._entries[session_id] = entry
+            self._entries.move_to_end(session_id)
+            self._enforce_limits(keep=session_id)
+            return entry.value
+
+    def resize(self, session_id: str, value: T, size: int) -> None:
+        """기록 객체의 크기 변경 알림 (기록 시점 → TTL 연장)"""
+        now = self.clock()
+        with self._lock:
+            entry = self._live(session_id, value, now)
+            if entry is None:
+                return
+            self._bytes += size - entry.size
+            entry.size = size
+            entry.expires_at = now + self.ttl_sec
+            self._entries.move_to_end(session_id)
+            self._enforce_limits(keep=session_id)
+
+    def refresh(self, session_id: str, value: T, ttl_sec: Optional[int] = None) -> bool:
+        """세션 만료 시각 연장 (/refresh-ttl), 저장소에 없으면 False"""
+        now = self.clock()
+        with self._lock:
+            entry = self._live(session_id, value, now)
+            if entry is None:
+                return False
+            entry.expires_at = now + (ttl_sec or self.ttl_sec)
+            self._entries.move_to_end(session_id)
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._entries),
+                "bytes": self._bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def create_session_store(ttl_sec: int) -> SessionStore:
+    return SessionStore(
+        max_sessions=int(os.getenv("MEMORY_STORE_MAX_SESSIONS", "1000")),
+        max_bytes=int(os.getenv("MEMORY_STORE_MAX_BYTES", str(256 * 1024 * 1024))),
+        ttl_sec=ttl_sec,
+    )
@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+import redis
+import redis.asyncio as aioredis
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# 토큰이 일치할 때만 락 해제 (다른 워커가 재획득한 락을 지우지 않도록)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def request_key(session_id: str, operation: str, req: BaseModel) -> str:
+    """세션 ID + 작업명 + 요청 본문 해시로 coalescing 키 생성"""
+    digest = hashlib.sha256(req.model_dump_json().encode("utf-8")).hexdigest()
+    return f"{session_id}:{operation}:{digest}"
+
+
+class SingleFlight:
+    """
+    동일 키의 동시 요청을 하나의 실행으로 합치는 single-flight 레이어.
+
+    - 프로세스 내: 진행 중인 Future를 공유하여 후속 요청은 결과만 기다림
+    - 워커 간: Redis `SET NX` 락을 잡은 워커만 실행하고, 결과를 짧은 TTL로
+      Redis에 게시하면 나머지 워커는 폴링으로 결과를 가져감
+    - 리더가 실패하거나 락이 만료되면 대기 중인 워커가 직접 실행 (fallback)
+    - Redis 클라이언트는 lifespan에서 bind()로 주입 (앱 공용 커넥션 풀 사용)
+    """
+
+    def __init__(
+        self,
+        lock_ttl_sec: int = 60,
+        result_ttl_sec: int = 10,
+        poll_interval_sec: float = 0.1,
+        key_prefix: str = "singleflight:",
+    ):
+        self.lock_ttl_sec = lock_ttl_sec
+        self.result_ttl_sec = result_ttl_sec
+        self.poll_interval_sec = poll_interval_sec
+        self.key_prefix = key_prefix
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._redis: Optional[aioredis.Redis] = None
+        self._counters: Dict[str, int] = {
+            "leaders": 0,
+            "local_followers": 0,
+            "remote_followers": 0,
+            "fallbacks": 0,
+        }
+
+    def bind(self, client: Optional[aioredis.Redis]) -> None:
+        """워커 간 coalescing에 쓸 Redis 클라이언트 설정 (None이면 프로세스 내만)"""
+        self._redis = client
+
+    async def do(
+        self, key: str, fn: Callable[[], Awaitable[T]], model: Type[T]
+    ) -> Tuple[T, bool]:
+        """
+        key에 대해 fn을 한 번만 실행하고 (결과, 공유 여부)를 반환.
+        공유 여부가 True면 다른 요청이 실행한 결과를 받은 것입니다.
+        """
+        existing = self._inflight.get(key)
+        if existing is not None:
+            self._counters["local_followers"] += 1
+            try:
+                return await asyncio.shield(existing), True
+            except asyncio.CancelledError:
+                if not existing.cancelled():
+                    raise
+                # 리더 요청이 취소된 경우 → 이 요청이 다시 실행
+                return await self.do(key, fn, model)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, shared = await self._do_distributed(key, fn, model)
+            future.set_result(result)
+            return result, shared
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _do_distributed(
+        self, key: str, fn: Callable[[], Awaitable[T]], model: Type[T]
+    ) -> Tuple[T, bool]:
+        client = self._redis
+        if client is None:
+            self._counters["leaders"] += 1
+            return await fn(), False
+
+        lock_key = f"{self.key_prefix}lock:{key}"
+        result_key = f"{self.key_prefix}result:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            cached = await client.get(result_key)
+            if cached:
+                self._counters["remote_followers"] += 1
+                return model.model_validate_json(cached), True
+            acquired = await client.set(lock_key, token, nx=True, ex=self.lock_ttl_sec)
+        except redis.RedisError as e:
+            logger.warning(f"SingleFlight Redis unavailable, running locally: {e}")
+            self._counters["leaders"] += 1
+            return await fn(), False
+
+        if acquired:
+            return await self._run_as_leader(client, lock_key, result_key, token, fn)
+
+        # 다른 워커가 실행 중 → 결과 게시 또는 락 해제까지 대기
+        deadline = time.monotonic() + self.lock_ttl_sec
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval_sec)
+            try:
+                cached = await client.get(result_key)
+                if cached:
+                    self._counters["remote_followers"] += 1
+                    return model.model_validate_json(cached), True
+                if not await client.exists(lock_key):
+                    break
+            except redis.RedisError as e:
+                logger.warning(f"SingleFlight Redis poll failed: {e}")
+                break
+
+        self._counters["fallbacks"] += 1
+        logger.info(f"SingleFlight leader vanished, running locally: {key}")
+        return await fn(), False
+
+    async def _run_as_leader(
+        self,
+        client: aioredis.Redis,
+        lock_key: str,
+        result_key: str,
+        token: str,
+        fn: Callable[[], Awaitable[T]],
+    ) -> Tuple[T, bool]:
+        self._counters["leaders"] += 1
+        try:
+            result = await fn()
+            try:
+                await client.set(
+                    result_key, result.model_dump_json(), ex=self.result_ttl_sec
+                )
+            except redis.RedisError as e:
+                logger.warning(f"SingleFlight result publish failed: {e}")
+            return result, False
+        finally:
+            try:
+                await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)  # type: ignore[misc]
+            except redis.RedisError as e:
+                logger.warning(f"SingleFlight lock release failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counters, "inflight": len(self._inflight)}
+
+
+singleflight = SingleFlight(
+    lock_ttl_sec=int(os.getenv("SINGLEFLIGHT_LOCK_TTL_SEC", "60")),
+    result_ttl_sec=int(os.getenv("SINGLEFLIGHT_RESULT_TTL_SEC", "10")),
+)
@@ -0,0 +1,132 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    projection TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    event_type TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id);
+CREATE INDEX IF NOT EXISTS messages_session_event
+    ON messages (session_id, event_type, id);
+"""
+
+
+class SQLiteMemoryDB:
+    """
+    세션 기록용 로컬 SQLite DB (WAL 모드).
+
+    - 같은 파일을 여러 uvicorn 워커가 함께 사용 (프로세스 간 잠금은 SQLite가 처리)
+    - 연결은 스레드마다 하나 (sqlite3 연결은 스레드 간 공유 불가)
+    - 쓰기는 BEGIN IMMEDIATE로 시작해 읽기-수정-쓰기(projection 갱신)를 직렬화
+    - 만료 세션은 sweep_interval_sec마다 한 번씩 정리
+    """
+
+    def __init__(
+        self,
+        path: str,
+        busy_timeout_sec: float = 5.0,
+        sweep_interval_sec: float = 60.0,
+    ):
+        self.path = path
+        self.busy_timeout_sec = busy_timeout_sec
+        self.sweep_interval_sec = sweep_interval_sec
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._next_sweep = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_sec,
+            isolation_level=None,  # 트랜잭션은 직접 BEGIN
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE → 다른 쓰기는 busy_timeout까지 대기)"""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def sweep(self, force: bool = False) -> int:
+        """만료 세션과 메시지 삭제, 삭제한 세션 수 반환"""
+        now = time.time()
+        if not force and now < self._next_sweep:
+            return 0
+        self._next_sweep = now + self.sweep_interval_sec
+        with self.write() as conn:
+            conn.execute(
+                "DELETE FROM messages WHERE session_id IN"
+                " (SELECT session_id FROM sessions WHERE expires_at <= ?)",
+                (now,),
+            )
+            removed = conn.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (now,)
+            ).rowcount
+        if removed:
+            logger.info(f"SQLite session memory: {removed} expired sessions removed")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        sessions, messages = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM sessions), (SELECT COUNT(*) FROM messages)"
+        ).fetchone()
+        return {"sessions": sessions, "messages": messages}
+
+
+_db: Optional[SQLiteMemoryDB] = None
+_db_lock = threading.Lock()
+
+
+def get_sqlite_memory_db() -> SQLiteMemoryDB:
+    """프로세스 공용 DB 핸들 (SQLITE_MEMORY_PATH, 첫 사용 시 생성)"""
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = SQLiteMemoryDB(
+                path=os.getenv("SQLITE_MEMORY_PATH", "/tmp/aiew-session-memory.db"),
+                busy_timeout_sec=float(os.getenv("SQLITE_BUSY_TIMEOUT_SEC", "5")),
+                sweep_interval_sec=float(os.getenv("SQLITE_SWEEP_INTERVAL_SEC", "60")),
+            )
+        return _db
@@ -0,0 +1,65 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    대기·실행 중인 작업 수를 직접 세는 스레드풀.
+    asyncio.to_thread가 쓰는 루프 기본 실행기로 설치해 /metrics에 노출합니다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = ""):
+        # ThreadPoolExecutor 기본값과 동일
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        super().__init__(self.max_workers, thread_name_prefix)
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._busy = 0
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        def run() -> Any:
+            with self._stats_lock:
+                self._queued -= 1
+                self._busy += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._stats_lock:
+                    self._busy -= 1
+
+        def on_done(future: Future) -> None:
+            if future.cancelled():  # 실행 전에 취소됨 → run이 호출되지 않음
+                with self._stats_lock:
+                    self._queued -= 1
+
+        with self._stats_lock:
+            self._queued += 1
+        try:
+            future = super().submit(run)
+        except BaseException:
+            with self._stats_lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(on_done)
+        return future
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"busy": self._busy, "queued": self._queued, "max": self.max_workers}
+
+
+_default_executor: Optional[InstrumentedThreadPoolExecutor] = None
+
+
+def install_default_executor(loop: asyncio.AbstractEventLoop) -> None:
+    """루프 기본 실행기를 계측 스레드풀로 교체 (lifespan에서 1회)"""
+    global _default_executor
+    _default_executor = InstrumentedThreadPoolExecutor(thread_name_prefix="asyncio")
+    loop.set_default_executor(_default_executor)
+
+
+def default_executor_stats() -> Dict[str, int]:
+    return _default_executor.stats() if _default_executor is not None else {}
@@ -0,0 +1,118 @@
+import math
+import os
+import re
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 필드별 토큰 예산 (0이면 압축만 하고 자르지 않음)
+FIELD_BUDGETS: Dict[str, int] = {
+    "resume_text": int(os.getenv("PROMPT_BUDGET_RESUME_TOKENS", "3000")),
+    "portfolio_text": int(os.getenv("PROMPT_BUDGET_PORTFOLIO_TOKENS", "3000")),
+    "core_values": int(os.getenv("PROMPT_BUDGET_CORE_VALUES_TOKENS", "300")),
+}
+
+TRUNCATION_MARK = " …(이하 생략)"
+
+# 이 길이 미만의 줄은 중복이어도 유지 ("성과:" 같은 반복 소제목 보존)
+_DEDUP_MIN_CHARS = 15
+
+_INVISIBLE = re.compile(r"[\u200b-\u200d\u2060\ufeff]")
+_INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0\u3000]+")
+_BOILERPLATE = [
+    re.compile(r"^[-–—=_*·•~|\u2500-\u257f]{3,}$"),  # 구분선
+    re.compile(r"^-?\s*\d{1,3}\s*-?$"),  # 쪽 번호 (3, - 3 -)
+    re.compile(r"^\d{1,3}\s*/\s*\d{1,3}$"),  # 3 / 10
+    re.compile(r"^(page|p\.)\s*\d+(\s*(/|of)\s*\d+)?$", re.IGNORECASE),
+    re.compile(r"^(copyright|ⓒ|©).*$", re.IGNORECASE),
+    re.compile(r"^all rights reserved\.?$", re.IGNORECASE),
+]
+
+
+def _char_tokens(ch: str) -> float:
+    return 0.25 if ord(ch) < 128 else 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Llama 3 계열 토크나이저 근사치 (ASCII 약 4자당 1토큰, 한글 등은 1자당 1토큰).
+    토크나이저 의존성 없이 예산 판단과 로그용으로만 사용합니다.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars))
+
+
+def compress_text(text: str) -> str:
+    """
+    결정적 압축: 공백 정리 → 상용구(구분선·쪽 번호·저작권 문구) 제거 →
+    반복되는 줄(PDF 머리글/바닥글 등) 제거 → 연속 빈 줄 축약.
+    """
+    text = _INVISIBLE.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+
+    out: List[str] = []
+    seen = set()
+    for raw in text.split("\n"):
+        line = _INLINE_SPACE.sub(" ", raw).strip()
+        if not line:
+            if out and out[-1] != "":
+                out.append("")
+            continue
+        if any(p.match(line) for p in _BOILERPLATE):
+            continue
+        if len(line) >= _DEDUP_MIN_CHARS:
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(line)
+
+    return "\n".join(out).strip()
+
+
+def truncate_to_budget(text: str, budget: int) -> Tuple[str, bool]:
+    """예산을 넘으면 앞부분만 남기되 줄/문장 경계에서 자름"""
+    if budget <= 0 or estimate_tokens(text) <= budget:
+        return text, False
+
+    used = 0.0
+    cut = 0
+    for i, ch in enumerate(text):
+        used += _char_tokens(ch)
+        if used > budget:
+            break
+        cut = i + 1
+
+    head = text[:cut]
+    boundary = max(head.rfind("\n"), head.rfind(". "), head.rfind("다. "))
+    if boundary <= cut // 2:
+        boundary = head.rfind(" ")  # 문장 경계가 없으면 단어 경계
+    if boundary > cut // 2:
+        head = head[: boundary + 1]
+    return head.rstrip() + TRUNCATION_MARK, True
+
+
+def apply_field_budgets(
+    fields: Dict[str, str], budgets: Dict[str, int] = FIELD_BUDGETS
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, int]]]:
+    """
+    budgets에 있는 필드만 압축·예산 적용하여 (변환된 필드, 필드별 토큰 리포트) 반환.
+    리포트: {"before": 원본 토큰, "after": 적용 후 토큰, "truncated": 0|1}
+    """
+    out = dict(fields)
+    report: Dict[str, Dict[str, int]] = {}
+    for name, budget in budgets.items():
+        value = fields.get(name)
+        if not isinstance(value, str):
+            continue
+        compressed, truncated = truncate_to_budget(compress_text(value), budget)
+        out[name] = compressed
+        report[name] = {
+            "before": estimate_tokens(value),
+            "after": estimate_tokens(compressed),
+            "truncated": int(truncated),
+        }
+    return out, report
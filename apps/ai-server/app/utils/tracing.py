@@ -0,0 +1,311 @@
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    TypeVar,
+)
+from uuid import UUID
+
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# W3C Trace Context (traceparent) 헤더 추출·주입
+_propagator = TraceContextTextMapPropagator()
+
+
+def _clean(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """OTel 속성은 원시 타입만 허용 → None 제외, 그 외는 문자열로"""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+def record_error(span: Span, error: BaseException) -> None:
+    span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, type(error).__name__))
+
+
+class Tracer:
+    """
+    OpenTelemetry SDK 위의 얇은 래퍼.
+
+    - 루트 span은 요청마다 미들웨어에서 생성 (core-api traceparent 헤더가 있으면
+      같은 trace로 이어지고 sampled 플래그를 따름, 없으면 sample_ratio로 결정)
+    - 하위 span은 현재 span이 기록 중일 때만 생성하며, 아니면 거의 비용 없음
+    - 비활성화 시에도 루트 span(비기록)은 만들어 traceparent를 전달
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_ratio: float = 0.1,
+        processor: Optional[SpanProcessor] = None,
+        exporter_name: str = "",
+    ):
+        self.enabled = enabled and processor is not None
+        self.sample_ratio = sample_ratio
+        self.exporter_name = exporter_name if self.enabled else ""
+        sampler = (
+            ParentBased(TraceIdRatioBased(sample_ratio)) if self.enabled else ALWAYS_OFF
+        )
+        self.provider = TracerProvider(
+            sampler=sampler,
+            resource=Resource.create({"service.name": "aiew-ai-server"}),
+        )
+        if self.enabled:
+            self.provider.add_span_processor(processor)  # type: ignore[arg-type]
+        self._tracer = self.provider.get_tracer(__name__)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        span = trace.get_current_span()
+        return span if span.is_recording() else None
+
+    def start_span(self, name: str, **attributes: Any) -> Optional[Span]:
+        """현재 span의 자식 span 시작 (현재 span으로 설정하지 않음). 기록 대상이 아니면 None"""
+        if self.current_span() is None:
+            return None
+        return self._tracer.start_span(name, attributes=_clean(attributes))
+
+    @contextmanager
+    def start_trace(
+        self,
+        name: str,
+        headers: Optional[Mapping[str, str]] = None,
+        **attributes: Any,
+    ) -> Iterator[Span]:
+        """요청 단위 루트 span (headers의 traceparent를 이어받음)"""
+        context = _propagator.extract(headers or {})
+        with self._tracer.start_as_current_span(
+            name, context=context, kind=SpanKind.SERVER, attributes=_clean(attributes)
+        ) as span:
+            yield span
+
+    @staticmethod
+    def inject(carrier: MutableMapping[str, str]) -> None:
+        """현재 span의 traceparent를 carrier(응답 헤더 등)에 기록"""
+        _propagator.inject(carrier)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        if self.current_span() is None:
+            yield None
+            return
+        with self._tracer.start_as_current_span(
+            name, attributes=_clean(attributes)
+        ) as span:
+            yield span
+
+    def traced(self, name: Optional[str] = None) -> Callable[[F], F]:
+        """함수/코루틴 실행을 span으로 감싸는 데코레이터"""
+
+        def decorator(fn: F) -> F:
+            span_name = name or fn.__qualname__
+
+            if inspect.isasyncgenfunction(fn):
+                # 제너레이터는 소비 측 컨텍스트에서 재개되므로 현재 span으로
+                # 설정하지 않고 시작·종료 시각만 기록
+                @functools.wraps(fn)
+                async def agen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    span = self.start_span(span_name)
+                    try:
+                        async for item in fn(*args, **kwargs):
+                            yield item
+                    except BaseException as e:
+                        if span is not None:
+                            record_error(span, e)
+                        raise
+                    finally:
+                        if span is not None:
+                            span.end()
+
+                return agen_wrapper  # type: ignore[return-value]
+
+            if asyncio.iscoroutinefunction(fn):
+
+                @functools.wraps(fn)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with self.span(span_name):
+                        return await fn(*args, **kwargs)
+
+                return async_wrapper  # type: ignore[return-value]
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(span_name):
+                    return fn(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    def shutdown(self) -> None:
+        """남은 span을 내보내고 종료 (lifespan 종료 시)"""
+        self.provider.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_ratio": self.sample_ratio,
+            "exporter": self.exporter_name,
+        }
+
+
+class TracingCallback(BaseCallbackHandler):
+    """
+    LangChain 실행 단계를 span으로 기록: 프롬프트 렌더링, LLM 호출, 출력 파싱.
+    span의 부모는 체인을 호출한 시점의 현재 span입니다.
+    """
+
+    run_inline = True
+
+    # on_chain_start의 name → span 이름
+    _CHAIN_STEPS = {
+        "ChatPromptTemplate": "llm.prompt_render",
+        "json_repair": "llm.output_parse",
+        "JsonOutputParser": "llm.output_parse",
+    }
+
+    def __init__(self, tracer: Tracer) -> None:
+        self.tracer = tracer
+        self._spans: Dict[UUID, Span] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, name: str, **attributes: Any) -> None:
+        span = self.tracer.start_span(name, **attributes)
+        if span is not None:
+            with self._lock:
+                self._spans[run_id] = span
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        if error is not None:
+            record_error(span, error)
+        span.end()
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        step = self._CHAIN_STEPS.get(kwargs.get("name") or "")
+        if step:
+            self._start(run_id, step, chain=(metadata or {}).get("chain", ""))
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        self._start(
+            run_id,
+            "llm.call",
+            chain=metadata.get("chain", ""),
+            model=metadata.get("ls_model_name", ""),
+        )
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            span = self._spans.get(run_id)
+        if span is not None:
+            usage = (getattr(response, "llm_output", None) or {}).get("token_usage")
+            if usage and usage.get("total_tokens") is not None:
+                span.set_attribute("llm.total_tokens", usage["total_tokens"])
+        self._end(run_id)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+
+def _build_exporter(name: str) -> Optional[SpanExporter]:
+    if name == "otlp":
+        # 엔드포인트·헤더는 표준 OTEL_EXPORTER_OTLP_* 환경 변수로 설정
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+    if name == "console":
+        return ConsoleSpanExporter()
+    return None
+
+
+def _build_tracer() -> Tracer:
+    enabled = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    exporter_name = os.getenv("TRACING_EXPORTER", "otlp").lower()
+    exporter = _build_exporter(exporter_name) if enabled else None
+    if enabled and exporter is None:
+        logger.warning(f"Tracing disabled: unknown TRACING_EXPORTER={exporter_name}")
+    processor = (
+        BatchSpanProcessor(
+            exporter,
+            schedule_delay_millis=int(
+                float(os.getenv("TRACING_EXPORT_INTERVAL_SEC", "2")) * 1000
+            ),
+        )
+        if exporter is not None
+        else None
+    )
+    return Tracer(
+        enabled=enabled,
+        sample_ratio=float(os.getenv("TRACING_SAMPLE_RATIO", "0.1")),
+        processor=processor,
+        exporter_name=exporter_name,
+    )
+
+
+tracer = _build_tracer()
+tracing_callback = TracingCallback(tracer)
+traced = tracer.traced
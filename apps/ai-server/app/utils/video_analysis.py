@@ -1,6 +1,10 @@
+import time
+
 import cv2
 from fer import FER
 
+from app.utils.metrics import video_analysis_duration, video_frames
+
 # 모델 초기화 (모듈 import 시 한 번만)
 emotion_detector = FER(mtcnn=True)
 
@@ -21,6 +25,8 @@ def video_analysis(
 
     results = []
     frame_idx = 0
+    analyzed = 0
+    start = time.perf_counter()
 
     fer_labels = ["happy", "sad", "neutral", "angry", "fear", "surprise"]
 
@@ -32,6 +38,7 @@ def video_analysis(
         if frame_idx % sample_rate != 0:
             continue
 
+        analyzed += 1
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         time_sec = frame_idx / fps
 
@@ -44,4 +51,7 @@ def video_analysis(
             results.append(result)
 
     cap.release()
+    video_frames.labels(stage="decoded").inc(frame_idx)
+    video_frames.labels(stage="analyzed").inc(analyzed)
+    video_analysis_duration.observe(time.perf_counter() - start)
     return results
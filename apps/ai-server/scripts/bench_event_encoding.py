@@ -0,0 +1,148 @@
+"""
+세션 이벤트 인코딩 벤치마크: 레거시 JSON(v1) vs 짧은 키(v3, 압축 선택)
+
+실행 (apps/ai-server 에서):
+    python -m scripts.bench_event_encoding [--steps 15] [--repeat 200]
+
+한 세션 분량의 이벤트(QUESTION_ASKED / ANSWER_RECEIVED / ANSWER_EVALUATED)를
+만들어 저장 크기(UTF-8 bytes)와 인코딩·디코딩 시간을 비교합니다.
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.utils import event_codec
+from app.utils.event_codec import decode_event, encode_event, encode_legacy
+
+Event = Tuple[str, Dict[str, Any]]
+
+SENTENCES = (
+    "지원자는 분산 캐시의 일관성 문제를 write-through 전략과 비교해 설명했습니다.",
+    "TTL 기반 무효화의 장단점을 장애 사례 {n}건과 함께 제시했습니다.",
+    "트랜잭션 격리 수준에 따른 팬텀 리드 발생 조건을 정확히 짚었습니다.",
+    "Kafka 파티션 {n}개 환경에서 순서 보장 방법에 대한 근거가 부족했습니다.",
+    "인덱스 설계 시 카디널리티와 쿼리 패턴을 함께 고려한 점이 좋았습니다.",
+    "응답 시간 {n}ms 개선 경험을 수치와 함께 구체적으로 설명했습니다.",
+    "장애 대응 과정에서 본인의 역할이 명확히 드러나지 않았습니다.",
+    "테스트 전략을 단위·통합·부하 테스트로 나누어 체계적으로 답변했습니다.",
+)
+
+
+def _text(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        rng.choice(SENTENCES).format(n=rng.randint(2, 500))
+        for _ in range(rng.randint(1, sentences))
+    )
+
+
+def build_session(steps: int, seed: int = 0) -> List[Event]:
+    rng = random.Random(seed)
+    events: List[Event] = []
+    for i in range(1, steps + 1):
+        qid = f"q{i}"
+        events.append(
+            (
+                "QUESTION_ASKED",
+                {
+                    "aiQuestionId": qid,
+                    "question": _text(rng, 2),
+                    "type": "technical",
+                    "criteria": ["정확성", "구체성", "논리성"],
+                    "skills": ["Redis", "Spring", "Kafka"],
+                    "rationale": _text(rng, 2),
+                    "estimatedAnswerTimeSec": 120,
+                },
+            )
+        )
+        events.append(
+            (
+                "ANSWER_RECEIVED",
+                {
+                    "aiQuestionId": qid,
+                    "answer": _text(rng, 12),
+                    "answerDurationSec": rng.randint(30, 180),
+                },
+            )
+        )
+        events.append(
+            (
+                "ANSWER_EVALUATED",
+                {
+                    "aiQuestionId": qid,
+                    "type": "technical",
+                    "answerDurationSec": rng.randint(30, 180),
+                    "overallScore": rng.randint(40, 95),
+                    "strengths": [_text(rng, 1) for _ in range(3)],
+                    "improvements": [_text(rng, 1) for _ in range(3)],
+                    "redFlags": [],
+                    "criterionScores": [
+                        {"name": c, "score": rng.randint(1, 5), "reason": _text(rng, 2)}
+                        for c in ("정확성", "구체성", "논리성")
+                    ],
+                    "feedback": _text(rng, 200),  # 긴 피드백 → 레거시 8000자 절단 대상
+                    "tailRationale": _text(rng, 1),
+                    "tailDecision": "create",
+                },
+            )
+        )
+    return events
+
+
+def legacy_encode(event_type: str, data: Dict[str, Any]) -> str:
+    """변경 전 MemoryLogger._encode (8000자 절단 포함)"""
+    return encode_legacy(event_type, data)[:8000]
+
+
+def legacy_decode(content: str) -> Any:
+    try:
+        event = json.loads(content)
+    except json.JSONDecodeError:
+        return None
+    return event.get("type"), event.get("data")
+
+
+def _time_us(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(steps: int, repeat: int) -> None:
+    events = build_session(steps)
+    # 이름 → (인코더, 디코더, EVENT_COMPRESS_MIN_BYTES)
+    formats = {
+        "legacy-json": (legacy_encode, legacy_decode, 0),
+        "v3-compact": (encode_event, decode_event, 0),
+        "v3-zlib": (encode_event, decode_event, 2048),
+    }
+    print(f"session: {steps} steps, {len(events)} events\n")
+    print(
+        f"{'format':<12} {'bytes':>9} {'ratio':>6} {'encode_us':>10}"
+        f" {'decode_us':>10} {'lost':>5}"
+    )
+    baseline = None
+    for name, (encode, decode, compress_min_bytes) in formats.items():
+        event_codec.EVENT_COMPRESS_MIN_BYTES = compress_min_bytes
+        encoded = [encode(t, d) for t, d in events]
+        size = sum(len(s.encode()) for s in encoded)
+        baseline = baseline or size
+        # 원본과 다르게 복원되는 이벤트 수 (절단으로 인한 손상 포함)
+        lost = sum(decode(s) != (t, d) for s, (t, d) in zip(encoded, events))
+        enc_us = _time_us(lambda: [encode(t, d) for t, d in events], repeat)
+        dec_us = _time_us(lambda: [decode(s) for s in encoded], repeat)
+        print(
+            f"{name:<12} {size:>9} {size / baseline:>6.2f} {enc_us:>10.1f}"
+            f" {dec_us:>10.1f} {lost:>5}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.steps, args.repeat)
@@ -0,0 +1,113 @@
+"""
+API 응답 직렬화 벤치마크: FastAPI 기본 JSONResponse vs FastJSONResponse
+
+실행 (apps/ai-server 에서):
+    python -m scripts.bench_json_responses [--repeat 200]
+
+가장 큰 응답 유형(감정 분석 프레임 목록, 메모리 덤프, 질문 목록)에 대해
+FastAPI와 같은 경로(model_dump(mode="json") → 응답 클래스 render)의 시간을 재고,
+두 응답 클래스의 출력 바이트가 같은지 확인합니다.
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.models.emotion import EmotionGroupResult, EmotionGroupScore
+from app.models.memory import MemoryDump, Message
+from app.models.question import QuestionResponse
+from app.utils.event_codec import encode_legacy
+from app.utils.fast_json import JSON_BACKEND, FastJSONResponse
+from scripts.bench_event_encoding import build_session
+
+LABELS = ("happy", "sad", "neutral", "angry", "fear", "surprise")
+
+
+def emotion_result(frames: int) -> EmotionGroupResult:
+    rng = random.Random(0)
+    return EmotionGroupResult(
+        file_name="interview.mp4",
+        results=[
+            EmotionGroupScore(
+                frame=i * 5,
+                time=round(i * 5 / 30, 2),
+                **{label: round(rng.random(), 3) for label in LABELS},
+            )
+            for i in range(frames)
+        ],
+    )
+
+
+def memory_dump(steps: int) -> MemoryDump:
+    messages = [
+        Message(role="ai", content=encode_legacy(t, d)) for t, d in build_session(steps)
+    ]
+    return MemoryDump(
+        session_id="bench",
+        history_str="\n".join(f"Ai: {m.content}" for m in messages),
+        messages=messages,
+    )
+
+
+class QuestionList(BaseModel):
+    questions: list[QuestionResponse]
+
+
+def question_list() -> QuestionList:
+    rng = random.Random(0)
+    return QuestionList(
+        questions=[
+            QuestionResponse(
+                main_question_id=f"q{i}",
+                category="technical",
+                criteria=["정확성", "구체성", "논리성"],
+                skills=["React", "TypeScript"],
+                rationale="포트폴리오의 성능 개선 경험을 검증하기 위한 질문입니다." * 3,
+                question="LCP를 2.4초에서 1.7초로 줄인 과정을 설명해 주세요." * 2,
+                estimated_answer_time_sec=rng.randint(60, 300),
+            )
+            for i in range(1, 6)
+        ]
+    )
+
+
+def _time_us(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(repeat: int) -> None:
+    payloads: Dict[str, BaseModel] = {
+        "emotion (3000 frames)": emotion_result(3000),
+        "memory dump (15 steps)": memory_dump(15),
+        "questions (5)": question_list(),
+    }
+    print(f"fast JSON backend: {JSON_BACKEND}\n")
+    print(
+        f"{'response':<24} {'bytes':>8} {'dump_us':>9} {'json_us':>9}"
+        f" {'fast_us':>9} {'speedup':>8} {'same':>5}"
+    )
+    for name, model in payloads.items():
+        content = model.model_dump(mode="json")
+        baseline = JSONResponse(content).body
+        fast = FastJSONResponse(content).body
+        dump_us = _time_us(lambda: model.model_dump(mode="json"), repeat)
+        json_us = _time_us(lambda: JSONResponse(content), repeat)
+        fast_us = _time_us(lambda: FastJSONResponse(content), repeat)
+        print(
+            f"{name:<24} {len(baseline):>8} {dump_us:>9.1f} {json_us:>9.1f}"
+            f" {fast_us:>9.1f} {json_us / fast_us:>7.1f}x {str(baseline == fast):>5}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.repeat)
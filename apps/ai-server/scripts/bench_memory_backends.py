@@ -0,0 +1,102 @@
+"""
+세션 메모리 백엔드 처리량 비교: memory vs sqlite vs redis
+
+실행 (apps/ai-server 에서):
+    python -m scripts.bench_memory_backends [--threads 8] [--sessions 64] [--steps 5]
+    REDIS_URL=redis://localhost:6379 python -m scripts.bench_memory_backends
+
+세션마다 steps개 스텝(QUESTION_ASKED / ANSWER_RECEIVED / ANSWER_EVALUATED)을
+MemoryLogger로 기록한 뒤 projection 조회·메시지 전체 조회를 수행하고,
+백엔드별 초당 처리 건수를 출력합니다. REDIS_URL이 없으면 redis는 건너뜁니다.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from app.services.memory_logger import MemoryLogger, MemoryManager
+from app.utils import sqlite_memory
+from app.utils.redis_pool import close_redis_client, create_redis_client
+from app.utils.session_projection import load_projection
+from scripts.bench_event_encoding import build_session
+
+
+def _run_parallel(
+    threads: int, session_ids: List[str], fn: Callable[[str], Any]
+) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(fn, session_ids))
+    return time.perf_counter() - start
+
+
+def run_backend(
+    backend: str, threads: int, sessions: int, steps: int, redis_client: Any = None
+) -> Optional[dict]:
+    os.environ["MEMORY_BACKEND"] = backend
+    events = build_session(steps)
+    prefix = f"bench-{backend}-{time.time_ns()}"
+    session_ids = [f"{prefix}-{i}" for i in range(sessions)]
+
+    def write(session_id: str) -> None:
+        logger = MemoryLogger(MemoryManager.get_memory(session_id, redis_client))
+        for event_type, data in events:
+            logger._log(event_type, data)
+
+    def read_projection(session_id: str) -> None:
+        load_projection(MemoryManager.get_memory(session_id, redis_client))
+
+    def read_messages(session_id: str) -> None:
+        assert len(MemoryManager.get_memory(session_id, redis_client).messages) == len(
+            events
+        )
+
+    write_sec = _run_parallel(threads, session_ids, write)
+    projection_sec = _run_parallel(threads, session_ids, read_projection)
+    messages_sec = _run_parallel(threads, session_ids, read_messages)
+    for session_id in session_ids:
+        MemoryManager.get_memory(session_id, redis_client).clear()
+
+    return {
+        "writes/s": sessions * len(events) / write_sec,
+        "projection/s": sessions / projection_sec,
+        "messages/s": sessions / messages_sec,
+    }
+
+
+def run(threads: int, sessions: int, steps: int) -> None:
+    redis_url = os.getenv("REDIS_URL", "")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SQLITE_MEMORY_PATH"] = os.path.join(tmp, "bench.db")
+        sqlite_memory._db = None
+
+        print(
+            f"threads={threads} sessions={sessions} events/session={steps * 3}\n"
+            f"{'backend':<8} {'writes/s':>10} {'projection/s':>13} {'messages/s':>11}"
+        )
+        for backend in ("memory", "sqlite", "redis"):
+            if backend == "redis" and not redis_url:
+                print(f"{backend:<8} {'(skipped: REDIS_URL not set)':>36}")
+                continue
+            client = create_redis_client(redis_url) if backend == "redis" else None
+            try:
+                result = run_backend(backend, threads, sessions, steps, client)
+            finally:
+                if client is not None:
+                    close_redis_client(client)
+            print(
+                f"{backend:<8} {result['writes/s']:>10.0f}"
+                f" {result['projection/s']:>13.0f} {result['messages/s']:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+    run(args.threads, args.sessions, args.steps)
@@ -0,0 +1,10 @@
+import os
+
+# 앱 모듈 import 전에 설정 (load_dotenv는 이미 있는 값을 덮어쓰지 않음)
+os.environ.update(
+    LLM_PROVIDER="fake",
+    FAKE_LLM_LATENCY="fixed:1",
+    REDIS_URL="",
+    MEMORY_BACKEND="memory",
+    TRACING_ENABLED="false",
+)
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from app.models.evaluation import SessionFeedbackOutput, SessionGroupSummaryOutput
+from app.services import answer_evaluator
+from app.services.answer_evaluator import GROUP_SUMMARY_PROMPT_NAME, EvaluationService
+from app.services.memory_logger import InMemorySessionHistory
+from app.utils.llm_cache import CACHE_BYPASS
+from app.utils.metrics import current_endpoint
+
+
+def test_session_map_step_is_capped_and_keeps_context(monkeypatch):
+    groups = {f"q{i}": f"대화 {i}" for i in range(6)}
+    endpoints = []
+    running = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def invoke_structured(prompt_name, schema, vars, run_config=None, use_cache=False):
+        if prompt_name != GROUP_SUMMARY_PROMPT_NAME:
+            return SessionFeedbackOutput(
+                sessionFeedback=vars["conversation"]
+            ), CACHE_BYPASS
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            endpoints.append(current_endpoint.get())
+        time.sleep(0.02)
+        with lock:
+            running["now"] -= 1
+        return SessionGroupSummaryOutput(summary=vars["conversation"]), CACHE_BYPASS
+
+    monkeypatch.setattr(answer_evaluator, "BATCH_EVALUATION_CONCURRENCY", 2)
+    monkeypatch.setattr(answer_evaluator, "invoke_structured", invoke_structured)
+    monkeypatch.setattr(
+        answer_evaluator,
+        "extract_evaluation_groups",
+        lambda memory: (3.0, "전체 대화", groups),
+    )
+    monkeypatch.setattr(
+        EvaluationService, "_use_map_reduce", staticmethod(lambda *_: True)
+    )
+
+    token = current_endpoint.set("/api/v1/evaluation/session-evaluating")
+    try:
+        service = EvaluationService(InMemorySessionHistory(session_id="s1"), "s1")
+        result = service.evaluate_session()
+    finally:
+        current_endpoint.reset(token)
+
+    assert running["max"] == 2
+    assert endpoints == ["/api/v1/evaluation/session-evaluating"] * len(groups)
+    # 요약은 그룹 순서대로 합쳐짐
+    feedback = result.sessionFeedback
+    assert [feedback.index(f"QID: q{i} ") for i in range(6)] == sorted(
+        feedback.index(f"QID: q{i} ") for i in range(6)
+    )
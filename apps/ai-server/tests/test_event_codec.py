@@ -0,0 +1,140 @@
+import base64
+import json
+import zlib
+
+import pytest
+
+from app.models.event_types import EventType
+from app.utils import event_codec
+from app.utils.event_codec import (
+    decode_event,
+    encode_event,
+    encode_legacy,
+    event_type_of,
+    to_legacy_json,
+)
+
+EVALUATION = {
+    "aiQuestionId": "q1",
+    "overallScore": 4,
+    "strengths": ["구체적인 수치 제시"],
+    "criterionScores": [{"name": "정확성", "score": 4, "reason": "근거 명확"}],
+    "tailDecision": "ask",
+}
+
+
+@pytest.fixture
+def compact(monkeypatch):
+    monkeypatch.setattr(event_codec, "EVENT_ENCODING", "compact")
+    monkeypatch.setattr(event_codec, "EVENT_COMPRESS_MIN_BYTES", 0)
+
+
+def test_compact_round_trip_shortens_top_level_keys(compact):
+    encoded = encode_event(EventType.ANSWER_EVALUATED, EVALUATION)
+
+    assert encoded.startswith("e3:E:")
+    assert '"overallScore"' not in encoded
+    assert '"reason"' in encoded  # 중첩 객체 키는 그대로
+    assert decode_event(encoded) == (EventType.ANSWER_EVALUATED, EVALUATION)
+
+
+def test_compression_is_off_by_default(compact):
+    data = {"answer": "반복되는 긴 답변입니다. " * 500}
+
+    assert encode_event(EventType.ANSWER_RECEIVED, data).startswith("e3:R:")
+
+
+def test_keys_colliding_with_short_keys_are_escaped(compact):
+    data = {"q": "짧은 키", "~a": 1, "question": {"i": [{"~": None}]}}
+    encoded = encode_event(EventType.QUESTION_ASKED, data)
+
+    assert decode_event(encoded) == (EventType.QUESTION_ASKED, data)
+
+
+def test_large_payload_is_compressed(compact, monkeypatch):
+    monkeypatch.setattr(event_codec, "EVENT_COMPRESS_MIN_BYTES", 64)
+    data = {"answer": "반복되는 긴 답변입니다. " * 50}
+    encoded = encode_event(EventType.ANSWER_RECEIVED, data)
+
+    assert encoded.startswith("e3z:R:")
+    assert len(encoded) < len(json.dumps(data, ensure_ascii=False).encode())
+    assert decode_event(encoded) == (EventType.ANSWER_RECEIVED, data)
+    assert event_type_of(encoded) == EventType.ANSWER_RECEIVED
+
+
+def test_json_encoding_writes_legacy_format(monkeypatch):
+    monkeypatch.setattr(event_codec, "EVENT_ENCODING", "json")
+    encoded = encode_event(EventType.QUESTION_ASKED, {"question": "자기소개"})
+
+    assert json.loads(encoded) == {
+        "type": EventType.QUESTION_ASKED,
+        "data": {"question": "자기소개"},
+    }
+
+
+def test_unknown_event_type_is_kept_as_code(compact):
+    encoded = encode_event("CUSTOM", {"x": 1})
+
+    assert decode_event(encoded) == ("CUSTOM", {"x": 1})
+    assert event_type_of(encoded) == "CUSTOM"
+
+
+def test_v2_messages_still_decode():
+    v2 = 'e2:E:{"i":"q1","o":4,"cs":[{"n":"정확성","sc":4,"~i":1}]}'
+    packed = base64.b64encode(zlib.compress(b'{"a":"\\ub124"}')).decode()
+
+    assert decode_event(v2) == (
+        EventType.ANSWER_EVALUATED,
+        {
+            "aiQuestionId": "q1",
+            "overallScore": 4,
+            "criterionScores": [{"name": "정확성", "score": 4, "i": 1}],
+        },
+    )
+    assert decode_event(f"e2z:R:{packed}") == (
+        EventType.ANSWER_RECEIVED,
+        {"answer": "네"},
+    )
+    assert event_type_of(v2) == EventType.ANSWER_EVALUATED
+
+
+def test_legacy_messages_still_decode():
+    legacy = "  " + encode_legacy(EventType.ANSWER_RECEIVED, {"answer": "네"})
+
+    assert decode_event(legacy) == (EventType.ANSWER_RECEIVED, {"answer": "네"})
+    assert event_type_of(legacy) == EventType.ANSWER_RECEIVED
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        None,
+        3,
+        "일반 대화 메시지",
+        "[1, 2]",
+        '{"type": "X", "data": []}',
+        "{깨진",
+        "e2z:E:@@",
+        'e3:E:{"i":"q1"}trailing',
+        "e3:E:[1]",
+        "e3:E",
+    ],
+)
+def test_non_events_and_corrupt_messages_return_none(content):
+    assert decode_event(content) is None
+
+
+def test_event_type_of_tagged_messages():
+    assert event_type_of("[FACE_ANALYSIS] happy=0.9") == "FACE_ANALYSIS"
+    assert event_type_of("일반 대화 메시지") is None
+
+
+def test_to_legacy_json(compact):
+    encoded = encode_event(EventType.ANSWER_EVALUATED, EVALUATION)
+
+    assert json.loads(to_legacy_json(encoded)) == {
+        "type": EventType.ANSWER_EVALUATED,
+        "data": EVALUATION,
+    }
+    assert to_legacy_json("[FACE_ANALYSIS] x") == "[FACE_ANALYSIS] x"
+    assert to_legacy_json('{"raw": 1}') == '{"raw": 1}'
@@ -0,0 +1,24 @@
+import pytest
+from fastapi.responses import JSONResponse
+
+from app.utils import fast_json
+from app.utils.fast_json import FastJSONResponse
+
+
+def test_response_bytes_match_json_response():
+    content = {"질문": ["자기소개", 1, 2.5, 1e16, None, True], "id": 2**70}
+
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+
+@pytest.mark.skipif(fast_json.orjson is None, reason="orjson 미설치")
+def test_documented_differences_from_json_response():
+    # 1e-4 미만 float는 표기만 다름 (같은 값)
+    assert FastJSONResponse(1e-05).body == b"0.00001"
+    assert JSONResponse(1e-05).body == b"1e-05"
+    assert fast_json.loads(FastJSONResponse(1e-05).body) == 1e-05
+
+    # NaN/Infinity는 오류 대신 null
+    assert FastJSONResponse([float("nan"), float("inf")]).body == b"[null,null]"
+    with pytest.raises(ValueError):
+        JSONResponse(float("nan"))
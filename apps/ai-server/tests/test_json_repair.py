@@ -0,0 +1,182 @@
+from enum import Enum
+from typing import List, Optional
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+from app.utils.json_repair import (
+    RepairingOutputParser,
+    build_repairing_chain,
+    close_truncated_json,
+    coerce_to_schema,
+    drop_truncated_items,
+    failed_generation,
+    fill_missing_fields,
+    json_repair_stats,
+    parse_json_lenient,
+)
+
+
+class Decision(str, Enum):
+    ASK = "ask"
+    SKIP = "skip"
+
+
+class Item(BaseModel):
+    name: str
+    score: int
+
+
+class Report(BaseModel):
+    total_score: int
+    summary: str
+    items: List[Item]
+    decision: Optional[Decision]
+
+
+class ItemList(BaseModel):
+    items: List[Item]
+
+
+# === 텍스트 → JSON ===
+
+
+def test_valid_json_is_not_marked_repaired():
+    assert parse_json_lenient('{"a": 1}') == ({"a": 1}, False)
+
+
+def test_code_fence_trailing_comma_and_python_literals():
+    text = '설명입니다\n```json\n{"a": True, "b": [None, "True",],}\n```'
+    assert parse_json_lenient(text) == ({"a": True, "b": [None, "True"]}, True)
+
+
+def test_truncated_json_is_closed():
+    data, repaired = parse_json_lenient(
+        '{"summary": "좋은 답변", "items": [{"name": "a'
+    )
+    assert repaired
+    assert data == {"summary": "좋은 답변", "items": [{"name": "a"}]}
+
+
+def test_dangling_key_is_trimmed():
+    assert close_truncated_json('{"a": 1, "b"') == {"a": 1}
+    assert close_truncated_json('{"a": 1, "b":') == {"a": 1, "b": None}
+
+
+def test_unrepairable_text_raises():
+    with pytest.raises(ValueError):
+        parse_json_lenient("점수를 매길 수 없습니다")
+
+
+# === 스키마 보정 ===
+
+
+def test_coerce_fixes_keys_and_types():
+    data = {
+        "result": {
+            "totalScore": "4점",
+            "Summary": ["구체적", "논리적"],
+            "items": {"name": 1, "score": 3.6},
+            "decision": " ASK ",
+        }
+    }
+    assert Report.model_validate(coerce_to_schema(data, Report)) == Report(
+        total_score=4,
+        summary="구체적, 논리적",
+        items=[Item(name="1", score=4)],
+        decision=Decision.ASK,
+    )
+
+
+def test_bare_list_is_wrapped_for_single_list_schema():
+    data = coerce_to_schema([{"name": "a", "score": "5"}], ItemList)
+    assert data == {"items": [{"name": "a", "score": 5}]}
+
+
+def test_string_is_split_into_list():
+    class Tags(BaseModel):
+        tags: List[str]
+
+    assert coerce_to_schema({"tags": "- React\n- TypeScript\n"}, Tags) == {
+        "tags": ["React", "TypeScript"]
+    }
+
+
+def test_drop_truncated_items_only_drops_last():
+    data = {"items": [{"name": "a", "score": 1}, {"name": "b"}]}
+    assert drop_truncated_items(data, ItemList) == {
+        "items": [{"name": "a", "score": 1}]
+    }
+    middle = {"items": [{"name": "a"}, {"name": "b", "score": 1}]}
+    assert drop_truncated_items(middle, ItemList) == middle
+
+
+def test_fill_missing_fields_only_fills_enums():
+    assert fill_missing_fields({"summary": "x"}, Report) == {
+        "summary": "x",
+        "decision": None,
+    }
+
+
+# === LCEL 단계 ===
+
+
+class _GroqError(Exception):
+    status_code = 400
+
+    def __init__(self, text: str):
+        self.body = {
+            "error": {"code": "json_validate_failed", "failed_generation": text}
+        }
+
+
+def test_failed_generation_reads_groq_error():
+    assert failed_generation(_GroqError('{"a": 1')) == '{"a": 1'
+    assert failed_generation(ValueError("x")) is None
+
+
+def test_parser_records_outcomes():
+    parser = RepairingOutputParser(ItemList)
+    before = json_repair_stats.stats().get("ItemList", {})
+
+    parser(AIMessage(content='{"items": []}'))
+    repaired = parser(AIMessage(content='{"items": [{"name": "a", "score": "2"},'))
+    with pytest.raises(OutputParserException):
+        parser(AIMessage(content="없음"))
+
+    after = json_repair_stats.stats()["ItemList"]
+    assert repaired == ItemList(items=[Item(name="a", score=2)])
+    for outcome in ("ok", "repaired", "recalled"):
+        assert after[outcome] == before.get(outcome, 0) + 1
+
+
+def test_chain_recalls_model_only_after_local_repair_fails():
+    outputs = iter(["```\n출력 없음\n```", '{"items": [{"name": "b", "score": 1}]}'])
+    calls = []
+
+    def model(_):
+        calls.append(1)
+        return AIMessage(content=next(outputs))
+
+    chain = build_repairing_chain(
+        RunnableLambda(lambda x: x), RunnableLambda(model), ItemList
+    )
+    assert chain.invoke({}) == ItemList(items=[Item(name="b", score=1)])
+    assert len(calls) == 2
+
+
+def test_chain_repairs_json_validate_failed_without_recall():
+    calls = []
+
+    def model(_):
+        calls.append(1)
+        raise _GroqError('{"items": [{"name": "c", "score": 2}')
+
+    chain = build_repairing_chain(
+        RunnableLambda(lambda x: x), RunnableLambda(model), ItemList
+    )
+    assert chain.invoke({}) == ItemList(items=[Item(name="c", score=2)])
+    assert len(calls) == 1
@@ -0,0 +1,94 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.utils.fake_llm import FakeChatModel, FakeLLMError
+from app.utils.llm_hedging import HedgingPolicy
+
+
+def _policy(deadline_sec: float = 0.05) -> HedgingPolicy:
+    return HedgingPolicy(
+        enabled=True, min_samples=1000, default_deadline_sec=deadline_sec
+    )
+
+
+class Providers:
+    """FakeChatModel 목록으로 make_call을 만들고 시도·취소를 기록"""
+
+    def __init__(self, *models: FakeChatModel):
+        self.models = models
+        self.attempts: List[tuple] = []
+        self.cancelled: List[int] = []
+
+    async def call(self, index: int, extra: bool):
+        self.attempts.append((index, extra))
+        try:
+            await self.models[index].ainvoke("질문")
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        return index
+
+    def run(self, policy: HedgingPolicy):
+        return asyncio.run(policy.run("prompt", len(self.models), self.call))
+
+
+def test_hedge_wins_and_loser_is_cancelled():
+    providers = Providers(
+        FakeChatModel(latency="fixed:1000"), FakeChatModel(latency="fixed:10")
+    )
+    policy = _policy()
+
+    assert providers.run(policy) == 1
+    assert providers.attempts == [(0, False), (1, True)]
+    assert providers.cancelled == [0]
+    stats = policy.stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_primary_within_deadline_is_not_hedged():
+    providers = Providers(
+        FakeChatModel(latency="fixed:1"), FakeChatModel(latency="fixed:1")
+    )
+    policy = _policy(deadline_sec=1.0)
+
+    assert providers.run(policy) == 0
+    assert providers.attempts == [(0, False)]
+    assert policy.stats()["hedged"] == 0
+
+
+def test_no_hedge_without_fallback_provider():
+    providers = Providers(FakeChatModel(latency="fixed:200"))
+    policy = _policy()
+
+    assert providers.run(policy) == 0
+    assert providers.attempts == [(0, False)]
+    assert policy.stats()["hedged"] == 0
+
+
+def test_failover_in_provider_order():
+    providers = Providers(
+        FakeChatModel(latency="fixed:1", error_rate=1.0),
+        FakeChatModel(latency="fixed:1", error_rate=1.0),
+        FakeChatModel(latency="fixed:1"),
+    )
+    policy = _policy(deadline_sec=1.0)
+
+    assert providers.run(policy) == 2
+    assert providers.attempts == [(0, False), (1, True), (2, True)]
+    stats = policy.stats()
+    assert stats["failovers"] == 2
+    assert stats["attempt_errors"] == 2
+
+
+def test_all_providers_fail_raises_first_error():
+    providers = Providers(
+        FakeChatModel(latency="fixed:1", rate_limit_rate=1.0),
+        FakeChatModel(latency="fixed:1", error_rate=1.0),
+    )
+
+    with pytest.raises(FakeLLMError) as exc:
+        providers.run(_policy(deadline_sec=1.0))
+    assert exc.value.status_code == 429
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.fake_llm import FakeLLMError
+from app.utils.llm_scheduler import LLMPriority, LLMScheduler
+
+
+def _scheduler(**kwargs) -> LLMScheduler:
+    return LLMScheduler(enabled=True, rpm=1000, tpm=1_000_000, **kwargs)
+
+
+async def _grant_order(scheduler, requests):
+    """디스패치를 멈춘 상태에서 요청을 쌓은 뒤 재개해, 차례를 받은 순서를 반환"""
+    order = []
+
+    async def acquire(priority, session_id, label):
+        await scheduler.acquire(priority, session_id, 1)
+        order.append(label)
+
+    scheduler._paused_until = time.monotonic() + 60
+    tasks = [asyncio.create_task(acquire(*request)) for request in requests]
+    await asyncio.sleep(0)
+    scheduler._paused_until = 0.0
+    scheduler._kick()
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_priority_order():
+    order = asyncio.run(
+        _grant_order(
+            _scheduler(),
+            [
+                (LLMPriority.SESSION_EVALUATION, "s1", "session"),
+                (LLMPriority.QUESTION_GENERATION, "s1", "question"),
+                (LLMPriority.ANSWER_EVALUATION, "s1", "evaluation"),
+                (LLMPriority.FOLLOWUP, "s1", "followup"),
+            ],
+        )
+    )
+    assert order == ["followup", "evaluation", "question", "session"]
+
+
+def test_round_robin_between_sessions():
+    priority = LLMPriority.ANSWER_EVALUATION
+    order = asyncio.run(
+        _grant_order(
+            _scheduler(),
+            [
+                (priority, "a", "a1"),
+                (priority, "a", "a2"),
+                (priority, "a", "a3"),
+                (priority, "b", "b1"),
+                (priority, "c", "c1"),
+                (priority, "c", "c2"),
+            ],
+        )
+    )
+    assert order == ["a1", "b1", "c1", "a2", "c2", "a3"]
+
+
+def test_token_limit_delays_next_request():
+    async def run():
+        scheduler = LLMScheduler(enabled=True, rpm=1000, tpm=600)  # 초당 10 토큰
+        await scheduler.acquire(LLMPriority.FOLLOWUP, "s", 600)
+        start = time.monotonic()
+        await scheduler.acquire(LLMPriority.FOLLOWUP, "s", 2)
+        return time.monotonic() - start
+
+    assert 0.1 <= asyncio.run(run()) < 1.0
+
+
+def test_rate_limit_pauses_and_retries():
+    async def run():
+        scheduler = _scheduler()
+        calls = []
+
+        async def fn():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise FakeLLMError(429, retry_after_sec=0.2)
+            return "ok"
+
+        result = await scheduler.run(LLMPriority.FOLLOWUP, "s", 10, fn)
+        return result, calls, scheduler.stats()
+
+    result, calls, stats = asyncio.run(run())
+    assert result == "ok"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+    assert stats["rate_limited"] == 1
+    assert stats["retries"] == 1
+
+
+def test_rate_limit_gives_up_after_max_retries():
+    async def run():
+        scheduler = LLMScheduler(enabled=True, rpm=1000, tpm=1_000_000, max_retries=1)
+
+        async def fn():
+            raise FakeLLMError(429, retry_after_sec=0.01)
+
+        await scheduler.run(LLMPriority.FOLLOWUP, "s", 10, fn)
+
+    with pytest.raises(FakeLLMError):
+        asyncio.run(run())
+
+
+def test_disabled_by_default():
+    assert not LLMScheduler().enabled
@@ -0,0 +1,262 @@
+import re
+import threading
+
+import fakeredis
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from redisvl.index import SearchIndex
+
+from app.models.event_types import EventType
+from app.services.memory_logger import (
+    INDEX_COMPLETE,
+    InMemorySessionHistory,
+    MemoryLogger,
+    RedisSessionHistory,
+    SQLiteSessionHistory,
+    page_messages,
+)
+from app.utils import fast_json
+from app.utils.event_codec import decode_event, encode_event
+from app.utils.session_projection import (
+    SessionProjection,
+    count_followups,
+    load_projection,
+)
+from app.utils.session_store import SessionStore
+from app.utils.sqlite_memory import SQLiteMemoryDB
+from tests.test_session_store import FakeClock
+
+BACKENDS = ["memory", "sqlite", "redis"]
+
+
+def _fake_search(history):
+    """
+    FT.SEARCH 대역 (fakeredis에는 검색 모듈 없음): 세션 인덱스 Set의 JSON 문서에
+    type 태그와 timestamp 범위 조건만 적용
+    """
+
+    def query(expression, limit):
+        expression = str(expression)
+        types = re.search(r"@type:\{([^}]*)\}", expression)
+        low, high = re.search(
+            r"@timestamp:\[(\S+) (\S+)\]", f"{expression} @timestamp:[-inf +inf]"
+        ).groups()
+        exclusive = low.startswith("(")
+        low, high = float(low.lstrip("(")), float(high)
+        client = history.redis_client
+        rows = []
+        for key in client.smembers(history.index_key):
+            key = key.decode()
+            if key == INDEX_COMPLETE:
+                continue
+            doc = client.json().get(key)
+            ts = doc["timestamp"]
+            if types and doc["type"] not in types.group(1).split("|"):
+                continue
+            if (ts > low if exclusive else ts >= low) and ts <= high:
+                rows.append(
+                    {
+                        "id": key,
+                        "timestamp": ts,
+                        "type": doc["type"],
+                        "$.data": fast_json.dumps(doc["data"]),
+                    }
+                )
+        rows.sort(key=lambda r: (r["timestamp"], r["id"]))
+        return rows[:limit]
+
+    return query
+
+
+@pytest.fixture(params=BACKENDS)
+def history(request, tmp_path, monkeypatch):
+    if request.param == "memory":
+        store = SessionStore(ttl_sec=900, clock=FakeClock())
+        return store.get_or_create(
+            "s1", lambda: InMemorySessionHistory(session_id="s1").attach(store)
+        )
+    if request.param == "sqlite":
+        return SQLiteSessionHistory("s1", SQLiteMemoryDB(str(tmp_path / "m.db")), 900)
+    monkeypatch.setattr(SearchIndex, "create", lambda self, **_: None)
+    redis = RedisSessionHistory("s1", fakeredis.FakeRedis(), ttl=900)
+    redis.redis_client.sadd(redis.index_key, INDEX_COMPLETE)
+    monkeypatch.setattr(redis, "_query_page_rows", _fake_search(redis))
+    return redis
+
+
+def _expire(history):
+    """백엔드별로 세션 TTL이 지난 상태를 만듦"""
+    if isinstance(history, InMemorySessionHistory):
+        history._store.clock.advance(history._store.ttl_sec)
+    elif isinstance(history, SQLiteSessionHistory):
+        history.db.conn.execute("UPDATE sessions SET expires_at = 0")
+    else:
+        history.redis_client.flushall()
+
+
+def _read_all(history, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        page, cursor = page_messages(history, cursor, limit, **filters)
+        pages.append([m.content for m in page])
+        if cursor is None:
+            return pages
+
+
+def _session():
+    messages = []
+    for i in range(5):
+        messages += [
+            AIMessage(content=encode_event(EventType.QUESTION_ASKED, {"i": i})),
+            HumanMessage(content=f"답변 {i}"),
+            AIMessage(content=encode_event(EventType.ANSWER_EVALUATED, {"i": i})),
+        ]
+    return messages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 20])
+def test_filtered_pages_are_full_until_the_end(history, limit):
+    messages = _session()
+    history.add_messages(messages)
+    evaluated = [m.content for m in messages[2::3]]
+
+    pages = _read_all(history, limit, event_types=[EventType.ANSWER_EVALUATED])
+
+    assert [c for page in pages for c in page] == evaluated
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_role_filter_pages(history):
+    messages = _session()
+    history.add_messages(messages)
+
+    pages = _read_all(history, 2, roles=["human"])
+
+    assert [c for page in pages for c in page] == [f"답변 {i}" for i in range(5)]
+    assert all(len(page) == 2 for page in pages[:-1])
+
+
+def test_sqlite_db_uses_wal_and_a_connection_per_thread(tmp_path):
+    db = SQLiteMemoryDB(str(tmp_path / "m.db"))
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.conn))
+    thread.start()
+    thread.join()
+
+    assert db.conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert db.conn is db.conn
+    assert other[0] is not db.conn
+    tables = {
+        row[0]
+        for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    assert {"sessions", "messages"} <= tables
+
+
+@pytest.mark.parametrize("limit", [1, 4, 15, 100])
+def test_unfiltered_pages_cover_the_session_in_order(history, limit):
+    messages = _session()
+    history.add_messages(messages)
+
+    pages = _read_all(history, limit)
+
+    assert [c for page in pages for c in page] == [m.content for m in messages]
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_invalid_cursor_raises_value_error(history):
+    history.add_messages(_session())
+
+    with pytest.raises(ValueError):
+        page_messages(history, "not-a-cursor", 2)
+
+
+def test_replace_messages_swaps_log_and_projection(history):
+    history.add_messages(_session())
+    replacement = [AIMessage(content="복원 1"), HumanMessage(content="복원 2")]
+    projection = SessionProjection(followups={"q1": 2}, score_sum=4.0, score_count=1)
+
+    history.replace_messages(replacement, projection)
+
+    assert _read_all(history, 10) == [["복원 1", "복원 2"]]
+    assert load_projection(history) == projection
+
+
+def test_refresh_ttl_reports_messages_and_skips_expired_sessions(history):
+    history.add_messages(_session())
+
+    assert history.refresh_ttl(900) == 15
+
+    _expire(history)
+    assert history.refresh_ttl(900) == 0
+
+
+def test_sqlite_expired_session_is_hidden_and_restarted(tmp_path):
+    history = SQLiteSessionHistory("s1", SQLiteMemoryDB(str(tmp_path / "m.db")), 900)
+    history.add_messages(_session())
+
+    _expire(history)
+    assert history.messages == []
+    assert page_messages(history, None, 10) == ([], None)
+
+    history.add_messages([AIMessage(content="새 세션")])  # 만료 기록은 지우고 시작
+    assert [m.content for m in history.messages] == ["새 세션"]
+    assert history.db.sweep(force=True) == 0
+
+
+def _events(n, score=4):
+    events = []
+    for i in range(n):
+        qid = f"q{i}"
+        events += [
+            (EventType.QUESTION_ASKED, {"aiQuestionId": qid, "parentQuestionId": "q0"}),
+            (EventType.ANSWER_RECEIVED, {"aiQuestionId": qid, "answer": f"답변 {i}"}),
+            (EventType.ANSWER_EVALUATED, {"aiQuestionId": qid, "overallScore": score}),
+        ]
+    return events
+
+
+def _projection_of(events):
+    projection = SessionProjection()
+    for event in events:
+        projection.apply(*event)
+    return projection
+
+
+def _logged_events(history):
+    return [decode_event(c) for page in _read_all(history, 100) for c in page]
+
+
+def test_replace_events_restores_log_and_rebuilds_projection(history):
+    logger = MemoryLogger(history, "s1")
+    logger.log_events(_events(3, score=1))
+    restored = _events(2)
+
+    logger.replace_events(restored)
+
+    assert _logged_events(history) == restored
+    assert load_projection(history) == _projection_of(restored)
+
+    # 복원 이후 기록은 복원된 projection에 이어서 반영
+    extra = [(EventType.ANSWER_EVALUATED, {"aiQuestionId": "q9", "overallScore": 1})]
+    logger.log_events(extra)
+    assert load_projection(history) == _projection_of(restored + extra)
+    assert count_followups(history, "q0") == 2
+
+
+@pytest.mark.parametrize("history", ["sqlite", "redis"], indirect=True)
+def test_failed_replace_leaves_previous_session_intact(history, monkeypatch):
+    logger = MemoryLogger(history, "s1")
+    before = _events(2)
+    logger.replace_events(before)
+
+    def fail(self):
+        raise RuntimeError("projection 직렬화 실패")
+
+    # 메시지 삭제·기록 뒤, 커밋 전 단계에서 실패
+    with monkeypatch.context() as patch, pytest.raises(RuntimeError):
+        patch.setattr(SessionProjection, "to_hash", fail)
+        logger.replace_events(_events(1, score=1))
+
+    assert _logged_events(history) == before
+    assert load_projection(history) == _projection_of(before)
@@ -0,0 +1,147 @@
+import json
+import re
+
+import fakeredis
+from langchain_core.messages import AIMessage, HumanMessage, message_to_dict
+from redisvl.index import SearchIndex
+
+from app.services import memory_logger
+from app.services.memory_logger import INDEX_COMPLETE, RedisSessionHistory
+from app.utils.redis_pool import (
+    InstrumentedConnectionPool,
+    close_shared_redis_client,
+    get_shared_redis_client,
+)
+from app.utils.session_projection import projection_key
+
+
+def test_search_index_is_set_up_once_per_client(monkeypatch):
+    created = []
+    monkeypatch.setattr(SearchIndex, "create", lambda self, **_: created.append(self))
+    client = fakeredis.FakeRedis()
+
+    first = RedisSessionHistory("s1", client, ttl=900)
+    second = RedisSessionHistory("s2", client, ttl=900)
+    other = RedisSessionHistory("s1", fakeredis.FakeRedis(), ttl=900)
+
+    assert len(created) == 2
+    assert second.index is first.index
+    assert other.index is not first.index
+    assert (second.session_id, second.index_key) == ("s2", "chat_index:s2")
+
+
+def _fake_search(rows):
+    """FT.SEARCH 대역: timestamp 범위만 해석, 같은 timestamp는 키 역순으로 반환"""
+
+    def query(expression, limit):
+        low, high = re.search(
+            r"@timestamp:\[(\S+) (\S+)\]", f"{expression} @timestamp:[-inf +inf]"
+        ).groups()
+        exclusive = low.startswith("(")
+        low, high = float(low.lstrip("(")), float(high)
+        matched = [
+            r
+            for r in rows
+            if (r["timestamp"] > low if exclusive else r["timestamp"] >= low)
+            and r["timestamp"] <= high
+        ]
+        matched.sort(key=lambda r: r["id"], reverse=True)
+        matched.sort(key=lambda r: r["timestamp"])
+        return matched[:limit]
+
+    return query
+
+
+def test_redis_paging_does_not_lose_timestamp_ties(monkeypatch):
+    monkeypatch.setattr(SearchIndex, "create", lambda self, **_: None)
+    history = RedisSessionHistory("s1", fakeredis.FakeRedis(), ttl=900)
+    timestamps = [1.0, 1.0, 1.0, 2.0, 2.0, 3.0, 3.0]
+    rows = [
+        {
+            "id": f"chat:s1:{i:02d}",
+            "timestamp": ts,
+            "type": "ai",
+            "$.data": json.dumps(message_to_dict(AIMessage(content=f"m{i}"))["data"]),
+        }
+        for i, ts in enumerate(timestamps)
+    ]
+    monkeypatch.setattr(history, "_query_page_rows", _fake_search(rows))
+
+    for limit in (1, 2, 3, 7, 10):
+        read, cursor = [], None
+        while True:
+            messages, cursor = history.page_messages(cursor, limit)
+            read += [m.content for m in messages]
+            if cursor is None:
+                break
+        assert read == [f"m{i}" for i in range(len(rows))], limit
+
+
+def test_fallback_client_is_shared_and_closed():
+    url = "redis://localhost:6379/0"
+    client = get_shared_redis_client(url)
+    try:
+        assert get_shared_redis_client(url) is client
+        assert isinstance(client.connection_pool, InstrumentedConnectionPool)
+    finally:
+        close_shared_redis_client()
+    assert get_shared_redis_client(url) is not client
+    close_shared_redis_client()
+
+
+def _redis_history(monkeypatch, migrated=False):
+    monkeypatch.setattr(SearchIndex, "create", lambda self, **_: None)
+    history = RedisSessionHistory("s1", fakeredis.FakeRedis(), ttl=900)
+    if migrated:  # 인덱스 Set 이전이 끝난 세션 → FT.SEARCH 없이 키 조회
+        history.redis_client.sadd(history.index_key, INDEX_COMPLETE)
+    return history
+
+
+def test_add_messages_writes_langchain_redis_documents(monkeypatch):
+    history = _redis_history(monkeypatch, migrated=True)
+
+    history.add_messages([HumanMessage(content="q"), AIMessage(content="a")])
+
+    keys = sorted(history.session_keys())
+    documents = [history.redis_client.json().get(key) for key in keys]
+    assert all(key.startswith("chat:s1:") for key in keys)
+    assert [d["data"]["content"] for d in documents] == ["q", "a"]
+    assert {d["session_id"] for d in documents} == {"s1"}
+    assert documents[0]["timestamp"] < documents[1]["timestamp"]
+
+
+def test_refresh_ttl_covers_messages_index_and_projection(monkeypatch):
+    history = _redis_history(monkeypatch, migrated=True)
+    client = history.redis_client
+    history.add_messages([AIMessage(content="a"), AIMessage(content="b")])
+    client.hset(projection_key(history), "version", "1")
+
+    assert history.refresh_ttl(60) == 2
+
+    keys = [*history.session_keys(), history.index_key, projection_key(history)]
+    assert all(0 < client.ttl(key) <= 60 for key in keys)
+
+
+def test_legacy_session_index_is_migrated_in_pages(monkeypatch):
+    monkeypatch.setattr(memory_logger, "MIGRATE_BATCH", 2)
+    history = _redis_history(monkeypatch)
+    rows = [
+        {"id": f"chat:s1:{i:02d}", "timestamp": ts, "type": "ai", "$.data": "{}"}
+        for i, ts in enumerate([1.0, 1.0, 1.0, 2.0, 3.0])
+    ]
+    queries = []
+    search = _fake_search(rows)
+
+    def query(expression, limit):
+        queries.append(limit)
+        return search(expression, limit)
+
+    monkeypatch.setattr(history, "_query_page_rows", query)
+
+    assert history.session_keys() == {r["id"] for r in rows}
+    assert len(queries) > 1
+    assert history.redis_client.sismember(history.index_key, INDEX_COMPLETE)
+
+    queries.clear()
+    assert history.session_keys() == {r["id"] for r in rows}
+    assert queries == []
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+from app.api.v1.endpoints.metrics import get_metrics
+from app.utils import thread_pool
+from app.utils.metrics import memory_store_evictions
+from app.utils.thread_pool import InstrumentedThreadPoolExecutor
+
+
+def test_executor_counts_queued_and_busy_work():
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    with InstrumentedThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(block)
+        started.wait(5)
+        second = pool.submit(block)
+        third = pool.submit(block)
+        assert pool.stats() == {"busy": 1, "queued": 2, "max": 1}
+
+        assert third.cancel()
+        assert pool.stats()["queued"] == 1
+        release.set()
+        first.result(5)
+        second.result(5)
+
+    assert pool.stats() == {"busy": 0, "queued": 0, "max": 1}
+
+
+def test_metrics_endpoint_renders_prometheus_text():
+    memory_store_evictions.labels(reason="lru").inc()
+
+    async def scrape():
+        thread_pool.install_default_executor(asyncio.get_running_loop())
+        await asyncio.to_thread(lambda: None)
+        return await get_metrics()
+
+    response = asyncio.run(scrape())
+    body = response.body.decode()
+
+    assert response.media_type.startswith("text/plain")
+    assert 'aiew_memory_store_evictions_total{reason="lru"}' in body
+    assert 'aiew_threadpool_threads{pool="asyncio",state="busy"} 0.0' in body
+    assert 'aiew_threadpool_threads{pool="anyio",state="max"} 40.0' in body
+    assert 'aiew_queue_depth{queue="asyncio_threadpool"} 0.0' in body
+    assert "# TYPE aiew_http_request_duration_seconds histogram" in body
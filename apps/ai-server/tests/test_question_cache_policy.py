@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from app.api.v1.endpoints import question
+from app.models.question import QuestionConstraints, QuestionRequest, UserInfo
+from app.services.memory_logger import InMemorySessionHistory
+from app.services.question_generator import QuestionGeneratorService
+from app.utils import llm_utils
+
+
+@pytest.fixture
+def cache_calls(monkeypatch):
+    calls = []
+
+    async def agenerate_questions(self, user_info, constraints, use_cache=False):
+        calls.append(use_cache)
+        self.cache_status = "BYPASS"
+        return []
+
+    monkeypatch.setattr(
+        QuestionGeneratorService, "agenerate_questions", agenerate_questions
+    )
+    return calls
+
+
+def _generate(seed, use_cache=None):
+    req = QuestionRequest(
+        user_info=UserInfo(
+            desired_role="백엔드",
+            company="AI Corp",
+            core_values="도전",
+            resume_text="자기소개",
+            portfolio_text="포트폴리오",
+        ),
+        constraints=QuestionConstraints(seed=seed),
+    )
+    return asyncio.run(
+        question.generate_question(
+            Response(), "s1", req, use_cache, InMemorySessionHistory(session_id="s1")
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "temperature, seed, use_cache, expected",
+    [
+        (0.8, 42, None, False),  # seed만으로는 샘플링이 고정되지 않음
+        (0.0, 42, None, True),
+        (0.0, None, None, False),
+        (0.8, 42, True, True),  # 명시적 요청은 그대로
+        (0.0, 42, False, False),
+    ],
+)
+def test_default_cache_requires_temperature_zero(
+    monkeypatch, cache_calls, temperature, seed, use_cache, expected
+):
+    monkeypatch.setattr(llm_utils, "llm", SimpleNamespace(temperature=temperature))
+
+    _generate(seed, use_cache)
+
+    assert cache_calls == [expected]
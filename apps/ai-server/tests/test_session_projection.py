@@ -0,0 +1,172 @@
+import logging
+
+import fakeredis
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from redisvl.index import SearchIndex
+
+from app.models.event_types import EventType
+from app.services.memory_logger import RedisSessionHistory
+from app.utils.event_codec import encode_event
+from app.utils.metrics import projection_write_conflicts
+from app.utils.session_projection import (
+    SessionProjection,
+    count_followups,
+    load_projection,
+    projection_key,
+    recording,
+)
+
+ASKED = (EventType.QUESTION_ASKED, {"aiQuestionId": "q2", "parentQuestionId": "q1"})
+ANSWERED = (EventType.ANSWER_RECEIVED, {"aiQuestionId": "q1", "answer": "답변"})
+EVALUATED = (
+    EventType.ANSWER_EVALUATED,
+    {"aiQuestionId": "q1", "overallScore": 80, "feedback": "좋음"},
+)
+
+
+class FakeSearchHistory(RedisSessionHistory):
+    """fakeredis에는 검색 모듈이 없으므로 메시지 조회만 목록으로 대신함"""
+
+    def __init__(self, client, messages=()):
+        super().__init__("s1", client, ttl=900)
+        self.fake_messages = list(messages)
+
+    @property
+    def messages(self):
+        return self.fake_messages
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(SearchIndex, "create", lambda self, **_: None)
+    return fakeredis.FakeServer()
+
+
+def _history(server, messages=()):
+    return FakeSearchHistory(fakeredis.FakeRedis(server=server), messages)
+
+
+def _seed(memory, projection=None):
+    key = projection_key(memory)
+    memory.redis_client.hset(key, mapping=(projection or SessionProjection()).to_hash())
+    return key
+
+
+def _stored(memory):
+    raw = memory.redis_client.hgetall(projection_key(memory))
+    return SessionProjection.from_hash(raw) if raw else None
+
+
+def _conflicts(outcome):
+    (family,) = projection_write_conflicts.collect()
+    return sum(
+        sample.value
+        for sample in family.samples
+        if sample.name.endswith("_total") and sample.labels == {"outcome": outcome}
+    )
+
+
+def test_apply_updates_stored_projection(server):
+    memory = _history(server)
+    key = _seed(memory)
+
+    with recording(memory, [ASKED, ANSWERED]):
+        pass
+    with recording(memory, [EVALUATED]):
+        pass
+
+    stored = _stored(memory)
+    assert stored.followups == {"q1": 1}
+    assert stored.answers == {"q1": "답변"}
+    assert stored.evaluations == [("q1", "답변", "좋음")]
+    assert stored.pending_answer is None
+    assert stored.average_score() == 80.0
+    assert memory.redis_client.ttl(key) > 0
+    assert int(memory.redis_client.get(f"{key}:inflight")) == 0
+
+
+def test_apply_without_projection_leaves_it_to_rebuild(server):
+    memory = _history(server)
+
+    with recording(memory, [ASKED]):
+        pass
+
+    assert _stored(memory) is None
+
+
+def test_rebuild_replays_messages_and_stores(server):
+    messages = [
+        HumanMessage(content=encode_event(*ASKED)),
+        AIMessage(content=encode_event(*ANSWERED)),
+        AIMessage(content=encode_event(*EVALUATED)),
+    ]
+    memory = _history(server, messages)
+
+    assert count_followups(memory, "q1") == 1
+    assert _stored(memory) == load_projection(memory)
+    assert _stored(memory).evaluations == [("q1", "답변", "좋음")]
+
+
+def test_rebuild_is_not_stored_while_a_write_is_in_flight(server):
+    memory = _history(server, [AIMessage(content=encode_event(*ASKED))])
+
+    with recording(memory, [ANSWERED]):
+        # 메시지는 기록됐지만 projection 반영 전 → 재생 결과를 저장하면 이중 집계
+        memory.fake_messages.append(AIMessage(content=encode_event(*ANSWERED)))
+        assert load_projection(memory).answers == {"q1": "답변"}
+        assert _stored(memory) is None
+
+    assert load_projection(memory).answers == {"q1": "답변"}
+    assert _stored(memory).followups == {"q1": 1}
+
+
+def test_concurrent_writer_between_watch_and_exec_is_retried(server, monkeypatch):
+    memory = _history(server)
+    other = _history(server)
+    _seed(memory)
+    original = SessionProjection.apply
+    interleaved = []
+
+    def apply(self, event_type, data):
+        # 첫 증분 계산 도중 다른 워커가 같은 projection에 기록
+        if not interleaved:
+            interleaved.append(True)
+            with recording(other, [EVALUATED]):
+                pass
+        original(self, event_type, data)
+
+    monkeypatch.setattr(SessionProjection, "apply", apply)
+    before = _conflicts("retry")
+
+    with recording(memory, [ANSWERED, EVALUATED]):
+        pass
+
+    stored = _stored(memory)
+    assert _conflicts("retry") == before + 1
+    assert stored.score_count == 2
+    assert [e[1] for e in stored.evaluations] == ["", "답변"]
+
+
+def test_projection_is_invalidated_after_repeated_conflicts(
+    server, monkeypatch, caplog
+):
+    memory = _history(server)
+    other = _history(server)
+    key = _seed(memory)
+    original = SessionProjection.apply
+
+    def apply(self, event_type, data):
+        other.redis_client.hset(key, "noise", "1")  # 매 시도마다 WATCH 무효화
+        original(self, event_type, data)
+
+    monkeypatch.setattr(SessionProjection, "apply", apply)
+    before = _conflicts("invalidated")
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.session_projection"):
+        with recording(memory, [ANSWERED]):
+            pass
+
+    assert _stored(memory) is None
+    assert _conflicts("invalidated") == before + 1
+    assert "invalidating" in caplog.text
@@ -0,0 +1,147 @@
+import pytest
+
+from app.utils import session_store
+from app.utils.metrics import memory_store_evictions
+from app.utils.session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, sec):
+        self.now += sec
+
+
+class Session:
+    def __init__(self, name):
+        self.name = name
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _store(clock, **kwargs):
+    kwargs.setdefault("ttl_sec", 60)
+    return SessionStore(clock=clock, **kwargs)
+
+
+def _open(store, session_id):
+    return store.get_or_create(session_id, lambda: Session(session_id))
+
+
+def _evictions(reason):
+    (family,) = memory_store_evictions.collect()
+    return sum(
+        sample.value
+        for sample in family.samples
+        if sample.name.endswith("_total") and sample.labels == {"reason": reason}
+    )
+
+
+def test_get_or_create_reuses_live_session(clock):
+    store = _store(clock)
+    first = _open(store, "s1")
+
+    clock.advance(59)
+
+    assert _open(store, "s1") is first
+
+
+def test_session_expires_after_ttl(clock):
+    store = _store(clock)
+    first = _open(store, "s1")
+    before = _evictions("ttl")
+
+    clock.advance(60)
+
+    assert _open(store, "s1") is not first
+    assert _evictions("ttl") == before + 1
+
+
+def test_reads_do_not_extend_ttl_but_writes_do(clock):
+    store = _store(clock)
+    first = _open(store, "s1")
+
+    clock.advance(40)
+    store.resize("s1", first, 10)  # 기록 → 만료 시각 연장
+    clock.advance(40)
+    assert _open(store, "s1") is first  # 조회는 연장하지 않음
+
+    clock.advance(20)
+    assert _open(store, "s1") is not first
+
+
+def test_refresh_extends_ttl(clock):
+    store = _store(clock)
+    first = _open(store, "s1")
+
+    clock.advance(50)
+    assert store.refresh("s1", first, ttl_sec=120)
+    clock.advance(100)
+
+    assert _open(store, "s1") is first
+
+
+def test_refresh_of_expired_or_replaced_session_is_ignored(clock):
+    store = _store(clock)
+    first = _open(store, "s1")
+
+    clock.advance(60)
+    assert not store.refresh("s1", first)
+
+    second = _open(store, "s1")
+    store.resize("s1", first, 100)  # 제거된 기록 객체의 알림은 무시
+    assert store.stats()["bytes"] == 0
+    assert store.refresh("s1", second)
+
+
+def test_sweep_removes_expired_sessions(clock):
+    store = _store(clock)
+    _open(store, "s1")
+    _open(store, "s2")
+
+    clock.advance(60 + session_store.SWEEP_INTERVAL_SEC)
+    _open(store, "s3")
+
+    assert store.stats()["sessions"] == 1
+
+
+def test_session_count_bound_evicts_least_recently_used(clock):
+    store = _store(clock, max_sessions=2)
+    s1 = _open(store, "s1")
+    _open(store, "s2")
+    _open(store, "s1")  # s1 사용 → s2가 가장 오래됨
+    before = _evictions("lru")
+
+    _open(store, "s3")
+
+    assert store.stats()["sessions"] == 2
+    assert _evictions("lru") == before + 1
+    assert _open(store, "s1") is s1
+    assert store.stats()["sessions"] == 2
+
+
+def test_byte_bound_evicts_oldest_but_keeps_current(clock):
+    store = _store(clock, max_bytes=100)
+    s1, s2 = _open(store, "s1"), _open(store, "s2")
+    store.resize("s1", s1, 60)
+    before = _evictions("bytes")
+
+    store.resize("s2", s2, 60)
+
+    assert store.stats() == {
+        "sessions": 1,
+        "bytes": 60,
+        "max_sessions": 1000,
+        "max_bytes": 100,
+    }
+    assert _evictions("bytes") == before + 1
+
+    store.resize("s2", s2, 150)  # 현재 세션 혼자 상한 초과 → 경고만 하고 유지
+    assert store.stats()["bytes"] == 150
@@ -0,0 +1,124 @@
+import asyncio
+
+import fakeredis
+import pytest
+from pydantic import BaseModel
+
+from app.utils.singleflight import SingleFlight
+
+
+class Answer(BaseModel):
+    value: int
+
+
+def _worker(server: fakeredis.FakeServer, lock_ttl_sec: int = 5) -> SingleFlight:
+    """같은 Redis를 공유하는 다른 워커 프로세스 역할"""
+    flight = SingleFlight(lock_ttl_sec=lock_ttl_sec, poll_interval_sec=0.01)
+    flight.bind(fakeredis.FakeAsyncRedis(server=server))
+    return flight
+
+
+def _counting(value: int, delay_sec: float = 0.05):
+    calls = []
+
+    async def fn() -> Answer:
+        calls.append(value)
+        await asyncio.sleep(delay_sec)
+        return Answer(value=value)
+
+    return fn, calls
+
+
+def test_local_requests_are_coalesced():
+    flight = SingleFlight()
+    fn, calls = _counting(1)
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", fn, Answer) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert calls == [1]
+    assert [r.value for r, _ in results] == [1, 1, 1]
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert flight.stats()["local_followers"] == 2
+    assert flight.stats()["inflight"] == 0
+
+
+def test_local_followers_share_leader_failure():
+    flight = SingleFlight()
+
+    async def failing() -> Answer:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            flight.do("k", failing, Answer),
+            flight.do("k", failing, Answer),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.stats()["leaders"] == 1
+
+
+def test_remote_follower_reads_published_result():
+    server = fakeredis.FakeServer()
+    leader_fn, leader_calls = _counting(7)
+    follower_fn, follower_calls = _counting(8)
+
+    async def run():
+        leader, follower = _worker(server), _worker(server)
+        first = asyncio.ensure_future(leader.do("k", leader_fn, Answer))
+        await asyncio.sleep(0.01)
+        second = await follower.do("k", follower_fn, Answer)
+        return await first, second, follower.stats()
+
+    (result, shared), (followed, follower_shared), stats = asyncio.run(run())
+    assert (result.value, shared) == (7, False)
+    assert (followed.value, follower_shared) == (7, True)
+    assert (leader_calls, follower_calls) == ([7], [])
+    assert stats["remote_followers"] == 1
+
+
+def test_follower_runs_locally_after_lock_expiry():
+    server = fakeredis.FakeServer()
+    fn, calls = _counting(3, delay_sec=0)
+
+    async def run():
+        follower = _worker(server)
+        # 결과를 게시하지 못하고 사라진 리더의 락
+        await fakeredis.FakeAsyncRedis(server=server).set(
+            "singleflight:lock:k", "gone", px=100
+        )
+        return await follower.do("k", fn, Answer), follower.stats()
+
+    (result, shared), stats = asyncio.run(run())
+    assert (result.value, shared) == (3, False)
+    assert calls == [3]
+    assert stats["fallbacks"] == 1
+
+
+def test_follower_runs_locally_after_remote_leader_failure():
+    server = fakeredis.FakeServer()
+    fn, calls = _counting(5, delay_sec=0)
+
+    async def failing() -> Answer:
+        await asyncio.sleep(0.05)
+        raise RuntimeError("leader failed")
+
+    # fakeredis는 EVAL 미지원 → 락 해제 대신 TTL(1초) 만료 후 fallback
+    async def run():
+        leader, follower = _worker(server, lock_ttl_sec=1), _worker(server)
+        first = asyncio.ensure_future(leader.do("k", failing, Answer))
+        await asyncio.sleep(0.01)
+        second = await follower.do("k", fn, Answer)
+        with pytest.raises(RuntimeError):
+            await first
+        return second, follower.stats()
+
+    (result, shared), stats = asyncio.run(run())
+    assert (result.value, shared) == (5, False)
+    assert calls == [5]
+    assert stats["fallbacks"] == 1
@@ -0,0 +1,101 @@
+import asyncio
+
+from app.models.evaluation import AnswerEvaluationRequest, AnswerEvaluationResult
+from app.models.followup import FollowupRequest, FollowupResponse
+from app.services.answer_evaluator import EvaluationService
+from app.services.followup_generator import FollowupGeneratorService
+from app.services.memory_logger import InMemorySessionHistory
+from app.services.speculation import SpeculativeFollowupStore, speculative_followups
+
+FOLLOWUP = FollowupResponse(
+    followupId="",
+    parentQuestionId="q1",
+    rationale="speculative",
+    question="미리 생성된 꼬리질문",
+)
+
+
+def _request(**overrides):
+    fields = dict(
+        aiQuestionId="q1",
+        type="technical",
+        question="캐시 무효화는 어떻게 했나요?",
+        criteria=["정확성"],
+        skills=["Redis"],
+        answer="TTL과 이벤트 기반 무효화를 함께 사용했습니다.",
+        evaluationSummary="Strengths: A, Improvements: B",
+    )
+    fields.update(overrides)
+    return FollowupRequest(**fields)
+
+
+def test_key_covers_all_prompt_inputs():
+    base = FollowupGeneratorService._build_vars(_request())
+    key = SpeculativeFollowupStore.make_key("s", base)
+    assert key == SpeculativeFollowupStore.make_key("s", dict(base))
+    for field, value in [
+        ("evaluationSummary", "x"),
+        ("type", "behavioral"),
+        ("criteria", ["구체성"]),
+        ("skills", ["Kafka"]),
+    ]:
+        other = FollowupGeneratorService._build_vars(_request(**{field: value}))
+        assert SpeculativeFollowupStore.make_key("s", other) != key, field
+
+
+def _run_followup(speculated, actual):
+    async def run():
+        service = FollowupGeneratorService(InMemorySessionHistory(), "spec-test")
+
+        async def factory():
+            return FOLLOWUP
+
+        speculative_followups.start(
+            speculative_followups.make_key(
+                "spec-test", FollowupGeneratorService._build_vars(speculated)
+            ),
+            factory,
+        )
+        result = await service._agenerate_followups(actual, None, False)
+        return service.speculative_hit, result
+
+    return asyncio.run(run())
+
+
+def test_matching_request_claims_speculative_result():
+    hit, result = _run_followup(_request(), _request())
+    assert hit
+    assert result.question == FOLLOWUP.question
+    assert result.followupId == "q1-fu1"
+
+
+def test_mismatched_request_misses():
+    hit, result = _run_followup(_request(), _request(evaluationSummary="x"))
+    assert not hit
+    assert result.question != FOLLOWUP.question
+
+
+def test_evaluator_speculation_key_matches_followup_request():
+    req = AnswerEvaluationRequest(
+        aiQuestionId="q1",
+        type="technical",
+        question="캐시 무효화는 어떻게 했나요?",
+        criteria=["정확성"],
+        skills=["Redis"],
+        answer="TTL과 이벤트 기반 무효화를 함께 사용했습니다.",
+        answerDurationSec=60,
+    )
+    result = AnswerEvaluationResult(
+        aiQuestionId="q1",
+        type="technical",
+        answerDurationSec=60,
+        overallScore=3,
+        strengths=["A"],
+        improvements=["B"],
+        feedback="f",
+        tailDecision="create",
+    )
+    followup_req = EvaluationService.build_followup_request(req, result)
+    assert FollowupGeneratorService._build_vars(
+        followup_req
+    ) == FollowupGeneratorService._build_vars(_request())
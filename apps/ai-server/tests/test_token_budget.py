@@ -0,0 +1,82 @@
+from app.utils.token_budget import (
+    TRUNCATION_MARK,
+    apply_field_budgets,
+    estimate_tokens,
+    truncate_to_budget,
+)
+
+
+def test_korean_text_exactly_at_budget_is_kept():
+    text = "가나다라마바사아자차"
+
+    assert estimate_tokens(text) == 10
+    assert truncate_to_budget(text, 10) == (text, False)
+
+
+def test_korean_text_one_over_budget_is_cut_on_character_boundary():
+    text = "가나다라마바사아자차카"
+
+    result, truncated = truncate_to_budget(text, 10)
+
+    assert truncated
+    assert result == "가나다라마바사아자차" + TRUNCATION_MARK
+    assert estimate_tokens(result[: -len(TRUNCATION_MARK)]) <= 10
+
+
+def test_mixed_ascii_and_korean_counts_toward_budget():
+    # ASCII 4자 = 1토큰, 한글 1자 = 1토큰
+    assert estimate_tokens("abcd가") == 2
+    assert truncate_to_budget("abcd가", 2) == ("abcd가", False)
+    assert truncate_to_budget("abcd가나", 2) == ("abcd가" + TRUNCATION_MARK, True)
+
+
+def test_korean_text_is_cut_at_sentence_boundary():
+    text = "첫 번째 경력을 설명합니다. 두 번째 경력을 설명합니다. 세 번째 경력"
+
+    assert estimate_tokens(text) == 30
+    assert truncate_to_budget(text, 27) == (
+        "첫 번째 경력을 설명합니다. 두 번째 경력을 설명합니다." + TRUNCATION_MARK,
+        True,
+    )
+    # 뒤쪽 절반에 문장 경계가 없으면 단어 경계
+    assert truncate_to_budget(text, 24) == (
+        "첫 번째 경력을 설명합니다. 두 번째 경력을" + TRUNCATION_MARK,
+        True,
+    )
+
+
+def test_fields_under_budget_are_only_compressed():
+    resume = "백엔드 개발자\n\n\n\nRedis 캐시 설계 경험   있음"
+    fields = {"resume_text": resume, "core_values": "도전", "job_role": "서버"}
+    budgets = {"resume_text": 100, "core_values": 10, "portfolio_text": 10}
+
+    out, report = apply_field_budgets(fields, budgets)
+
+    assert out == {
+        "resume_text": "백엔드 개발자\n\nRedis 캐시 설계 경험 있음",
+        "core_values": "도전",
+        "job_role": "서버",
+    }
+    assert report["resume_text"]["truncated"] == 0
+    assert report["resume_text"]["after"] <= report["resume_text"]["before"]
+    assert report["core_values"] == {"before": 2, "after": 2, "truncated": 0}
+    assert "portfolio_text" not in report  # 없는 필드는 건너뜀
+
+
+def test_field_over_budget_is_truncated_and_reported():
+    fields = {"resume_text": "가" * 50}
+
+    out, report = apply_field_budgets(fields, {"resume_text": 20})
+
+    assert out["resume_text"] == "가" * 20 + TRUNCATION_MARK
+    assert report["resume_text"]["before"] == 50
+    assert report["resume_text"]["truncated"] == 1
+
+
+def test_zero_budget_only_compresses():
+    fields = {"resume_text": "가" * 50 + "\n\n\n" + "나" * 50}
+
+    out, report = apply_field_budgets(fields, {"resume_text": 0})
+
+    assert out["resume_text"] == "가" * 50 + "\n\n" + "나" * 50
+    assert report["resume_text"]["truncated"] == 0
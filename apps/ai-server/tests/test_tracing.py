@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from app.utils.tracing import Tracer
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+PARENT_ID = "b7ad6b7169203331"
+
+
+def _tracer(sample_ratio: float = 1.0):
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(
+        enabled=True,
+        sample_ratio=sample_ratio,
+        processor=SimpleSpanProcessor(exporter),
+        exporter_name="memory",
+    )
+    return tracer, exporter
+
+
+def _by_name(exporter: InMemorySpanExporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_child_spans_link_to_root():
+    tracer, exporter = _tracer()
+
+    with tracer.start_trace("GET /x", {}, **{"http.route": "/x"}) as root:
+        with tracer.span("redis.messages", session_id="s1", skipped=None) as span:
+            span.set_attribute("messages", 3)
+
+    spans = _by_name(exporter)
+    child = spans["redis.messages"]
+    assert child.parent.span_id == root.get_span_context().span_id
+    assert child.context.trace_id == spans["GET /x"].context.trace_id
+    assert dict(child.attributes) == {"session_id": "s1", "messages": 3}
+
+
+def test_incoming_traceparent_is_continued_and_injected():
+    tracer, exporter = _tracer(sample_ratio=0.0)
+    headers = {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+    response_headers = {}
+
+    # 상위가 sampled=1이면 sample_ratio와 무관하게 기록
+    with tracer.start_trace("POST /turn", headers):
+        tracer.inject(response_headers)
+
+    (root,) = exporter.get_finished_spans()
+    assert format(root.context.trace_id, "032x") == TRACE_ID
+    assert format(root.parent.span_id, "016x") == PARENT_ID
+    assert response_headers["traceparent"].startswith(f"00-{TRACE_ID}-")
+    assert response_headers["traceparent"].endswith("-01")
+
+
+def test_unsampled_trace_records_nothing_but_propagates():
+    tracer, exporter = _tracer()
+    headers = {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"}
+    response_headers = {}
+
+    with tracer.start_trace("POST /turn", headers):
+        with tracer.span("redis.messages") as span:
+            assert span is None
+        tracer.inject(response_headers)
+
+    assert exporter.get_finished_spans() == ()
+    assert response_headers["traceparent"].startswith(f"00-{TRACE_ID}-")
+    assert response_headers["traceparent"].endswith("-00")
+
+
+def test_disabled_tracer_without_processor():
+    tracer = Tracer(enabled=True, processor=None)
+
+    assert not tracer.enabled
+    with tracer.start_trace("GET /x", {}):
+        with tracer.span("child") as span:
+            assert span is None
+    assert tracer.stats()["exporter"] == ""
+
+
+def test_traced_sync_async_and_async_generator():
+    tracer, exporter = _tracer()
+
+    @tracer.traced("sync")
+    def sync_fn():
+        return 1
+
+    @tracer.traced("coro")
+    async def coro_fn():
+        return sync_fn() + 1
+
+    @tracer.traced("agen")
+    async def agen_fn():
+        yield 1
+        yield 2
+
+    async def run():
+        with tracer.start_trace("root", {}):
+            value = await coro_fn()
+            items = [item async for item in agen_fn()]
+        return value, items
+
+    assert asyncio.run(run()) == (2, [1, 2])
+
+    spans = _by_name(exporter)
+    root_id = spans["root"].context.span_id
+    assert spans["coro"].parent.span_id == root_id
+    assert spans["sync"].parent.span_id == spans["coro"].context.span_id
+    assert spans["agen"].parent.span_id == root_id
+
+
+def test_errors_set_span_status():
+    tracer, exporter = _tracer()
+
+    @tracer.traced("boom")
+    def boom():
+        raise ValueError("x")
+
+    with pytest.raises(ValueError):
+        with tracer.start_trace("root", {}):
+            boom()
+
+    spans = _by_name(exporter)
+    assert spans["boom"].status.status_code == StatusCode.ERROR
+    assert spans["boom"].events[0].name == "exception"
+    assert spans["root"].status.status_code == StatusCode.ERROR
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.models.evaluation import AnswerEvaluationRequest, AnswerEvaluationResult
+from app.models.event_types import EventType
+from app.models.followup import FollowupResponse
+from app.models.memory import QuestionAskedRequest
+from app.models.turn import TurnRequest
+from app.services.followup_generator import FollowupGeneratorService
+from app.services.memory_logger import InMemorySessionHistory, MemoryLogger
+from app.services.turn_processor import TurnService
+from app.utils.event_codec import decode_event
+from app.utils.session_projection import count_followups
+
+
+@pytest.fixture(autouse=True)
+def fixed_llm(monkeypatch):
+    """평가는 항상 꼬리질문 생성(create), 꼬리질문 본문은 고정"""
+
+    async def ascore_answer(self, req, run_config=None, use_cache=False):
+        return AnswerEvaluationResult(
+            aiQuestionId=req.aiQuestionId,
+            type=req.type,
+            answerDurationSec=req.answerDurationSec,
+            overallScore=3,
+            feedback="f",
+            tailDecision="create",
+        )
+
+    async def agenerate_raw(cls, req, run_config=None, use_cache=False, **kwargs):
+        return FollowupResponse(
+            followupId="",
+            parentQuestionId=req.aiQuestionId,
+            rationale="r",
+            question="꼬리질문",
+        )
+
+    monkeypatch.setattr(
+        "app.services.answer_evaluator.EvaluationService.ascore_answer", ascore_answer
+    )
+    monkeypatch.setattr(
+        FollowupGeneratorService, "agenerate_raw", classmethod(agenerate_raw)
+    )
+
+
+def _turn(qid, question_asked=True, max_followups=3):
+    asked = None
+    if question_asked:
+        asked = QuestionAskedRequest(
+            aiQuestionId=qid,
+            question="질문",
+            type="technical",
+            criteria=[],
+            skills=[],
+            parentQuestionId="q1" if "-fu" in qid else None,
+        )
+    return TurnRequest(
+        evaluation=AnswerEvaluationRequest(
+            aiQuestionId=qid,
+            type="technical",
+            question="질문",
+            answer="답변입니다.",
+            answerDurationSec=30,
+        ),
+        questionAsked=asked,
+        maxFollowups=max_followups,
+    )
+
+
+def _process(memory, req):
+    return asyncio.run(
+        TurnService(memory, "turn-test")._aprocess_turn(req, None, False)
+    )
+
+
+def _asked_ids(memory):
+    return [
+        data["aiQuestionId"]
+        for event_type, data in map(decode_event, (m.content for m in memory.messages))
+        if event_type == EventType.QUESTION_ASKED
+    ]
+
+
+def test_followup_turn_after_server_recorded_followup():
+    memory = InMemorySessionHistory()
+    first = _process(memory, _turn("q1"))
+    assert first.followup.followupId == "q1-fu1"
+
+    # 클라이언트가 이전 턴의 꼬리질문을 questionAsked로 다시 보내도 중복 기록하지 않음
+    second = _process(memory, _turn("q1-fu1"))
+    assert second.followup.followupId == "q1-fu2"
+    assert _asked_ids(memory) == ["q1", "q1-fu1", "q1-fu2"]
+    assert count_followups(memory, "q1") == 2
+
+
+def test_followup_turn_with_unrecorded_question_asked():
+    memory = InMemorySessionHistory()
+    MemoryLogger(memory).log_question_asked({"aiQuestionId": "q1"})
+
+    # 현재 질문(q1-fu1)이 아직 기록되지 않았으면 이번 턴에서 기록하고 카운트에 반영
+    result = _process(memory, _turn("q1-fu1"))
+    assert result.followup.followupId == "q1-fu2"
+    assert _asked_ids(memory) == ["q1", "q1-fu1", "q1-fu2"]
+
+
+def test_max_followups_counts_current_followup():
+    memory = InMemorySessionHistory()
+    MemoryLogger(memory).log_question_asked({"aiQuestionId": "q1"})
+
+    result = _process(memory, _turn("q1-fu1", max_followups=1))
+    assert result.followup is None
+    assert count_followups(memory, "q1") == 1